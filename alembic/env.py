@@ -43,6 +43,8 @@ from app.db.base import Base
 from app.models.decision_event import DecisionEvent  # noqa: F401
 from app.models.api_client import ApiClient  # noqa: F401
 from app.models.explanation import Explanation  # noqa: F401
+from app.models.explanation_cache import ExplanationCacheEntry  # noqa: F401
+from app.models.global_explanation import GlobalExplanation  # noqa: F401
 from app.models.report import Report  # noqa: F401
 from app.models.report_revision import ReportRevision  # noqa: F401
 
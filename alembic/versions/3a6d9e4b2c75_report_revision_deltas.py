@@ -0,0 +1,96 @@
+"""report revision deltas
+
+Revision ID: 3a6d9e4b2c75
+Revises: 5f8b2d6e0c13
+Create Date: 2026-10-18 15:52:36.904118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a6d9e4b2c75'
+down_revision: Union[str, Sequence[str], None] = '5f8b2d6e0c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 1000
+
+revisions = sa.table(
+    'report_revisions',
+    sa.column('id', sa.String),
+    sa.column('report_id', sa.String),
+    sa.column('version', sa.Integer),
+    sa.column('report_json', sa.JSON(none_as_null=True)),
+    sa.column('delta', sa.JSON(none_as_null=True)),
+)
+
+
+def _flush(conn, updates: list[dict]) -> None:
+    if updates:
+        conn.execute(
+            revisions.update()
+            .where(revisions.c.id == sa.bindparam('b_id'))
+            .values(report_json=sa.bindparam('b_report_json'), delta=sa.bindparam('b_delta')),
+            updates,
+        )
+        updates.clear()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    from app.core.config import settings
+    from app.services.json_delta import diff
+
+    op.add_column('report_revisions', sa.Column('delta', sa.JSON(), nullable=True))
+    op.alter_column('report_revisions', 'report_json', existing_type=sa.JSON(), nullable=True)
+    if op.get_context().as_sql:
+        return  # la conversión necesita leer las filas
+
+    # Se recorre cada historial en orden: snapshot cada N versiones, delta frente a la anterior
+    every = settings.REPORT_REVISION_SNAPSHOT_EVERY
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(revisions.c.id, revisions.c.report_id, revisions.c.version, revisions.c.report_json)
+        .order_by(revisions.c.report_id, revisions.c.version)
+        .execution_options(stream_results=True, yield_per=BATCH)
+    )
+    updates: list[dict] = []
+    report_id, previous = None, None
+    for row in rows:
+        if row.report_id == report_id and (row.version - 1) % every != 0:
+            updates.append({'b_id': row.id, 'b_report_json': None, 'b_delta': diff(previous, row.report_json)})
+            if len(updates) >= BATCH:
+                _flush(conn, updates)
+        report_id, previous = row.report_id, row.report_json
+    _flush(conn, updates)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    from app.services.json_delta import apply
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(revisions.c.id, revisions.c.report_id, revisions.c.report_json, revisions.c.delta)
+        .order_by(revisions.c.report_id, revisions.c.version)
+        .execution_options(stream_results=True, yield_per=BATCH)
+    )
+    updates: list[dict] = []
+    report_id, current = None, None
+    for row in rows:
+        if row.report_json is not None:
+            current = row.report_json
+        elif row.report_id == report_id:
+            current = apply(current, row.delta)
+            updates.append({'b_id': row.id, 'b_report_json': current, 'b_delta': None})
+            if len(updates) >= BATCH:
+                _flush(conn, updates)
+        report_id = row.report_id
+    _flush(conn, updates)
+
+    op.alter_column('report_revisions', 'report_json', existing_type=sa.JSON(), nullable=False)
+    op.drop_column('report_revisions', 'delta')
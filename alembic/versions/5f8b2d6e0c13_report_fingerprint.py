@@ -0,0 +1,68 @@
+"""report fingerprint
+
+Revision ID: 5f8b2d6e0c13
+Revises: 9c3e5b1f7a24
+Create Date: 2026-10-18 15:10:47.281904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f8b2d6e0c13'
+down_revision: Union[str, Sequence[str], None] = '9c3e5b1f7a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 1000
+
+reports = sa.table(
+    'reports',
+    sa.column('id', sa.String),
+    sa.column('report_json', sa.JSON),
+    sa.column('report_fingerprint', sa.String),
+)
+
+
+def _stamp(conn, ids: list[str], fingerprint: str) -> None:
+    if ids:
+        conn.execute(reports.update().where(reports.c.id.in_(ids)).values(report_fingerprint=fingerprint))
+        ids.clear()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    from pydantic import ValidationError
+
+    from app.schemas.report_schema_v1 import ReportSchemaV1
+    from app.services.report_fingerprint import REPORT_FINGERPRINT
+
+    op.add_column('reports', sa.Column('report_fingerprint', sa.String(length=80), nullable=True))
+    if op.get_context().as_sql:
+        return  # el backfill necesita validar cada documento
+
+    # Backfill: así las lecturas no tienen que sellar nada. Sólo se sellan los documentos que
+    # validan sin cambios; el resto se sigue validando al leer.
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(reports.c.id, reports.c.report_json).execution_options(stream_results=True, yield_per=BATCH)
+    )
+    ids: list[str] = []
+    for row in rows:
+        try:
+            valid = ReportSchemaV1.model_validate(row.report_json or {}).model_dump(mode="json") == row.report_json
+        except ValidationError:
+            valid = False
+        if valid:
+            ids.append(row.id)
+            if len(ids) >= BATCH:
+                _stamp(conn, ids, REPORT_FINGERPRINT)
+    _stamp(conn, ids, REPORT_FINGERPRINT)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('reports', 'report_fingerprint')
@@ -0,0 +1,35 @@
+"""decision events tenant model index
+
+Revision ID: 7e1c4a9d2b86
+Revises: 3a6d9e4b2c75
+Create Date: 2026-10-18 18:12:44.208131
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e1c4a9d2b86'
+down_revision: Union[str, Sequence[str], None] = '3a6d9e4b2c75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_decision_events_tenant_model', 'decision_events', ['tenant_id', 'model_id', 'model_version'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_decision_events_tenant_model', table_name='decision_events', postgresql_concurrently=True, if_exists=True
+        )
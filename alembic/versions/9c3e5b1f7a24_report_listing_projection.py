@@ -0,0 +1,60 @@
+"""report listing projection
+
+Revision ID: 9c3e5b1f7a24
+Revises: d4a7c2e19f60
+Create Date: 2026-10-18 14:41:09.512336
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e5b1f7a24'
+down_revision: Union[str, Sequence[str], None] = 'd4a7c2e19f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reports', sa.Column('decision_id', sa.String(length=128), nullable=True))
+    op.add_column('reports', sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('reports', sa.Column('decision_label', sa.String(), nullable=True))
+
+    # Mismo criterio que decision_fields(): label sólo si final_decision es un objeto
+    op.execute(
+        """
+        UPDATE reports AS r
+        SET decision_id = de.decision_id,
+            occurred_at = de.occurred_at,
+            decision_label = CASE WHEN json_typeof(de.final_decision) = 'object'
+                                  THEN de.final_decision ->> 'label' END
+        FROM decision_events AS de
+        WHERE de.id = r.decision_event_id
+        """
+    )
+    op.alter_column('reports', 'decision_id', nullable=False)
+    op.alter_column('reports', 'occurred_at', nullable=False)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_reports_tenant_occurred_at', 'reports', ['tenant_id', 'occurred_at'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_reports_tenant_decision_id', 'reports', ['tenant_id', 'decision_id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_reports_tenant_decision_id', table_name='reports', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_reports_tenant_occurred_at', table_name='reports', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('reports', 'decision_label')
+    op.drop_column('reports', 'occurred_at')
+    op.drop_column('reports', 'decision_id')
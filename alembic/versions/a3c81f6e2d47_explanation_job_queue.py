@@ -0,0 +1,34 @@
+"""explanation job queue
+
+Revision ID: a3c81f6e2d47
+Revises: 6283a6f63ce4
+Create Date: 2026-10-18 10:12:41.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c81f6e2d47'
+down_revision: Union[str, Sequence[str], None] = '6283a6f63ce4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('explanations', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('explanations', sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('explanations', sa.Column('locked_by', sa.String(length=64), nullable=True))
+    op.create_index('ix_explanations_status_created_at', 'explanations', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_explanations_status_created_at', table_name='explanations')
+    op.drop_column('explanations', 'locked_by')
+    op.drop_column('explanations', 'locked_at')
+    op.drop_column('explanations', 'attempts')
@@ -0,0 +1,36 @@
+"""report json jsonb
+
+Revision ID: b2f6d8a3c915
+Revises: 7e1c4a9d2b86
+Create Date: 2026-10-18 19:03:27.615402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2f6d8a3c915'
+down_revision: Union[str, Sequence[str], None] = '7e1c4a9d2b86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reescribe la tabla con ACCESS EXCLUSIVE: en tablas grandes, en ventana de mantenimiento
+    op.alter_column(
+        'reports', 'report_json',
+        existing_type=sa.JSON(), type_=postgresql.JSONB(), postgresql_using='report_json::jsonb',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'reports', 'report_json',
+        existing_type=postgresql.JSONB(), type_=sa.JSON(), postgresql_using='report_json::json',
+    )
@@ -0,0 +1,54 @@
+"""explanation single flight
+
+Revision ID: b71d3e9a0c58
+Revises: e8f2a4c61b93
+Create Date: 2026-10-18 12:58:44.603117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71d3e9a0c58'
+down_revision: Union[str, Sequence[str], None] = 'e8f2a4c61b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicados previos: se queda la mejor de cada grupo (DONE > RUNNING > PENDING, la más
+    # antigua) y el resto pasa a FAILED, que el índice parcial no cubre.
+    op.execute(
+        """
+        UPDATE explanations AS e
+        SET status = 'FAILED', error = 'Superseded by ' || d.keep_id, updated_at = now()
+        FROM (
+            SELECT id,
+                   first_value(id) OVER w AS keep_id,
+                   row_number() OVER w AS rn
+            FROM explanations
+            WHERE status IN ('PENDING', 'RUNNING', 'DONE')
+            WINDOW w AS (
+                PARTITION BY tenant_id, decision_event_id, method
+                ORDER BY CASE status WHEN 'DONE' THEN 0 WHEN 'RUNNING' THEN 1 ELSE 2 END, created_at, id
+            )
+        ) AS d
+        WHERE e.id = d.id AND d.rn > 1
+        """
+    )
+    op.create_index(
+        'uq_explanations_active',
+        'explanations',
+        ['tenant_id', 'decision_event_id', 'method'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('PENDING', 'RUNNING', 'DONE')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_explanations_active', table_name='explanations')
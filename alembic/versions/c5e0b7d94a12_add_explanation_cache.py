@@ -0,0 +1,43 @@
+"""add explanation cache
+
+Revision ID: c5e0b7d94a12
+Revises: a3c81f6e2d47
+Create Date: 2026-10-18 11:02:17.540921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e0b7d94a12'
+down_revision: Union[str, Sequence[str], None] = 'a3c81f6e2d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('explanation_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('tenant_id', sa.String(length=64), nullable=False),
+    sa.Column('model_id', sa.String(length=128), nullable=False),
+    sa.Column('model_version', sa.String(length=64), nullable=False),
+    sa.Column('method', sa.String(length=32), nullable=False),
+    sa.Column('evidence', sa.JSON(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_hit_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_explanation_cache_last_hit_at'), 'explanation_cache', ['last_hit_at'], unique=False)
+    op.create_index(op.f('ix_explanation_cache_tenant_id'), 'explanation_cache', ['tenant_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_explanation_cache_tenant_id'), table_name='explanation_cache')
+    op.drop_index(op.f('ix_explanation_cache_last_hit_at'), table_name='explanation_cache')
+    op.drop_table('explanation_cache')
@@ -0,0 +1,41 @@
+"""report listing indexes
+
+Revision ID: d4a7c2e19f60
+Revises: b71d3e9a0c58
+Create Date: 2026-10-18 14:02:31.427805
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c2e19f60'
+down_revision: Union[str, Sequence[str], None] = 'b71d3e9a0c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_reports_tenant_created_at', 'reports', ['tenant_id', 'created_at', 'id']),
+    ('ix_reports_tenant_status_created_at', 'reports', ['tenant_id', 'status', 'created_at', 'id']),
+    ('ix_decision_events_tenant_occurred_at', 'decision_events', ['tenant_id', 'occurred_at']),
+    ('ix_decision_events_tenant_decision_id', 'decision_events', ['tenant_id', 'decision_id']),
+    ('ix_report_revisions_report_version', 'report_revisions', ['report_id', 'version']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY para no bloquear escrituras en tablas grandes; no puede ir en transacción
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,42 @@
+"""add global explanations
+
+Revision ID: e8f2a4c61b93
+Revises: c5e0b7d94a12
+Create Date: 2026-10-18 12:20:05.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8f2a4c61b93'
+down_revision: Union[str, Sequence[str], None] = 'c5e0b7d94a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('global_explanations',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('model_id', sa.String(length=128), nullable=False),
+    sa.Column('model_version', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('curves', sa.JSON(), nullable=False),
+    sa.Column('error', sa.String(length=512), nullable=True),
+    sa.Column('compute_seconds', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('model_id', 'model_version', name='uq_global_explanations_model')
+    )
+    op.create_index(op.f('ix_global_explanations_status'), 'global_explanations', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_global_explanations_status'), table_name='global_explanations')
+    op.drop_table('global_explanations')
@@ -1,9 +1,22 @@
-from fastapi import APIRouter, Depends
+import json
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.core.config import settings
 from app.core.security import require_api_client, get_db
-from app.schemas.decision_event import DecisionEventIn, DecisionEventOut
-from app.crud.decision_events import get_by_idempotency, create_event
+from app.schemas.decision_event import (
+    DecisionEventBatchIn,
+    DecisionEventBatchOut,
+    DecisionEventIn,
+    DecisionEventOut,
+)
+from app.crud.decision_events import create_or_get_event, create_events_bulk
 
 router = APIRouter(prefix="/decision-events", tags=["decision-events"])
 
@@ -14,12 +27,128 @@ def post_decision_event(
     db: Session = Depends(get_db),
     client=Depends(require_api_client),
 ):
-    existing = get_by_idempotency(db, tenant_id=client.tenant_id, idempotency_key=payload.idempotency_key)
-    if existing:
-        return DecisionEventOut(event_id=existing.id, created=False)
+    event_id, created = create_or_get_event(db, tenant_id=client.tenant_id, payload=payload.model_dump())
+    return DecisionEventOut(event_id=event_id, created=created)
+
+
+@router.post(":batch", response_model=DecisionEventBatchOut)
+def post_decision_events_batch(
+    payload: DecisionEventBatchIn,
+    db: Session = Depends(get_db),
+    client=Depends(require_api_client),
+):
+    results = create_events_bulk(
+        db,
+        tenant_id=client.tenant_id,
+        payloads=[item.model_dump() for item in payload.items],
+    )
+    return DecisionEventBatchOut(
+        items=[DecisionEventOut(event_id=event_id, created=created) for event_id, created in results]
+    )
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    # StreamingResponse escucha http.disconnect con receive() mientras envía, y eso se
+    # comería los trozos del body que aún estamos leyendo. La desconexión ya la detecta
+    # request.stream() (ClientDisconnect), así que aquí sólo enviamos.
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+
+def _ndjson(obj: dict) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+async def _ingest_ndjson(request: Request, tenant_id: str) -> AsyncIterator[bytes]:
+    from app.db.session import SessionLocal
+
+    chunk_size = settings.DECISION_EVENTS_STREAM_CHUNK_SIZE
+    max_line = settings.DECISION_EVENTS_STREAM_MAX_LINE_BYTES
+    max_error_lines = settings.DECISION_EVENTS_STREAM_MAX_ERROR_LINES
+
+    counts = {"lines": 0, "created": 0, "existing": 0, "errors": 0}
+    pending: list[dict] = []
+    buffer = bytearray()
+    skipping = False  # descartando una línea demasiado larga hasta el próximo \n
+
+    def error(line_no: int, detail) -> bytes | None:
+        counts["errors"] += 1
+        if counts["errors"] > max_error_lines:
+            return None
+        return _ndjson({"type": "error", "line": line_no, "detail": detail})
+
+    def parse(raw: bytes) -> bytes | None:
+        counts["lines"] += 1
+        raw = raw.strip()
+        if not raw:
+            return None
+        if len(raw) > max_line:
+            return error(counts["lines"], f"Line exceeds {max_line} bytes")
+        try:
+            item = DecisionEventIn.model_validate_json(raw)
+        except ValidationError as e:
+            return error(counts["lines"], e.errors(include_url=False, include_input=False, include_context=False))
+        pending.append(item.model_dump())
+        return None
+
+    db = SessionLocal()
+    try:
+
+        async def flush() -> bytes:
+            results = await run_in_threadpool(create_events_bulk, db, tenant_id=tenant_id, payloads=pending)
+            created = sum(1 for _, c in results if c)
+            counts["created"] += created
+            counts["existing"] += len(results) - created
+            pending.clear()
+            return _ndjson({"type": "progress", **counts})
+
+        async for chunk in request.stream():
+            buffer += chunk
+            while True:
+                idx = buffer.find(b"\n")
+                if idx < 0:
+                    if not skipping and len(buffer) > max_line:
+                        counts["lines"] += 1
+                        out = error(counts["lines"], f"Line exceeds {max_line} bytes")
+                        if out:
+                            yield out
+                        skipping = True
+                    if skipping:
+                        buffer.clear()
+                    break
+
+                raw = bytes(buffer[:idx])
+                del buffer[: idx + 1]
+                if skipping:
+                    skipping = False
+                    continue
+                out = parse(raw)
+                if out:
+                    yield out
+                # Backpressure: no se lee más body hasta que el trozo actual está escrito
+                if len(pending) >= chunk_size:
+                    yield await flush()
+
+        if buffer and not skipping:
+            out = parse(bytes(buffer))
+            if out:
+                yield out
+        if pending:
+            yield await flush()
+
+        yield _ndjson({"type": "done", **counts})
+    except SQLAlchemyError as e:
+        db.rollback()
+        yield _ndjson({"type": "fatal", "detail": str(e.__class__.__name__), **counts})
+    finally:
+        db.close()
+
 
-    data = payload.model_dump()
-    data["tenant_id"] = client.tenant_id
-    obj = create_event(db, payload=data)
+@router.post(":stream")
+async def stream_decision_events(request: Request, client=Depends(require_api_client)):
+    """Ingesta NDJSON (un DecisionEventIn por línea) con memoria constante.
 
-    return DecisionEventOut(event_id=obj.id, created=True)
+    Responde también en NDJSON: una línea "progress" por cada trozo insertado, una
+    "error" por cada línea inválida y una "done" final con los totales.
+    """
+    return _DuplexStreamingResponse(_ingest_ndjson(request, client.tenant_id), media_type="application/x-ndjson")
@@ -1,51 +1,131 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+import asyncio
+import json
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.core.config import settings
 from app.core.security import require_api_client, get_db
-from app.crud.explanations import (
-    create_explanation,
-    get_explanation,
-    set_running,
-    set_done,
-    set_failed,
-)
+from app.crud.explanation_cache import cache_key, get_cached_evidence, record_hit
+from app.crud.explanations import create_or_get_explanation, get_explanation, get_statuses
+from app.models.decision_event import DecisionEvent
+from app.services.explanation_engine import EXPLAINERS
+from app.services.explanation_events import TERMINAL_STATUSES, status_hub
 from app.schemas.explanation import ExplanationCreateOut, ExplanationOut
 
 router = APIRouter(prefix="/explanations", tags=["explanations"])
 
 
-def _compute_explanation_stub(tenant_id: str, explanation_id: str):
-    # Import dentro para evitar problemas de import circular/tiempos de carga
-    from app.db.session import SessionLocal
+@router.post("", response_model=ExplanationCreateOut, status_code=status.HTTP_202_ACCEPTED)
+def create_expl(
+    db: Session = Depends(get_db),
+    client=Depends(require_api_client),
+    decision_event_id: str = "",
+    method: str = "stub",
+):
+    if not decision_event_id:
+        raise HTTPException(status_code=422, detail="decision_event_id is required")
+    if method not in EXPLAINERS:
+        raise HTTPException(status_code=422, detail=f"Unknown method. Available: {sorted(EXPLAINERS)}")
+
+    de = db.execute(
+        select(DecisionEvent.model_id, DecisionEvent.model_version, DecisionEvent.input_features).where(
+            DecisionEvent.tenant_id == client.tenant_id,
+            DecisionEvent.id == decision_event_id,
+        )
+    ).first()
+    if not de:
+        raise HTTPException(status_code=404, detail="DecisionEvent not found")
+
+    evidence = key = None
+    if settings.EXPLANATION_CACHE_ENABLED:
+        key = cache_key(
+            tenant_id=client.tenant_id,
+            model_id=de.model_id,
+            model_version=de.model_version,
+            method=method,
+            input_features=de.input_features,
+        )
+        evidence = get_cached_evidence(db, key=key)
+
+    # Sin acierto queda PENDING en la tabla; lo recoge un worker (app.workers.explanations)
+    explanation_id, expl_status, created = create_or_get_explanation(
+        db, tenant_id=client.tenant_id, decision_event_id=decision_event_id, method=method, evidence=evidence
+    )
+    if evidence is not None and created:
+        # Si ya había una explicación (single-flight) la evidencia cacheada no se ha usado
+        record_hit(db, key=key)
+    return ExplanationCreateOut(explanation_id=explanation_id, status=expl_status, created=created)
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
 
-    db = SessionLocal()
+async def _status_stream(
+    tenant_id: str, queue: asyncio.Queue, ids: list[str], current: dict[str, str]
+) -> AsyncIterator[bytes]:
     try:
-        set_running(db, tenant_id=tenant_id, explanation_id=explanation_id)
-
-        # Aquí irá SHAP / reglas / contrafactuales. Por ahora devolvemos algo determinista.
-        evidence = {
-            "type": "stub",
-            "main_factors": [
-                {"feature": "income", "direction": "positive", "importance": 0.3},
-                {"feature": "late_payments_12m", "direction": "negative", "importance": 0.6},
-            ],
-        }
-        set_done(db, tenant_id=tenant_id, explanation_id=explanation_id, evidence=evidence)
-    except Exception as e:
-        set_failed(db, tenant_id=tenant_id, explanation_id=explanation_id, error=str(e))
+        for i in ids:
+            yield _sse("status", {"explanation_id": i, "status": current[i]})
+        while any(s not in TERMINAL_STATUSES for s in current.values()):
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.EXPLANATION_EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            i, new_status = event.get("id"), event.get("status")
+            # Puede llegar repetido (NOTIFY previo a la lectura inicial) o fuera de orden
+            if event.get("tenant_id") != tenant_id or current.get(i) in TERMINAL_STATUSES or current.get(i) == new_status:
+                continue
+            current[i] = new_status
+            yield _sse("status", {"explanation_id": i, "status": new_status})
+        yield _sse("done", {"explanation_ids": ids})
     finally:
-        db.close()
+        status_hub.unsubscribe(ids, queue)
 
 
-@router.post("", response_model=ExplanationCreateOut, status_code=status.HTTP_202_ACCEPTED)
-def create_expl(background_tasks: BackgroundTasks, db: Session = Depends(get_db), client=Depends(require_api_client), decision_event_id: str = ""):
-    if not decision_event_id:
-        raise HTTPException(status_code=422, detail="decision_event_id is required")
+@router.get("/events")
+async def stream_expl_status(
+    ids: list[str] = Query(...),
+    db: Session = Depends(get_db),
+    client=Depends(require_api_client),
+):
+    """Server-Sent Events con los cambios de estado de una o varias explicaciones.
 
-    expl = create_explanation(db, tenant_id=client.tenant_id, decision_event_id=decision_event_id, method="stub")
+    Emite el estado actual de cada id y después sólo las transiciones; se cierra
+    cuando todas están DONE o FAILED.
+    """
+    ids = list(dict.fromkeys(i for raw in ids for i in raw.split(",") if i))
+    if not ids or len(ids) > settings.EXPLANATION_EVENTS_MAX_IDS:
+        raise HTTPException(
+            status_code=422, detail=f"Between 1 and {settings.EXPLANATION_EVENTS_MAX_IDS} ids are required"
+        )
 
-    background_tasks.add_task(_compute_explanation_stub, client.tenant_id, expl.id)  # se ejecuta tras responder [web:292]
-    return ExplanationCreateOut(explanation_id=expl.id, status=expl.status)
+    # Suscribir antes de leer: una transición entre la lectura y la suscripción se perdería
+    queue = status_hub.subscribe(ids)
+    try:
+        current = await run_in_threadpool(get_statuses, db, tenant_id=client.tenant_id, explanation_ids=ids)
+    except BaseException:
+        status_hub.unsubscribe(ids, queue)
+        raise
+    finally:
+        # La sesión no se vuelve a usar: no retener una conexión del pool mientras dure el stream
+        await run_in_threadpool(db.close)
+    missing = [i for i in ids if i not in current]
+    if missing:
+        status_hub.unsubscribe(ids, queue)
+        raise HTTPException(status_code=404, detail=f"Explanation not found: {missing[0]}")
+
+    return StreamingResponse(
+        _status_stream(client.tenant_id, queue, ids, current),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{explanation_id}", response_model=ExplanationOut)
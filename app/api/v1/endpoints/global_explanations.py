@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.security import require_api_client, get_db
+from app.crud.decision_events import uses_model
+from app.crud.global_explanations import get_global_explanation
+from app.schemas.global_explanation import GlobalExplanationOut
+
+router = APIRouter(prefix="/global-explanations", tags=["global-explanations"])
+
+
+@router.get("/{model_id}/{model_version}", response_model=GlobalExplanationOut)
+def get_global_expl(
+    model_id: str, model_version: str, db: Session = Depends(get_db), client=Depends(require_api_client)
+):
+    # Curvas PDP/ICE precalculadas por el worker (app.services.global_explanations). Los modelos
+    # del registro son globales, pero un tenant sólo ve los que usan sus propias decisiones; al
+    # resto, 404 igual que si no existieran.
+    if not uses_model(db, tenant_id=client.tenant_id, model_id=model_id, model_version=model_version):
+        raise HTTPException(status_code=404, detail="Global explanation not found")
+    gex = get_global_explanation(db, model_id=model_id, model_version=model_version)
+    if not gex:
+        raise HTTPException(status_code=404, detail="Global explanation not found")
+
+    return GlobalExplanationOut(
+        global_explanation_id=gex.id,
+        model_id=gex.model_id,
+        model_version=gex.model_version,
+        status=gex.status,
+        curves=gex.curves or {},
+        error=gex.error,
+    )
@@ -1,37 +1,60 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, load_only
 
+from app.core.pagination import decode_cursor, encode_cursor, no_offset
 from app.core.security import require_api_client, get_db
+from app.crud.global_explanations import get_done_id, get_done_ids
+from app.crud.report_revisions import (
+    add_revision,
+    add_revisions_bulk,
+    find_revision,
+    get_revision_json,
+    revision_bytes_cache,
+)
+from app.crud.reports import (
+    bump_version,
+    count_reports,
+    decision_fields,
+    get_existing_report,
+    get_existing_reports,
+    get_report_head,
+    insert_reports_bulk,
+    list_reports,
+    report_bytes_cache,
+    report_json_patched,
+)
 from app.models.decision_event import DecisionEvent
 from app.models.explanation import Explanation
 from app.models.report import Report
-from app.schemas.report import ReportCreateIn, ReportCreateOut, ReportOut
-
-router = APIRouter(prefix="/reports", tags=["reports"])
-from pydantic import ValidationError
+from app.models.report_revision import ReportRevision
+from app.schemas.report import (
+    ReportBulkCreateIn,
+    ReportBulkCreateOut,
+    ReportBulkItemOut,
+    ReportCreateIn,
+    ReportCreateOut,
+    ReportListItem,
+    ReportListOut,
+    ReportOut,
+    ReportUpdateIn,
+)
+from app.schemas.report_finalize import ReportFinalizeIn
+from app.schemas.report_revision import ReportRevisionItem, ReportRevisionListOut, ReportVersionOut
 from app.schemas.report_schema_v1 import ReportSchemaV1
-
-from pydantic import ValidationError
+from app.services import json_delta
 from app.services.report_builder import build_report_schema_v1
-from app.schemas.report_schema_v1 import ReportSchemaV1
+from app.services.report_fingerprint import REPORT_FINGERPRINT, stored_report_json
+from app.services.report_patch import apply_section_operations
 
-from fastapi import Query
-from app.crud.reports import count_reports, list_reports
-from app.schemas.report import ReportListOut, ReportListItem
-
-from app.crud.reports import get_existing_report
-
-from datetime import datetime
-from fastapi import Query
-from app.crud.reports import count_reports, list_reports
-from app.schemas.report import ReportListOut, ReportListItem
+router = APIRouter(prefix="/reports", tags=["reports"])
 
-from datetime import datetime, timezone
-from app.schemas.report_finalize import ReportFinalizeIn
+_BULK_INSERT_CHUNK = 1000
 
-from app.crud.report_revisions import add_revision
 
 @router.post("", response_model=ReportCreateOut, status_code=status.HTTP_201_CREATED)
 def create_report(payload: ReportCreateIn, db: Session = Depends(get_db), client=Depends(require_api_client)):
@@ -66,7 +89,12 @@ def create_report(payload: ReportCreateIn, db: Session = Depends(get_db), client
         return ReportCreateOut(report_id=existing.id, status=existing.status)
 
     try:
-        validated = build_report_schema_v1(template_id=payload.template_id, de=de, ex=ex)
+        validated = build_report_schema_v1(
+            template_id=payload.template_id,
+            de=de,
+            ex=ex,
+            global_explanation_id=get_done_id(db, model_id=de.model_id, model_version=de.model_version),
+        )
     except ValidationError as e:
         raise HTTPException(status_code=422, detail=e.errors())
 
@@ -78,9 +106,11 @@ def create_report(payload: ReportCreateIn, db: Session = Depends(get_db), client
         decision_event_id=payload.decision_event_id,
         explanation_id=payload.explanation_id,
         template_id=payload.template_id,
+        **decision_fields(de),
         status="DRAFT",
         version=1,  # <-- clave
         report_json=report_json,
+        report_fingerprint=REPORT_FINGERPRINT,
         updated_by_client_id=client.id,
     )
 
@@ -102,34 +132,206 @@ def create_report(payload: ReportCreateIn, db: Session = Depends(get_db), client
     return ReportCreateOut(report_id=rpt.id, status=rpt.status)
 
 
+@router.post(":bulk", response_model=ReportBulkCreateOut)
+def create_reports_bulk(payload: ReportBulkCreateIn, db: Session = Depends(get_db), client=Depends(require_api_client)):
+    """Como POST /reports para muchos items: 4 consultas de lectura y los INSERT por lotes."""
+    tenant_id = client.tenant_id
+    items = payload.items
+
+    des = {
+        de.id: de
+        for de in db.execute(
+            select(DecisionEvent)
+            .options(
+                load_only(
+                    DecisionEvent.id,
+                    DecisionEvent.decision_id,
+                    DecisionEvent.occurred_at,
+                    DecisionEvent.model_id,
+                    DecisionEvent.model_version,
+                    DecisionEvent.final_decision,
+                )
+            )
+            .where(DecisionEvent.tenant_id == tenant_id, DecisionEvent.id.in_({i.decision_event_id for i in items}))
+        ).scalars()
+    }
+    exs = {
+        ex.id: ex
+        for ex in db.execute(
+            select(Explanation)
+            .options(load_only(Explanation.id, Explanation.status, Explanation.evidence))
+            .where(Explanation.tenant_id == tenant_id, Explanation.id.in_({i.explanation_id for i in items}))
+        ).scalars()
+    }
+    identities = list(dict.fromkeys((i.decision_event_id, i.explanation_id, i.template_id) for i in items))
+    existing = get_existing_reports(db, tenant_id=tenant_id, identities=identities)
+    global_ids = get_done_ids(db, models={(de.model_id, de.model_version) for de in des.values()})
+
+    results: list[ReportBulkItemOut | tuple] = []
+    new_rows: dict[tuple, dict] = {}
+    for item in items:
+        identity = (item.decision_event_id, item.explanation_id, item.template_id)
+        de = des.get(item.decision_event_id)
+        ex = exs.get(item.explanation_id)
+        if not de:
+            results.append(ReportBulkItemOut(status_code=404, error="DecisionEvent not found"))
+        elif not ex:
+            results.append(ReportBulkItemOut(status_code=404, error="Explanation not found"))
+        elif ex.status != "DONE":
+            results.append(ReportBulkItemOut(status_code=409, error="Explanation not DONE"))
+        elif identity in existing:
+            report_id, report_status = existing[identity]
+            results.append(ReportBulkItemOut(status_code=200, report_id=report_id, status=report_status))
+        elif identity in new_rows:
+            results.append(identity)  # repetido en el lote: mismo report que la primera aparición
+        else:
+            try:
+                validated = build_report_schema_v1(
+                    template_id=item.template_id,
+                    de=de,
+                    ex=ex,
+                    global_explanation_id=global_ids.get((de.model_id, de.model_version)),
+                )
+            except ValidationError as e:
+                results.append(ReportBulkItemOut(status_code=422, error=e.errors(include_context=False)))
+                continue
+            report_json = validated.model_dump(mode="json")
+            new_rows[identity] = {
+                "id": str(uuid.uuid4()),
+                "tenant_id": tenant_id,
+                "decision_event_id": item.decision_event_id,
+                "explanation_id": item.explanation_id,
+                "template_id": item.template_id,
+                **decision_fields(de),
+                "status": "DRAFT",
+                "version": 1,
+                "report_json": report_json,
+                "report_fingerprint": REPORT_FINGERPRINT,
+                "updated_by_client_id": client.id,
+            }
+            results.append(identity)
+
+    rows = list(new_rows.values())
+    inserted: set[str] = set()
+    for start in range(0, len(rows), _BULK_INSERT_CHUNK):
+        chunk = rows[start : start + _BULK_INSERT_CHUNK]
+        ids = insert_reports_bulk(db, rows=chunk)
+        add_revisions_bulk(
+            db,
+            rows=[
+                {
+                    "id": str(uuid.uuid4()),
+                    "tenant_id": tenant_id,
+                    "report_id": r["id"],
+                    "version": 1,
+                    "action": "CREATE",
+                    "report_json": r["report_json"],
+                    "created_by_client_id": client.id,
+                }
+                for r in chunk
+                if r["id"] in ids
+            ],
+        )
+        inserted |= ids
+
+    # Las que perdieron la carrera contra otra petición concurrente ya existen: se devuelven esas
+    lost = [identity for identity, r in new_rows.items() if r["id"] not in inserted]
+    existing.update(get_existing_reports(db, tenant_id=tenant_id, identities=lost))
+    db.commit()
+
+    out: list[ReportBulkItemOut] = []
+    seen: set[tuple] = set()
+    for res in results:
+        if isinstance(res, ReportBulkItemOut):
+            out.append(res)
+            continue
+        row = new_rows[res]
+        if row["id"] in inserted and res not in seen:
+            out.append(ReportBulkItemOut(status_code=201, report_id=row["id"], status="DRAFT", created=True))
+        elif row["id"] in inserted:
+            out.append(ReportBulkItemOut(status_code=200, report_id=row["id"], status="DRAFT"))
+        else:
+            report_id, report_status = existing[res]
+            out.append(ReportBulkItemOut(status_code=200, report_id=report_id, status=report_status))
+        seen.add(res)
+
+    created = sum(r.created for r in out)
+    failed = sum(r.status_code >= 400 for r in out)
+    return ReportBulkCreateOut(items=out, created=created, existing=len(out) - created - failed, failed=failed)
+
+
+def _report_headers(version: int, status: str) -> dict:
+    # ETag fuerte: cada cambio del report incrementa version. Un FINAL ya no cambia nunca.
+    return {
+        "ETag": f'"{version}"',
+        "Cache-Control": "private, max-age=31536000, immutable" if status == "FINAL" else "private, no-cache",
+    }
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match compara en modo débil: W/"3" vale como "3"
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
 @router.get("/{report_id}", response_model=ReportOut)
-def get_report(report_id: str, db: Session = Depends(get_db), client=Depends(require_api_client)):
+def get_report(
+    report_id: str,
+    request: Request,
+    validate: bool = False,
+    db: Session = Depends(get_db),
+    client=Depends(require_api_client),
+):
+    """Sin `validate`, un report_json sellado con el esquema actual se devuelve sin revalidar.
+
+    La huella sólo detecta cambios de esquema: un report_json modificado por fuera de la API que
+    conserve el sello no se detecta salvo con validate=true.
+    """
+    if not validate:
+        # Camino rápido: una lectura estrecha (version, status) y, si hay suerte, 304 o bytes ya hechos
+        head = get_report_head(db, tenant_id=client.tenant_id, report_id=report_id)
+        if not head:
+            raise HTTPException(status_code=404, detail="Report not found")
+        headers = _report_headers(head.version, head.status)
+        if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        body = report_bytes_cache.get((report_id, head.version))
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers=headers)
+
     rpt = db.execute(
         select(Report).where(Report.tenant_id == client.tenant_id, Report.id == report_id)
     ).scalars().first()
     if not rpt:
         raise HTTPException(status_code=404, detail="Report not found")
 
+    # Con huella válida se devuelve lo guardado; validate=true fuerza la validación completa
     try:
-        validated = ReportSchemaV1.model_validate(rpt.report_json or {})
+        report_json = stored_report_json(rpt, validate=validate)
     except ValidationError as e:
         raise HTTPException(status_code=500, detail={"msg": "Stored report_json is invalid", "errors": e.errors()})
 
-    return ReportOut(
+    body = ReportOut(
         report_id=rpt.id,
         status=rpt.status,
         template_id=rpt.template_id,
-        report_json=validated.model_dump(mode="json"),
+        report_json=report_json,
         report_text=rpt.report_text,
         version=rpt.version
-    )
+    ).model_dump_json().encode()
+    report_bytes_cache.set((rpt.id, rpt.version), body)
+    return Response(content=body, media_type="application/json", headers=_report_headers(rpt.version, rpt.status))
 
 @router.get("", response_model=ReportListOut)
 def get_reports(
     db: Session = Depends(get_db),
     client=Depends(require_api_client),
-    offset: int = Query(0, ge=0),
     limit: int = Query(20, gt=0, le=100),
+    cursor: str | None = None,
+    include_total: bool = False,
+    _offset: None = Depends(no_offset),
 
     status: str | None = None,
     decision_event_id: str | None = None,
@@ -137,21 +339,24 @@ def get_reports(
     occurred_after: datetime | None = None,
     occurred_before: datetime | None = None,
 ):
-    total = count_reports(
-        db,
-        tenant_id=client.tenant_id,
-        status=status,
-        decision_event_id=decision_event_id,
-        decision_id=decision_id,
-        occurred_after=occurred_after,
-        occurred_before=occurred_before,
-    )
+    total = None
+    if include_total:
+        # El conteo recorre todo el filtro: sólo si se pide
+        total = count_reports(
+            db,
+            tenant_id=client.tenant_id,
+            status=status,
+            decision_event_id=decision_event_id,
+            decision_id=decision_id,
+            occurred_after=occurred_after,
+            occurred_before=occurred_before,
+        )
 
     rows = list_reports(
         db,
         tenant_id=client.tenant_id,
-        offset=offset,
-        limit=limit,
+        limit=limit + 1,  # una de más para saber si hay otra página
+        after=decode_cursor(cursor, datetime, str) if cursor else None,
         status=status,
         decision_event_id=decision_event_id,
         decision_id=decision_id,
@@ -159,30 +364,104 @@ def get_reports(
         occurred_before=occurred_before,
     )
 
-    items = []
-    for r, de in rows:
-        label = (de.final_decision or {}).get("label") if isinstance(de.final_decision, dict) else None
-        items.append(
-            ReportListItem(
-                report_id=r.id,
-                status=r.status,
-                template_id=r.template_id,
-                decision_event_id=r.decision_event_id,
-                explanation_id=r.explanation_id,
-                created_at=r.created_at,
-                decision_id=de.decision_id,
-                occurred_at=de.occurred_at,
-                decision_label=label,
-                version=r.version
-            )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    items = [
+        ReportListItem(
+            report_id=r.id,
+            status=r.status,
+            template_id=r.template_id,
+            decision_event_id=r.decision_event_id,
+            explanation_id=r.explanation_id,
+            created_at=r.created_at,
+            decision_id=r.decision_id,
+            occurred_at=r.occurred_at,
+            decision_label=r.decision_label,
+            version=r.version,
         )
+        for r in rows
+    ]
 
-    return ReportListOut(total=total, items=items, offset=offset, limit=limit)
+    return ReportListOut(total=total, items=items, limit=limit, next_cursor=next_cursor)
 
 
-from pydantic import ValidationError
-from app.schemas.report import ReportUpdateIn
-from app.schemas.report_schema_v1 import ReportSchemaV1
+def _version_conflict(db: Session, *, client, report_id: str, final_detail: str) -> HTTPException:
+    """Error para un bump_version que no ha casado, según el estado confirmado del report."""
+    head = get_report_head(db, tenant_id=client.tenant_id, report_id=report_id)
+    if head is None:
+        return HTTPException(status_code=404, detail="Report not found")
+    if head.status == "FINAL":
+        return HTTPException(status_code=409, detail=final_detail)
+    # Puede seguir mostrando la versión esperada si la otra edición aún no ha hecho commit
+    return HTTPException(status_code=409, detail={"msg": "Version conflict", "current_version": head.version})
+
+
+def _patch_sections(db: Session, *, client, rpt: Report, current: dict, operations) -> ReportOut:
+    """Patch por operaciones de sección/bloque.
+
+    Si lo guardado tiene huella del esquema actual, `current` es lo que hay en la BD: las partes
+    nuevas ya vienen validadas como Section/UIBlock al parsear el payload y el resto no cambia,
+    así que sólo se escriben las rutas cambiadas (jsonb_set) y la revisión guarda ese mismo delta.
+    Si no, `current` es la versión revalidada (puede diferir de lo guardado): se valida el
+    documento resultante y se escribe entero.
+    """
+    old_sections = current.get("sections", [])
+    try:
+        sections = apply_section_operations(old_sections, operations)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    report_json = {**current, "sections": sections}
+    if rpt.report_fingerprint == REPORT_FINGERPRINT:
+        delta = json_delta.diff(old_sections, sections, path=("sections",))
+        stored_json = report_json_patched(delta)
+        previous_json = current
+    else:
+        try:
+            report_json = ReportSchemaV1.model_validate(report_json).model_dump(mode="json")
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors())
+        # delta respecto a lo guardado de verdad, no a la versión revalidada
+        stored_json, previous_json, delta = report_json, rpt.report_json, None
+
+    head = bump_version(
+        db,
+        tenant_id=client.tenant_id,
+        report_id=rpt.id,
+        expected_version=rpt.version,
+        values={
+            "report_json": stored_json,
+            "report_fingerprint": REPORT_FINGERPRINT,
+            "updated_by_client_id": client.id,
+        },
+    )
+    if head is None:
+        raise _version_conflict(db, client=client, report_id=rpt.id, final_detail="Report is FINAL and cannot be edited")
+
+    add_revision(
+        db,
+        tenant_id=client.tenant_id,
+        report_id=rpt.id,
+        version=head.version,
+        action="PATCH",
+        report_json=report_json,
+        previous_json=previous_json,
+        delta=delta,
+        created_by_client_id=client.id,
+    )
+    db.commit()
+    return ReportOut(
+        report_id=rpt.id,
+        status=head.status,
+        template_id=rpt.template_id,
+        version=head.version,
+        report_json=report_json,
+        report_text=rpt.report_text,
+    )
+
 
 @router.patch("/{report_id}", response_model=ReportOut)
 def patch_report(
@@ -204,14 +483,21 @@ def patch_report(
     if payload.expected_version != rpt.version:
         raise HTTPException(status_code=409, detail={"msg": "Version conflict", "current_version": rpt.version})
 
-    # 1) valida lo almacenado
+    # 1) lo almacenado (sólo se revalida si no tiene huella válida)
     try:
-        current = ReportSchemaV1.model_validate(rpt.report_json or {})
+        current = stored_report_json(rpt)
     except ValidationError as e:
         raise HTTPException(status_code=500, detail={"msg": "Stored report_json is invalid", "errors": e.errors()})
 
+    # Se escribe con bump_version (UPDATE condicional a la versión leída): que el ORM no vuelque
+    # su copia al hacer commit.
+    db.expunge(rpt)
+
+    if payload.operations is not None:
+        return _patch_sections(db, client=client, rpt=rpt, current=current, operations=payload.operations)
+
     # 2) aplica patch parcial (solo si viene)
-    updated_dict = current.model_dump()
+    updated_dict = dict(current)
     patch = payload.model_dump(exclude_unset=True)
     if "sections" in patch:
         updated_dict["sections"] = patch["sections"]
@@ -222,27 +508,39 @@ def patch_report(
     except ValidationError as e:
         raise HTTPException(status_code=422, detail=e.errors())
 
-    rpt.report_json = validated.model_dump(mode="json")
-    rpt.version += 1
-    rpt.updated_by_client_id = client.id
+    report_json = validated.model_dump(mode="json")
+    head = bump_version(
+        db,
+        tenant_id=client.tenant_id,
+        report_id=rpt.id,
+        expected_version=rpt.version,
+        values={
+            "report_json": report_json,
+            "report_fingerprint": REPORT_FINGERPRINT,
+            "updated_by_client_id": client.id,
+        },
+    )
+    if head is None:
+        raise _version_conflict(db, client=client, report_id=rpt.id, final_detail="Report is FINAL and cannot be edited")
+
     add_revision(
         db,
         tenant_id=client.tenant_id,
         report_id=rpt.id,
-        version=rpt.version,
+        version=head.version,
         action="PATCH",
-        report_json=rpt.report_json,
+        report_json=report_json,
+        previous_json=rpt.report_json,
         created_by_client_id=client.id,
     )
     db.commit()
-    db.refresh(rpt)
 
     return ReportOut(
         report_id=rpt.id,
-        status=rpt.status,
+        status=head.status,
         template_id=rpt.template_id,
-        version=rpt.version,          # <-- AÑADE ESTO
-        report_json=validated.model_dump(mode="json"),
+        version=head.version,          # <-- AÑADE ESTO
+        report_json=report_json,
         report_text=rpt.report_text,
     )
 
@@ -268,46 +566,55 @@ def finalize_report(
             detail={"msg": "Version conflict", "current_version": rpt.version},
         )
 
-    rpt.status = "FINAL"
-    rpt.finalized_at = datetime.now(timezone.utc)
-    rpt.finalized_by_client_id = client.id
-    rpt.version += 1
+    try:
+        report_json = stored_report_json(rpt)
+    except ValidationError as e:
+        raise HTTPException(status_code=500, detail={"msg": "Stored report_json is invalid", "errors": e.errors()})
+
+    db.expunge(rpt)  # se escribe con bump_version, no con el flush del ORM
+    head = bump_version(
+        db,
+        tenant_id=client.tenant_id,
+        report_id=rpt.id,
+        expected_version=rpt.version,
+        values={
+            "status": "FINAL",
+            "finalized_at": datetime.now(timezone.utc),
+            "finalized_by_client_id": client.id,
+        },
+    )
+    if head is None:
+        raise _version_conflict(db, client=client, report_id=rpt.id, final_detail="Report already FINAL")
 
     add_revision(
         db,
         tenant_id=client.tenant_id,
         report_id=rpt.id,
-        version=rpt.version,
+        version=head.version,
         action="FINALIZE",
         report_json=rpt.report_json,
+        previous_json=rpt.report_json,  # sin cambios: delta vacío salvo que toque snapshot
         created_by_client_id=client.id,
     )
     db.commit()
-    db.refresh(rpt)
 
-    validated = ReportSchemaV1.model_validate(rpt.report_json or {})
     return ReportOut(
         report_id=rpt.id,
-        status=rpt.status,
+        status=head.status,
         template_id=rpt.template_id,
-        report_json=validated.model_dump(mode="json"),
+        report_json=report_json,
         report_text=rpt.report_text,
-        version=rpt.version,  # si ya lo añadiste en ReportOut
+        version=head.version,  # si ya lo añadiste en ReportOut
     )
 
-from fastapi import Depends, HTTPException, Query
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
-from app.core.security import require_api_client, get_db
-from app.models.report_revision import ReportRevision
-from app.schemas.report_revision import ReportRevisionItem, ReportRevisionListOut
-
 
 @router.get("/{report_id}/revisions", response_model=ReportRevisionListOut)
 def list_report_revisions(
     report_id: str,
-    offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    include_total: bool = False,
+    _offset: None = Depends(no_offset),
     db: Session = Depends(get_db),
     client=Depends(require_api_client),
 ):
@@ -316,17 +623,37 @@ def list_report_revisions(
         ReportRevision.report_id == report_id,
     )
 
-    total = db.execute(
-        select(func.count()).select_from(ReportRevision).where(*filters)
-    ).scalar_one()
+    total = None
+    if include_total:
+        total = db.execute(
+            select(func.count()).select_from(ReportRevision).where(*filters)
+        ).scalar_one()
 
-    rows = db.execute(
+    # Sólo metadatos: sin leer los JSONB report_json/delta de cada revisión
+    stmt = (
         select(ReportRevision)
+        .options(
+            load_only(
+                ReportRevision.id,
+                ReportRevision.version,
+                ReportRevision.action,
+                ReportRevision.created_at,
+                ReportRevision.created_by_client_id,
+            )
+        )
         .where(*filters)
         .order_by(ReportRevision.version.desc())
-        .offset(offset)
-        .limit(limit)
-    ).scalars().all()
+        .limit(limit + 1)
+    )
+    if cursor:
+        (before_version,) = decode_cursor(cursor, int)
+        stmt = stmt.where(ReportRevision.version < before_version)
+    rows = db.execute(stmt).scalars().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].version)
 
     items = [
         ReportRevisionItem(
@@ -339,4 +666,65 @@ def list_report_revisions(
         for r in rows
     ]
 
-    return ReportRevisionListOut(total=total, items=items, offset=offset, limit=limit)
+    return ReportRevisionListOut(total=total, items=items, limit=limit, next_cursor=next_cursor)
+
+
+def _report_version_response(db: Session, *, tenant_id: str, report_id: str, revision, cache_control: str) -> Response:
+    if revision is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+
+    key = (tenant_id, report_id, revision.version)
+    body = revision_bytes_cache.get(key)
+    if body is None:
+        doc = get_revision_json(db, tenant_id=tenant_id, report_id=report_id, version=revision.version)
+        try:
+            validated = ReportSchemaV1.model_validate(doc or {})
+        except ValidationError as e:
+            raise HTTPException(status_code=500, detail={"msg": "Stored revision is invalid", "errors": e.errors()})
+        body = ReportVersionOut(
+            report_id=report_id,
+            version=revision.version,
+            action=revision.action,
+            created_at=revision.created_at,
+            report_json=validated.model_dump(mode="json"),
+        ).model_dump_json().encode()
+        revision_bytes_cache.set(key, body)
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": f'"{revision.version}"', "Cache-Control": cache_control},
+    )
+
+
+@router.get("/{report_id}/revisions/{version}", response_model=ReportVersionOut)
+def get_report_version(
+    report_id: str,
+    version: int,
+    db: Session = Depends(get_db),
+    client=Depends(require_api_client),
+):
+    revision = find_revision(db, tenant_id=client.tenant_id, report_id=report_id, version=version)
+    # Una versión histórica no cambia nunca
+    return _report_version_response(
+        db,
+        tenant_id=client.tenant_id,
+        report_id=report_id,
+        revision=revision,
+        cache_control="private, max-age=31536000, immutable",
+    )
+
+
+@router.get("/{report_id}/as-of", response_model=ReportVersionOut)
+def get_report_as_of(
+    report_id: str,
+    at: datetime,
+    db: Session = Depends(get_db),
+    client=Depends(require_api_client),
+):
+    """El report tal como estaba en `at`: la última revisión creada hasta ese instante."""
+    revision = find_revision(db, tenant_id=client.tenant_id, report_id=report_id, as_of=at)
+    # La versión vigente en `at` puede cambiar si `at` aún no ha pasado
+    return _report_version_response(
+        db, tenant_id=client.tenant_id, report_id=report_id, revision=revision, cache_control="private, no-cache"
+    )
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+
+from app.core.security import require_api_client
+from app.crud.api_clients import api_key_cache
+from app.crud.explanation_cache import explanation_cache_stats
+from app.crud.report_revisions import revision_bytes_cache
+from app.crud.reports import report_bytes_cache
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/caches")
+def cache_stats(client=Depends(require_api_client)):
+    # Contadores de las caches en memoria de este proceso: cada réplica/worker tiene los suyos
+    caches = {
+        "api_keys": api_key_cache,
+        "report_bytes": report_bytes_cache,
+        "revision_bytes": revision_bytes_cache,
+    }
+    out = {name: {**c.stats.as_dict(), "size": len(c), "max_size": c.max_size} for name, c in caches.items()}
+    # En la BD, no en memoria: sin size/max_size (los acota prune)
+    out["explanation_cache"] = explanation_cache_stats.as_dict()
+    return out
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class TTLCache(Generic[K, V]):
+    """LRU acotado en memoria con expiración por entrada.
+
+    Es por proceso: cada réplica/worker tiene el suyo, así que el TTL es lo que
+    acota cuánto tarda en verse un cambio hecho desde otro proceso. ttl_seconds=None no
+    expira nunca; 0 (o max_size 0) desactiva la cache: set() no guarda nada.
+    """
+
+    def __init__(self, *, max_size: int, ttl_seconds: float | None, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float | None, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[key]
+                self.stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        if self.max_size <= 0 or (self.ttl_seconds is not None and self.ttl_seconds <= 0):
+            return
+        expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[K, V], bool]) -> int:
+        with self._lock:
+            stale = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+            for k in stale:
+                del self._data[k]
+            return len(stale)
+
+    def items(self) -> list[tuple[K, V]]:
+        # Instantánea sin tocar contadores ni orden LRU
+        with self._lock:
+            return [(k, v) for k, (_, v) in self._data.items()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
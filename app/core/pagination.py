@@ -0,0 +1,39 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Query
+
+# Cursores opacos para paginación por clave (keyset): codifican la clave de ordenación
+# de la última fila devuelta, así cada página es un range scan sobre el índice y cuesta
+# lo mismo que la primera, sin OFFSET.
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def no_offset(offset: int | None = Query(None, deprecated=True, include_in_schema=False)) -> None:
+    """Dependencia que rechaza `offset` en los listados que antes paginaban con él.
+
+    Sin ella FastAPI ignora el parámetro y un cliente antiguo recibiría la primera página una y
+    otra vez; mejor un 400 que le diga que use el cursor.
+    """
+    if offset is not None:
+        raise HTTPException(
+            status_code=400,
+            detail="offset pagination is no longer supported; pass the previous response's next_cursor as cursor",
+        )
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """Valores del cursor convertidos a `types`; 400 si no es un cursor de este listado."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        return tuple(datetime.fromisoformat(v) if t is datetime else t(v) for v, t in zip(values, types))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -6,7 +6,7 @@ from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import APIKeyHeader
 from sqlalchemy.orm import Session
 
-from app.crud.api_clients import get_by_key_hash
+from app.crud.api_clients import resolve_by_key_hash
 from app.db.session import SessionLocal
 
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
@@ -39,7 +39,7 @@ def require_api_client(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Missing API key")
 
     key_hash = hash_api_key(api_key)
-    client = get_by_key_hash(db, api_key_hash=key_hash)
+    client = resolve_by_key_hash(db, api_key_hash=key_hash)
 
     if not client or not client.enabled:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid API key")
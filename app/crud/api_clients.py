@@ -1,9 +1,58 @@
-from sqlalchemy import select
+from dataclasses import dataclass
+
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.models.api_client import ApiClient
 
 
+@dataclass(frozen=True)
+class ApiClientIdentity:
+    # Copia mínima (desacoplada de la sesión) de lo que necesitan los endpoints
+    id: str
+    tenant_id: str
+    enabled: bool
+
+
+# key_hash -> ApiClientIdentity. Las keys desconocidas no se cachean: una key recién
+# creada funciona al instante y una inválida siempre consulta la BD.
+api_key_cache: TTLCache[str, ApiClientIdentity] = TTLCache(
+    max_size=settings.API_KEY_CACHE_MAX_SIZE,
+    ttl_seconds=settings.API_KEY_CACHE_TTL_SECONDS,
+)
+
+
 def get_by_key_hash(db: Session, *, api_key_hash: str) -> ApiClient | None:
     stmt = select(ApiClient).where(ApiClient.api_key_hash == api_key_hash)
     return db.execute(stmt).scalars().first()
+
+
+def resolve_by_key_hash(db: Session, *, api_key_hash: str) -> ApiClientIdentity | None:
+    cached = api_key_cache.get(api_key_hash)
+    if cached is not None:
+        return cached
+
+    row = db.execute(
+        select(ApiClient.id, ApiClient.tenant_id, ApiClient.enabled).where(ApiClient.api_key_hash == api_key_hash)
+    ).first()
+    if row is None:
+        return None
+
+    identity = ApiClientIdentity(id=row.id, tenant_id=row.tenant_id, enabled=row.enabled)
+    api_key_cache.set(api_key_hash, identity)
+    return identity
+
+
+def set_enabled(db: Session, *, client_id: str, enabled: bool) -> None:
+    db.execute(update(ApiClient).where(ApiClient.id == client_id).values(enabled=enabled))
+    db.commit()
+    # En este proceso el cambio es inmediato; en el resto, como mucho tras el TTL.
+    api_key_cache.invalidate_where(lambda _, ident: ident.id == client_id)
+
+
+def rotate_key(db: Session, *, client_id: str, new_api_key_hash: str) -> None:
+    db.execute(update(ApiClient).where(ApiClient.id == client_id).values(api_key_hash=new_api_key_hash))
+    db.commit()
+    api_key_cache.invalidate_where(lambda _, ident: ident.id == client_id)
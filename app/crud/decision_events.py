@@ -1,6 +1,7 @@
 import uuid
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.models.decision_event import DecisionEvent
 
@@ -13,20 +14,77 @@ def get_by_idempotency(db: Session, *, tenant_id: str, idempotency_key: str) ->
     return db.execute(stmt).scalars().first()
 
 
-def create_event(db: Session, *, payload: dict) -> DecisionEvent:
-    obj = DecisionEvent(
-        id=str(uuid.uuid4()),
-        tenant_id=payload["tenant_id"],
-        decision_id=payload["decision_id"],
-        occurred_at=payload["occurred_at"],
-        model_id=payload["model"]["model_id"],
-        model_version=payload["model"]["model_version"],
-        input_features=payload["input_features"],
-        model_output=payload["model_output"],
-        final_decision=payload["final_decision"],
-        idempotency_key=payload["idempotency_key"],
+def uses_model(db: Session, *, tenant_id: str, model_id: str, model_version: str) -> bool:
+    """Si el tenant tiene algún DecisionEvent de esa versión de modelo."""
+    stmt = select(DecisionEvent.id).where(
+        DecisionEvent.tenant_id == tenant_id,
+        DecisionEvent.model_id == model_id,
+        DecisionEvent.model_version == model_version,
     )
-    db.add(obj)
+    return db.execute(stmt.limit(1)).first() is not None
+
+
+def _event_row(payload: dict) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "tenant_id": payload["tenant_id"],
+        "decision_id": payload["decision_id"],
+        "occurred_at": payload["occurred_at"],
+        "model_id": payload["model"]["model_id"],
+        "model_version": payload["model"]["model_version"],
+        "input_features": payload["input_features"],
+        "model_output": payload["model_output"],
+        "final_decision": payload["final_decision"],
+        "idempotency_key": payload["idempotency_key"],
+    }
+
+
+def _upsert_stmt(rows: list[dict]):
+    # El DO UPDATE es un no-op sobre uq_tenant_idempo que sólo sirve para que RETURNING
+    # devuelva también la fila ya existente (xmax = 0 => la acabamos de insertar). A
+    # diferencia de DO NOTHING + SELECT, bajo reintentos concurrentes espera a la otra
+    # transacción y siempre devuelve su id, sin pasar por el IntegrityError -> 409.
+    stmt = pg_insert(DecisionEvent).values(rows)
+    return stmt.on_conflict_do_update(
+        constraint="uq_tenant_idempo",
+        set_={"idempotency_key": stmt.excluded.idempotency_key},
+    ).returning(
+        DecisionEvent.idempotency_key,
+        DecisionEvent.id,
+        literal_column("(xmax = 0)").label("created"),
+    )
+
+
+def create_or_get_event(db: Session, *, tenant_id: str, payload: dict) -> tuple[str, bool]:
+    """Insert-or-return-existing en una sola sentencia; devuelve (event_id, created)."""
+    row = db.execute(_upsert_stmt([_event_row({**payload, "tenant_id": tenant_id})])).one()
     db.commit()
-    db.refresh(obj)
-    return obj
+    return row.id, bool(row.created)
+
+
+def create_events_bulk(db: Session, *, tenant_id: str, payloads: list[dict]) -> list[tuple[str, bool]]:
+    """Inserta un lote en una sola sentencia; devuelve (event_id, created) en el orden de entrada."""
+    if not payloads:
+        return []
+
+    # Una misma idempotency_key repetida dentro del lote: sólo la primera aparición se envía
+    # (ON CONFLICT DO UPDATE no admite tocar la misma fila dos veces en una sentencia).
+    rows: dict[str, dict] = {}
+    for p in payloads:
+        if p["idempotency_key"] not in rows:
+            rows[p["idempotency_key"]] = _event_row({**p, "tenant_id": tenant_id})
+
+    # Filas en orden de clave: dos lotes concurrentes que comparten claves bloquean sus filas en
+    # el mismo orden y uno espera al otro en vez de hacer deadlock.
+    stmt = _upsert_stmt([rows[k] for k in sorted(rows)])
+    returned = {r.idempotency_key: (r.id, bool(r.created)) for r in db.execute(stmt)}
+    db.commit()
+
+    results: list[tuple[str, bool]] = []
+    seen: set[str] = set()
+    for p in payloads:
+        key = p["idempotency_key"]
+        event_id, created = returned[key]
+        results.append((event_id, created and key not in seen))
+        seen.add(key)
+    return results
@@ -0,0 +1,88 @@
+import hashlib
+import json
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheStats
+from app.models.explanation_cache import ExplanationCacheEntry
+
+# Contadores de este proceso (GET /v1/stats/caches): fallos al buscar, aciertos al usar la evidencia
+explanation_cache_stats = CacheStats()
+
+
+def _canonical(value):
+    # 1 y 1.0 son la misma entrada para el modelo
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def input_fingerprint(input_features: dict) -> str:
+    payload = json.dumps(_canonical(input_features or {}), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_key(*, tenant_id: str, model_id: str, model_version: str, method: str, input_features: dict) -> str:
+    parts = [tenant_id, model_id, model_version, method, input_fingerprint(input_features)]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def get_cached_evidence(db: Session, *, key: str) -> dict | None:
+    # Sólo lectura: el acierto se apunta con record_hit si la evidencia llega a usarse
+    stmt = select(ExplanationCacheEntry.evidence).where(ExplanationCacheEntry.key == key)
+    evidence = db.execute(stmt).scalar_one_or_none()
+    if evidence is None:
+        explanation_cache_stats.misses += 1
+    return evidence
+
+
+def record_hit(db: Session, *, key: str) -> None:
+    """Apunta un uso de la entrada (hit_count/last_hit_at, lo que mira prune)."""
+    explanation_cache_stats.hits += 1
+    db.execute(
+        update(ExplanationCacheEntry)
+        .where(ExplanationCacheEntry.key == key)
+        .values(hit_count=ExplanationCacheEntry.hit_count + 1, last_hit_at=func.now())
+    )
+    db.commit()
+
+
+def put_many(db: Session, *, entries: list[dict]) -> None:
+    """entries: dicts con key, tenant_id, model_id, model_version, method, evidence."""
+    if not entries:
+        return
+    unique = {e["key"]: e for e in entries}
+    db.execute(pg_insert(ExplanationCacheEntry).values(list(unique.values())).on_conflict_do_nothing())
+    db.commit()
+
+
+def prune(db: Session, *, max_entries: int, batch_size: int = 10_000) -> int:
+    """Expulsa las entradas menos usadas recientemente por encima de `max_entries`.
+
+    El corte es el last_hit_at de la entrada max_entries+1 (un solo valor, leído del índice);
+    se borra por rango de ese índice y como mucho `batch_size` por llamada.
+    """
+    cutoff = db.execute(
+        select(ExplanationCacheEntry.last_hit_at)
+        .order_by(ExplanationCacheEntry.last_hit_at.desc())
+        .offset(max_entries)
+        .limit(1)
+    ).scalar()
+    if cutoff is None:
+        return 0
+    keys = (
+        select(ExplanationCacheEntry.key)
+        .where(ExplanationCacheEntry.last_hit_at <= cutoff)
+        .order_by(ExplanationCacheEntry.last_hit_at)
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    n = db.execute(delete(ExplanationCacheEntry).where(ExplanationCacheEntry.key.in_(keys))).rowcount
+    db.commit()
+    return n
@@ -1,23 +1,63 @@
+import json
 import uuid
-from sqlalchemy import select
+from datetime import timedelta
+
+from sqlalchemy import and_, case, func, literal_column, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.models.explanation import Explanation
 
+# Canal LISTEN/NOTIFY con cada cambio de estado; Postgres lo entrega al hacer commit
+STATUS_CHANNEL = "explanation_status"
+
+# Como mucho una explicación en estos estados por (tenant, decision_event_id, method).
+# FAILED queda fuera para que un reintento tras un fallo cree un job nuevo.
+ACTIVE_STATUSES = ("PENDING", "RUNNING", "DONE")
+
 
-def create_explanation(db: Session, *, tenant_id: str, decision_event_id: str, method: str = "stub") -> Explanation:
-    obj = Explanation(
+def _notify_status(db: Session, changes: list[tuple[str, str, str]]) -> None:
+    """changes: (explanation_id, tenant_id, status). Un único SELECT para todo el lote."""
+    if not changes:
+        return
+    payloads = [json.dumps({"id": i, "tenant_id": t, "status": s}) for i, t, s in changes]
+    db.execute(
+        text("SELECT pg_notify(:channel, p) FROM unnest(CAST(:payloads AS text[])) AS p"),
+        {"channel": STATUS_CHANNEL, "payloads": payloads},
+    )
+
+
+def create_or_get_explanation(
+    db: Session,
+    *,
+    tenant_id: str,
+    decision_event_id: str,
+    method: str = "stub",
+    evidence: dict | None = None,
+) -> tuple[str, str, bool]:
+    """Devuelve (explanation_id, status, created).
+
+    Si ya hay una PENDING/RUNNING/DONE para (tenant, decision_event_id, method) se devuelve
+    esa: el índice único parcial uq_explanations_active lo garantiza entre réplicas. Mismo
+    truco de DO UPDATE no-op + xmax que en decision_events.
+    """
+    # Con evidence (acierto de cache) nace ya DONE y no pasa por la cola
+    stmt = pg_insert(Explanation).values(
         id=str(uuid.uuid4()),
         tenant_id=tenant_id,
         decision_event_id=decision_event_id,
-        status="PENDING",
+        status="DONE" if evidence is not None else "PENDING",
         method=method,
-        evidence={},
+        evidence=evidence if evidence is not None else {},
     )
-    db.add(obj)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["tenant_id", "decision_event_id", "method"],
+        index_where=Explanation.status.in_(ACTIVE_STATUSES),
+        set_={"method": stmt.excluded.method},
+    ).returning(Explanation.id, Explanation.status, literal_column("(xmax = 0)").label("created"))
+    row = db.execute(stmt).one()
     db.commit()
-    db.refresh(obj)
-    return obj
+    return row.id, row.status, bool(row.created)
 
 
 def get_explanation(db: Session, *, tenant_id: str, explanation_id: str) -> Explanation | None:
@@ -28,11 +68,20 @@ def get_explanation(db: Session, *, tenant_id: str, explanation_id: str) -> Expl
     return db.execute(stmt).scalars().first()
 
 
+def get_statuses(db: Session, *, tenant_id: str, explanation_ids: list[str]) -> dict[str, str]:
+    stmt = select(Explanation.id, Explanation.status).where(
+        Explanation.tenant_id == tenant_id,
+        Explanation.id.in_(explanation_ids),
+    )
+    return {row.id: row.status for row in db.execute(stmt)}
+
+
 def set_running(db: Session, *, tenant_id: str, explanation_id: str) -> None:
     obj = get_explanation(db, tenant_id=tenant_id, explanation_id=explanation_id)
     if not obj:
         return
     obj.status = "RUNNING"
+    _notify_status(db, [(obj.id, obj.tenant_id, obj.status)])
     db.commit()
 
 
@@ -43,13 +92,117 @@ def set_done(db: Session, *, tenant_id: str, explanation_id: str, evidence: dict
     obj.status = "DONE"
     obj.evidence = evidence
     obj.error = None
+    _notify_status(db, [(obj.id, obj.tenant_id, obj.status)])
     db.commit()
 
 
-def set_failed(db: Session, *, tenant_id: str, explanation_id: str, error: str) -> None:
-    obj = get_explanation(db, tenant_id=tenant_id, explanation_id=explanation_id)
-    if not obj:
+def _owned_by(worker_id: str):
+    # El job sigue siendo de este worker: no lo ha reclamado otro tras darlo por perdido
+    return and_(Explanation.status == "RUNNING", Explanation.locked_by == worker_id)
+
+
+def set_done_many(db: Session, *, worker_id: str, results: list[tuple[str, str, dict]]) -> set[str]:
+    """Marca DONE los jobs que `worker_id` aún tiene, en un único executemany.
+
+    results: (tenant_id, explanation_id, evidence). Devuelve los ids escritos; los que ya no
+    son suyos (reclamados por otro worker) se dejan como estén.
+    """
+    if not results:
+        return set()
+    # FOR UPDATE: un reclaim_stale concurrente espera al commit y ya no los ve RUNNING
+    owned = set(
+        db.execute(
+            select(Explanation.id)
+            .where(Explanation.id.in_([eid for _, eid, _ in results]), _owned_by(worker_id))
+            .with_for_update()
+        ).scalars()
+    )
+    results = [r for r in results if r[1] in owned]
+    if results:
+        db.execute(
+            update(Explanation),
+            [{"id": eid, "status": "DONE", "evidence": evidence, "error": None} for _, eid, evidence in results],
+        )
+        _notify_status(db, [(eid, tenant_id, "DONE") for tenant_id, eid, _ in results])
+    db.commit()
+    return owned
+
+
+def set_failed(db: Session, *, tenant_id: str, explanation_id: str, error: str, worker_id: str | None = None) -> None:
+    """Marca FAILED. Con worker_id, sólo si ese worker sigue teniendo el job."""
+    stmt = update(Explanation).where(Explanation.tenant_id == tenant_id, Explanation.id == explanation_id)
+    if worker_id is not None:
+        stmt = stmt.where(_owned_by(worker_id))
+    row = db.execute(stmt.values(status="FAILED", error=error[:512]).returning(Explanation.id)).first()
+    if row:
+        _notify_status(db, [(explanation_id, tenant_id, "FAILED")])
+    db.commit()
+
+
+def heartbeat(db: Session, *, worker_id: str, explanation_ids: list[str]) -> None:
+    """Renueva locked_at de los jobs que el worker aún tiene pendientes de terminar.
+
+    Un lote largo no se da por perdido mientras el worker siga avanzando por él.
+    """
+    if not explanation_ids:
         return
-    obj.status = "FAILED"
-    obj.error = error[:512]
+    db.execute(
+        update(Explanation)
+        .where(Explanation.id.in_(explanation_ids), _owned_by(worker_id))
+        .values(locked_at=func.now())
+    )
+    db.commit()
+
+
+def claim_pending(db: Session, *, worker_id: str, limit: int) -> list:
+    """Pasa hasta `limit` jobs PENDING a RUNNING y los devuelve.
+
+    FOR UPDATE SKIP LOCKED: varios workers pueden reclamar a la vez sin bloquearse ni
+    llevarse el mismo job.
+    """
+    ids = (
+        select(Explanation.id)
+        .where(Explanation.status == "PENDING")
+        .order_by(Explanation.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(Explanation)
+        .where(Explanation.id.in_(ids))
+        .values(
+            status="RUNNING",
+            attempts=Explanation.attempts + 1,
+            locked_at=func.now(),
+            locked_by=worker_id,
+        )
+        .returning(Explanation.id, Explanation.tenant_id, Explanation.decision_event_id, Explanation.method)
+    )
+    rows = db.execute(stmt).all()
+    _notify_status(db, [(r.id, r.tenant_id, "RUNNING") for r in rows])
+    db.commit()
+    return rows
+
+
+def reclaim_stale(db: Session, *, stale_after_seconds: int, max_attempts: int) -> int:
+    """Devuelve a PENDING los RUNNING abandonados (o FAILED si ya agotaron intentos)."""
+    exhausted = Explanation.attempts >= max_attempts
+    stmt = (
+        update(Explanation)
+        .where(
+            Explanation.status == "RUNNING",
+            Explanation.locked_at < func.now() - timedelta(seconds=stale_after_seconds),
+        )
+        .values(
+            status=case((exhausted, "FAILED"), else_="PENDING"),
+            error=case((exhausted, "Worker lost the job too many times"), else_=Explanation.error),
+            locked_at=None,
+            locked_by=None,
+        )
+        .returning(Explanation.id, Explanation.tenant_id, Explanation.status)
+    )
+    rows = db.execute(stmt).all()
+    _notify_status(db, [(r.id, r.tenant_id, r.status) for r in rows])
     db.commit()
+    return len(rows)
@@ -0,0 +1,91 @@
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import and_, func, not_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.global_explanation import GlobalExplanation
+
+
+def get_global_explanation(db: Session, *, model_id: str, model_version: str) -> GlobalExplanation | None:
+    stmt = select(GlobalExplanation).where(
+        GlobalExplanation.model_id == model_id,
+        GlobalExplanation.model_version == model_version,
+    )
+    return db.execute(stmt).scalars().first()
+
+
+def get_done_id(db: Session, *, model_id: str, model_version: str) -> str | None:
+    # Sólo el id: los reports guardan la referencia, no las curvas
+    stmt = select(GlobalExplanation.id).where(
+        GlobalExplanation.model_id == model_id,
+        GlobalExplanation.model_version == model_version,
+        GlobalExplanation.status == "DONE",
+    )
+    return db.execute(stmt).scalar()
+
+
+def get_done_ids(db: Session, *, models: set[tuple[str, str]]) -> dict[tuple[str, str], str]:
+    if not models:
+        return {}
+    stmt = select(GlobalExplanation.id, GlobalExplanation.model_id, GlobalExplanation.model_version).where(
+        tuple_(GlobalExplanation.model_id, GlobalExplanation.model_version).in_(models),
+        GlobalExplanation.status == "DONE",
+    )
+    return {(r.model_id, r.model_version): r.id for r in db.execute(stmt)}
+
+
+def _stale(stale_after_seconds: int):
+    return and_(
+        GlobalExplanation.status == "RUNNING",
+        GlobalExplanation.updated_at < func.now() - timedelta(seconds=stale_after_seconds),
+    )
+
+
+def missing_versions(
+    db: Session, *, versions: list[tuple[str, str]], stale_after_seconds: int
+) -> list[tuple[str, str]]:
+    """Versiones sin curvas todavía (o cuyo cálculo quedó colgado). Las FAILED no se reintentan."""
+    if not versions:
+        return []
+    stmt = select(GlobalExplanation.model_id, GlobalExplanation.model_version).where(
+        not_(_stale(stale_after_seconds))
+    )
+    known = {(row.model_id, row.model_version) for row in db.execute(stmt)}
+    return [v for v in versions if v not in known]
+
+
+def claim(db: Session, *, model_id: str, model_version: str, stale_after_seconds: int) -> str | None:
+    """Reserva el cálculo de una versión. None si otro worker ya lo tiene (o ya está hecho)."""
+    stmt = (
+        pg_insert(GlobalExplanation)
+        .values(id=str(uuid.uuid4()), model_id=model_id, model_version=model_version, status="RUNNING", curves={})
+        .on_conflict_do_update(
+            constraint="uq_global_explanations_model",
+            set_={"status": "RUNNING", "updated_at": func.now()},
+            where=_stale(stale_after_seconds),
+        )
+        .returning(GlobalExplanation.id)
+    )
+    gid = db.execute(stmt).scalar()
+    db.commit()
+    return gid
+
+
+def set_done(db: Session, *, global_explanation_id: str, curves: dict, compute_seconds: float) -> None:
+    db.execute(
+        update(GlobalExplanation)
+        .where(GlobalExplanation.id == global_explanation_id)
+        .values(status="DONE", curves=curves, error=None, compute_seconds=compute_seconds)
+    )
+    db.commit()
+
+
+def set_failed(db: Session, *, global_explanation_id: str, error: str) -> None:
+    db.execute(
+        update(GlobalExplanation)
+        .where(GlobalExplanation.id == global_explanation_id)
+        .values(status="FAILED", error=error[:512])
+    )
+    db.commit()
@@ -1,5 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.models.report_revision import ReportRevision
+from app.services import json_delta
+
+# (tenant_id, report_id, version) -> cuerpo JSON de ReportVersionOut. Las revisiones no cambian: sin TTL.
+revision_bytes_cache: TTLCache[tuple[str, str, int], bytes] = TTLCache(
+    max_size=settings.REPORT_REVISION_CACHE_MAX_ENTRIES,
+    ttl_seconds=None,
+)
+
+
+def is_snapshot_version(version: int) -> bool:
+    # 1, 1+N, 1+2N... así la versión v se reconstruye desde el snapshot más reciente <= v
+    return (version - 1) % settings.REPORT_REVISION_SNAPSHOT_EVERY == 0
+
 
 def add_revision(
     db: Session,
@@ -9,14 +27,66 @@ def add_revision(
     version: int,
     action: str,
     report_json: dict,
+    previous_json: dict | None = None,
+    delta: dict | None = None,
     created_by_client_id: str | None,
 ) -> None:
+    """previous_json: documento de la versión anterior; sin él se guarda un snapshot.
+
+    delta: si ya se conoce (patch por secciones), evita recalcular el diff del documento entero.
+    """
+    snapshot = previous_json is None or is_snapshot_version(version)
+    if not snapshot and delta is None:
+        delta = json_delta.diff(previous_json, report_json)
     obj = ReportRevision(
         tenant_id=tenant_id,
         report_id=report_id,
         version=version,
         action=action,
-        report_json=report_json,
+        report_json=report_json if snapshot else None,
+        delta=None if snapshot else delta,
         created_by_client_id=created_by_client_id,
     )
     db.add(obj)
+
+
+def add_revisions_bulk(db: Session, *, rows: list[dict]) -> None:
+    # executemany: una sentencia para todo el lote (insertmanyvalues). Filas con report_json: snapshots
+    if rows:
+        db.execute(insert(ReportRevision), rows)
+
+
+def find_revision(
+    db: Session, *, tenant_id: str, report_id: str, version: int | None = None, as_of: datetime | None = None
+):
+    """(version, action, created_at) de una versión concreta o de la vigente en `as_of`, sin leer JSON."""
+    stmt = select(ReportRevision.version, ReportRevision.action, ReportRevision.created_at).where(
+        ReportRevision.tenant_id == tenant_id, ReportRevision.report_id == report_id
+    )
+    if version is not None:
+        stmt = stmt.where(ReportRevision.version == version)
+    if as_of is not None:
+        stmt = stmt.where(ReportRevision.created_at <= as_of)
+    return db.execute(stmt.order_by(ReportRevision.version.desc()).limit(1)).first()
+
+
+def get_revision_json(db: Session, *, tenant_id: str, report_id: str, version: int) -> dict | None:
+    """report_json de una versión: el snapshot más reciente <= version más sus deltas."""
+    filters = (
+        ReportRevision.tenant_id == tenant_id,
+        ReportRevision.report_id == report_id,
+        ReportRevision.version <= version,
+    )
+    base = (
+        select(func.max(ReportRevision.version))
+        .where(*filters, ReportRevision.report_json.is_not(None))
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(ReportRevision.version, ReportRevision.report_json, ReportRevision.delta)
+        .where(*filters, ReportRevision.version >= base)
+        .order_by(ReportRevision.version)
+    ).all()
+    if not rows or rows[-1].version != version:
+        return None
+    return json_delta.apply(rows[0].report_json, *(r.delta for r in rows[1:]))
@@ -1,76 +1,95 @@
-from sqlalchemy import func, select
+from sqlalchemy import Select, Text, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert as pg_insert
 from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.models.report import Report
 
 from datetime import datetime
 from app.models.decision_event import DecisionEvent
 
-def count_reports(
-    db: Session,
-    *,
-    tenant_id: str,
-    status: str | None = None,
-    decision_event_id: str | None = None,
-    decision_id: str | None = None,
-    occurred_after: datetime | None = None,
-    occurred_before: datetime | None = None,
-) -> int:
-    stmt = (
-        select(func.count())
-        .select_from(Report)
-        .join(DecisionEvent, Report.decision_event_id == DecisionEvent.id)
-        .where(Report.tenant_id == tenant_id)
-        .where(DecisionEvent.tenant_id == tenant_id)
-    )
+# Columnas de ReportListItem: filas estrechas, sin report_json ni join con decision_events
+LIST_COLUMNS = (
+    Report.id,
+    Report.status,
+    Report.template_id,
+    Report.decision_event_id,
+    Report.explanation_id,
+    Report.created_at,
+    Report.decision_id,
+    Report.occurred_at,
+    Report.decision_label,
+    Report.version,
+)
 
-    if status:
-        stmt = stmt.where(Report.status == status)
-    if decision_event_id:
-        stmt = stmt.where(Report.decision_event_id == decision_event_id)
-    if decision_id:
-        stmt = stmt.where(DecisionEvent.decision_id == decision_id)
-    if occurred_after:
-        stmt = stmt.where(DecisionEvent.occurred_at >= occurred_after)
-    if occurred_before:
-        stmt = stmt.where(DecisionEvent.occurred_at <= occurred_before)
 
-    return db.execute(stmt).scalar_one()
+def decision_fields(de: DecisionEvent) -> dict:
+    """Campos del DecisionEvent que se copian al report al crearlo."""
+    label = de.final_decision.get("label") if isinstance(de.final_decision, dict) else None
+    return {
+        "decision_id": de.decision_id,
+        "occurred_at": de.occurred_at,
+        "decision_label": None if label is None else str(label),
+    }
 
 
-def list_reports(
-    db: Session,
+def _filtered(
+    stmt: Select,
     *,
     tenant_id: str,
-    offset: int,
-    limit: int,
     status: str | None = None,
     decision_event_id: str | None = None,
     decision_id: str | None = None,
     occurred_after: datetime | None = None,
     occurred_before: datetime | None = None,
-):
-    stmt = (
-        select(Report, DecisionEvent)
-        .join(DecisionEvent, Report.decision_event_id == DecisionEvent.id)
-        .where(Report.tenant_id == tenant_id)
-        .where(DecisionEvent.tenant_id == tenant_id)
-        .order_by(Report.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-    )
-
+) -> Select:
+    stmt = stmt.where(Report.tenant_id == tenant_id)
     if status:
         stmt = stmt.where(Report.status == status)
     if decision_event_id:
         stmt = stmt.where(Report.decision_event_id == decision_event_id)
     if decision_id:
-        stmt = stmt.where(DecisionEvent.decision_id == decision_id)
+        stmt = stmt.where(Report.decision_id == decision_id)
     if occurred_after:
-        stmt = stmt.where(DecisionEvent.occurred_at >= occurred_after)
+        stmt = stmt.where(Report.occurred_at >= occurred_after)
     if occurred_before:
-        stmt = stmt.where(DecisionEvent.occurred_at <= occurred_before)
+        stmt = stmt.where(Report.occurred_at <= occurred_before)
+    return stmt
+
+
+def count_reports_stmt(**filters) -> Select:
+    return _filtered(select(func.count()).select_from(Report), **filters)
+
+
+def count_reports(db: Session, **filters) -> int:
+    return db.execute(count_reports_stmt(**filters)).scalar_one()
+
+
+def list_reports_stmt(*, limit: int, after: tuple[datetime, str] | None = None, **filters) -> Select:
+    # Separada de list_reports para poder inspeccionar el plan (benchmarks/bench_report_listing.py)
+    stmt = _filtered(select(*LIST_COLUMNS), **filters).order_by(Report.created_at.desc(), Report.id.desc()).limit(limit)
+    if after:
+        # Keyset: las filas estrictamente posteriores a la última de la página anterior
+        stmt = stmt.where(tuple_(Report.created_at, Report.id) < tuple_(*after))
+    return stmt
+
+
+def list_reports(db: Session, **filters):
+    return db.execute(list_reports_stmt(**filters)).all()  # filas con LIST_COLUMNS
+
+# (report_id, version) -> cuerpo JSON de ReportOut. Cada versión es inmutable: sin TTL.
+report_bytes_cache: TTLCache[tuple[str, int], bytes] = TTLCache(
+    max_size=settings.REPORT_BYTES_CACHE_MAX_ENTRIES,
+    ttl_seconds=None,
+)
+
+
+def get_report_head(db: Session, *, tenant_id: str, report_id: str):
+    """(version, status) sin cargar report_json; None si no existe en el tenant."""
+    return db.execute(
+        select(Report.version, Report.status).where(Report.tenant_id == tenant_id, Report.id == report_id)
+    ).first()
 
-    return db.execute(stmt).all()  # devuelve tuplas (Report, DecisionEvent)
 
 def get_existing_report(db: Session, *, tenant_id: str, decision_event_id: str, explanation_id: str, template_id: str) -> Report | None:
     stmt = select(Report).where(
@@ -80,3 +99,78 @@ def get_existing_report(db: Session, *, tenant_id: str, decision_event_id: str,
         Report.template_id == template_id,
     )
     return db.execute(stmt).scalars().first()
+
+
+# Identidad de un report: (decision_event_id, explanation_id, template_id) dentro del tenant
+ReportIdentity = tuple[str, str, str]
+
+
+def get_existing_reports(
+    db: Session, *, tenant_id: str, identities: list[ReportIdentity]
+) -> dict[ReportIdentity, tuple[str, str]]:
+    """{identidad: (report_id, status)} de las que ya existen, en una sola consulta."""
+    if not identities:
+        return {}
+    key = tuple_(Report.decision_event_id, Report.explanation_id, Report.template_id)
+    stmt = select(
+        Report.id, Report.status, Report.decision_event_id, Report.explanation_id, Report.template_id
+    ).where(Report.tenant_id == tenant_id, key.in_(identities))
+    return {
+        (r.decision_event_id, r.explanation_id, r.template_id): (r.id, r.status) for r in db.execute(stmt)
+    }
+
+
+def insert_reports_bulk(db: Session, *, rows: list[dict]) -> set[str]:
+    """INSERT multi-fila; devuelve los ids insertados.
+
+    Las que choquen con uq_report_identity (otra petición concurrente) no se insertan.
+    """
+    if not rows:
+        return set()
+    stmt = pg_insert(Report).values(rows).on_conflict_do_nothing(constraint="uq_report_identity")
+    return set(db.execute(stmt.returning(Report.id)).scalars())
+
+
+def _pg_path(path: list) -> object:
+    return literal([str(k) for k in path], ARRAY(Text))
+
+
+def report_json_patched(delta: dict):
+    """Expresión SQL de report_json con un delta de json_delta aplicado en la BD (jsonb_set / #-).
+
+    Sólo viajan las partes cambiadas, no el documento entero; la columna es JSONB, así que se
+    modifica sin pasar por texto.
+    """
+    doc = Report.report_json
+    for path, value in delta.get("set", []):
+        doc = func.jsonb_set(doc, _pg_path(path), literal(value, JSONB), True)
+    for path in delta.get("unset", []):
+        doc = doc.op("#-", return_type=JSONB)(_pg_path(path))
+    return doc
+
+
+def bump_version(db: Session, *, tenant_id: str, report_id: str, expected_version: int, values: dict):
+    """Compare-and-swap de la versión: un solo UPDATE que fija `values` y version + 1 sólo si el
+    report sigue en expected_version y no es FINAL. Devuelve (version, status) nuevos o None.
+
+    La fila se toma con FOR NO KEY UPDATE SKIP LOCKED: si otra edición la tiene a medio escribir
+    no se espera a su commit, se pierde la carrera igual que si ya hubiera cambiado la versión.
+    NO KEY no choca con los KEY SHARE de las FK de report_revisions.
+    """
+    target = (
+        select(Report.id)
+        .where(
+            Report.tenant_id == tenant_id,
+            Report.id == report_id,
+            Report.version == expected_version,
+            Report.status != "FINAL",
+        )
+        .with_for_update(key_share=True, skip_locked=True)
+        .scalar_subquery()
+    )
+    return db.execute(
+        update(Report)
+        .where(Report.id == target)
+        .values(version=Report.version + 1, **values)
+        .returning(Report.version, Report.status)
+    ).first()
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import DateTime, String, JSON, UniqueConstraint, func
+from sqlalchemy import DateTime, Index, String, JSON, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -9,6 +9,11 @@ class DecisionEvent(Base):
     __tablename__ = "decision_events"
     __table_args__ = (
         UniqueConstraint("tenant_id", "idempotency_key", name="uq_tenant_idempo"),
+        # Filtros del listado de reports
+        Index("ix_decision_events_tenant_occurred_at", "tenant_id", "occurred_at"),
+        Index("ix_decision_events_tenant_decision_id", "tenant_id", "decision_id"),
+        # Acceso de un tenant a las explicaciones globales de los modelos que usa
+        Index("ix_decision_events_tenant_model", "tenant_id", "model_id", "model_version"),
     )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
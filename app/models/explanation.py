@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, JSON, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -7,6 +7,19 @@ from app.db.base import Base
 
 class Explanation(Base):
     __tablename__ = "explanations"
+    __table_args__ = (
+        # Cola: los workers reclaman PENDING por orden de llegada
+        Index("ix_explanations_status_created_at", "status", "created_at"),
+        # Single-flight: peticiones repetidas se enganchan a la explicación en curso o ya hecha
+        Index(
+            "uq_explanations_active",
+            "tenant_id",
+            "decision_event_id",
+            "method",
+            unique=True,
+            postgresql_where=text("status IN ('PENDING', 'RUNNING', 'DONE')"),
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     tenant_id: Mapped[str] = mapped_column(String(64), index=True)
@@ -21,6 +34,11 @@ class Explanation(Base):
     evidence: Mapped[dict] = mapped_column(JSON, default=dict)  # aquí meteremos SHAP/razones/etc.
     error: Mapped[str | None] = mapped_column(String(512), nullable=True)
 
+    # Estado de la cola: quién tiene el job y desde cuándo (para reclamar los huérfanos)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    locked_by: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -0,0 +1,23 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, JSON, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ExplanationCacheEntry(Base):
+    __tablename__ = "explanation_cache"
+
+    # sha256(tenant, model_id, model_version, method, hash canónico de input_features)
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(64), index=True)
+
+    model_id: Mapped[str] = mapped_column(String(128))
+    model_version: Mapped[str] = mapped_column(String(64))
+    method: Mapped[str] = mapped_column(String(32))
+
+    evidence: Mapped[dict] = mapped_column(JSON)
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    last_hit_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
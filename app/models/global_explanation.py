@@ -0,0 +1,25 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Float, JSON, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class GlobalExplanation(Base):
+    __tablename__ = "global_explanations"
+    __table_args__ = (UniqueConstraint("model_id", "model_version", name="uq_global_explanations_model"),)
+
+    # Curvas PDP/ICE de una versión de modelo: iguales para todas sus decisiones y tenants
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    model_id: Mapped[str] = mapped_column(String(128))
+    model_version: Mapped[str] = mapped_column(String(64))
+
+    status: Mapped[str] = mapped_column(String(16), index=True)  # RUNNING/DONE/FAILED
+    curves: Mapped[dict] = mapped_column(JSON, default=dict)
+    error: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    compute_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
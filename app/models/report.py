@@ -1,5 +1,6 @@
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, JSON, String, func, UniqueConstraint, Integer
+from sqlalchemy import DateTime, ForeignKey, Index, String, func, UniqueConstraint, Integer
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
 
@@ -7,6 +8,11 @@ class Report(Base):
     __tablename__ = "reports"
     __table_args__ = (
         UniqueConstraint("tenant_id", "decision_event_id", "explanation_id", "template_id", name="uq_report_identity"),
+        # Listado: mismo orden que la paginación por cursor (created_at DESC, id DESC)
+        Index("ix_reports_tenant_created_at", "tenant_id", "created_at", "id"),
+        Index("ix_reports_tenant_status_created_at", "tenant_id", "status", "created_at", "id"),
+        Index("ix_reports_tenant_occurred_at", "tenant_id", "occurred_at"),
+        Index("ix_reports_tenant_decision_id", "tenant_id", "decision_id"),
     )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
@@ -15,10 +21,18 @@ class Report(Base):
     decision_event_id: Mapped[str] = mapped_column(String(36), ForeignKey("decision_events.id"), index=True)
     explanation_id: Mapped[str] = mapped_column(String(36), ForeignKey("explanations.id"), index=True)
 
+    # Copia de campos del DecisionEvent (inmutable) para listar sin join
+    decision_id: Mapped[str] = mapped_column(String(128))
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    decision_label: Mapped[str | None] = mapped_column(String, nullable=True)
+
     template_id: Mapped[str] = mapped_column(String(64), default="generic_v1")
     status: Mapped[str] = mapped_column(String(16), index=True)  # DRAFT/FINAL (por ahora DRAFT)
 
-    report_json: Mapped[dict] = mapped_column(JSON, default=dict)
+    # JSONB: los PATCH por sección lo modifican en sitio con jsonb_set (crud.reports.report_json_patched)
+    report_json: Mapped[dict] = mapped_column(JSONB, default=dict)
+    # schema_version con el que se validó report_json; no cubre el contenido (ver services/report_fingerprint.py)
+    report_fingerprint: Mapped[str | None] = mapped_column(String(80), nullable=True)
     report_text: Mapped[str | None] = mapped_column(String, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
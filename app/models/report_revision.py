@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, JSON, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -9,6 +9,10 @@ from app.db.base import Base
 
 class ReportRevision(Base):
     __tablename__ = "report_revisions"
+    __table_args__ = (
+        # Historial de un report por versión descendente
+        Index("ix_report_revisions_report_version", "report_id", "version"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     tenant_id: Mapped[str] = mapped_column(String(64), index=True)
@@ -17,7 +21,10 @@ class ReportRevision(Base):
     version: Mapped[int] = mapped_column(Integer, index=True)
 
     action: Mapped[str] = mapped_column(String(16))  # CREATE / PATCH / FINALIZE
-    report_json: Mapped[dict] = mapped_column(JSON, default=dict)
+    # Snapshot completo cada REPORT_REVISION_SNAPSHOT_EVERY versiones; en el resto sólo el
+    # delta (app/services/json_delta.py) respecto a la versión anterior. Uno de los dos es NULL.
+    report_json: Mapped[dict | None] = mapped_column(JSON(none_as_null=True), nullable=True)
+    delta: Mapped[dict | None] = mapped_column(JSON(none_as_null=True), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     created_by_client_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
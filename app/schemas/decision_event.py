@@ -15,6 +15,13 @@ class DecisionInfo(BaseModel):
     data: dict = Field(default_factory=dict)
 
 
+class FinalDecisionIn(BaseModel):
+    # Permite campos extra (p.ej. score, reason_code, raw, etc.)
+    model_config = ConfigDict(extra="allow")
+
+    label: str = Field(min_length=1)
+
+
 class DecisionEventIn(BaseModel):
     decision_id: str
     occurred_at: datetime
@@ -30,8 +37,9 @@ class DecisionEventOut(BaseModel):
     created: bool
 
 
-class FinalDecisionIn(BaseModel):
-    # Permite campos extra (p.ej. score, reason_code, raw, etc.)
-    model_config = ConfigDict(extra="allow")
+class DecisionEventBatchIn(BaseModel):
+    items: list[DecisionEventIn] = Field(min_length=1, max_length=1000)
 
-    label: str = Field(min_length=1)
+
+class DecisionEventBatchOut(BaseModel):
+    items: list[DecisionEventOut]  # mismo orden que la entrada
@@ -8,5 +8,5 @@ class EvidenceItem(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     id: str
-    kind: Literal["main_factor"] = "main_factor"
+    kind: Literal["main_factor", "counterfactual"] = "main_factor"
     payload: dict
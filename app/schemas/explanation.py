@@ -4,6 +4,7 @@ from pydantic import BaseModel
 class ExplanationCreateOut(BaseModel):
     explanation_id: str
     status: str
+    created: bool = True  # False: se devuelve una explicación ya pedida antes
 
 
 class ExplanationOut(BaseModel):
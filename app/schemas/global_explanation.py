@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class GlobalExplanationOut(BaseModel):
+    global_explanation_id: str
+    model_id: str
+    model_version: str
+    status: str
+    curves: dict
+    error: str | None
@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ReportCreateIn(BaseModel):
@@ -13,6 +13,26 @@ class ReportCreateOut(BaseModel):
     status: str
 
 
+class ReportBulkCreateIn(BaseModel):
+    items: list[ReportCreateIn] = Field(min_length=1, max_length=10_000)
+
+
+class ReportBulkItemOut(BaseModel):
+    # Mismo código que devolvería POST /reports para ese item (201, 200 si ya existía, 404, 409, 422)
+    status_code: int
+    report_id: str | None = None
+    status: str | None = None
+    created: bool = False
+    error: str | list | dict | None = None
+
+
+class ReportBulkCreateOut(BaseModel):
+    items: list[ReportBulkItemOut]  # mismo orden que la entrada
+    created: int
+    existing: int
+    failed: int
+
+
 class ReportOut(BaseModel):
     report_id: str
     status: str
@@ -37,14 +57,57 @@ class ReportListItem(BaseModel):
 
 
 class ReportListOut(BaseModel):
-    total: int
+    total: int | None = None  # sólo con include_total=true
     items: list[ReportListItem]
-    offset: int
     limit: int
+    next_cursor: str | None = None  # None en la última página
+
+from typing import Literal
+from pydantic import BaseModel, ConfigDict, model_validator
+from app.schemas.ui_blocks_v1 import Section, UIBlock
+
+
+class SectionOperation(BaseModel):
+    """Cambio sobre una sección (por id) o sobre uno de sus bloques (por índice).
+
+    Sin block ni block_index la operación es sobre la sección entera; add de sección la añade
+    al final y add de bloque sin block_index lo añade al final de la sección.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    op: Literal["add", "replace", "remove"]
+    section_id: str
+    block_index: int | None = Field(default=None, ge=0)
+    section: Section | None = None
+    block: UIBlock | None = None
+
+    @model_validator(mode="after")
+    def _check_payload(self):
+        if self.section is not None and self.on_block:
+            raise ValueError("section and block/block_index are mutually exclusive")
+        if self.op == "remove" and (self.section is not None or self.block is not None):
+            raise ValueError("remove takes no payload")
+        if self.op != "remove" and self.section is None and self.block is None:
+            raise ValueError(f"{self.op} needs a section or a block")
+        if self.op == "replace" and self.block is not None and self.block_index is None:
+            raise ValueError("replace of a block needs block_index")
+        if self.op == "add" and self.section is not None and self.section.id != self.section_id:
+            raise ValueError("section.id must match section_id")
+        return self
+
+    @property
+    def on_block(self) -> bool:
+        return self.block is not None or self.block_index is not None
 
-from pydantic import BaseModel
-from app.schemas.ui_blocks_v1 import Section
 
 class ReportUpdateIn(BaseModel):
-    sections: list[Section] | None = None
-    expected_version: int
\ No newline at end of file
+    sections: list[Section] | None = None  # reemplaza todas las secciones
+    operations: list[SectionOperation] | None = Field(default=None, min_length=1)  # cambios puntuales
+    expected_version: int
+
+    @model_validator(mode="after")
+    def _one_kind(self):
+        if self.sections is not None and self.operations is not None:
+            raise ValueError("Use either sections or operations, not both")
+        return self
\ No newline at end of file
@@ -8,8 +8,16 @@ class ReportRevisionItem(BaseModel):
     created_at: datetime
     created_by_client_id: str | None
 
+class ReportVersionOut(BaseModel):
+    report_id: str
+    version: int
+    action: str
+    created_at: datetime
+    report_json: dict
+
+
 class ReportRevisionListOut(BaseModel):
-    total: int
+    total: int | None = None  # sólo con include_total=true
     items: list[ReportRevisionItem]
-    offset: int
     limit: int
+    next_cursor: str | None = None
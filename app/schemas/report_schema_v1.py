@@ -18,9 +18,28 @@ class MainFactor(BaseModel):
     importance: float = Field(ge=0.0)
 
 
+class FeatureChange(BaseModel):
+    feature: str
+    current: float
+    suggested: float
+
+
+class Counterfactual(BaseModel):
+    changes: list[FeatureChange]
+    cost: float = Field(ge=0.0)
+    prediction: float
+
+
 class ExplanationEvidence(BaseModel):
     type: str = "stub"
     main_factors: list[MainFactor] = Field(default_factory=list)
+    counterfactuals: list[Counterfactual] = Field(default_factory=list)
+
+
+class GlobalExplanationRef(BaseModel):
+    # Las curvas PDP/ICE no se copian al report: se sirven desde /v1/global-explanations
+    global_explanation_id: str
+    href: str
 
 
 class Facts(BaseModel):
@@ -40,6 +59,7 @@ class ReportSchemaV1(BaseModel):
 
     facts: Facts
     explanation: ExplanationEvidence
+    global_explanation_ref: GlobalExplanationRef | None = None
 
     sections: list[Section] = Field(default_factory=list)
     evidence_items: list[EvidenceItem] = Field(default_factory=list)
\ No newline at end of file
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+
+from app.services.explanation_engine import Attributions
+
+Link = Literal["identity", "logit"]
+
+
+def _apply_link(raw: np.ndarray, link: Link) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-raw)) if link == "logit" else raw
+
+
+@dataclass
+class LinearModel:
+    """Regresión lineal/logística: f(x) = link(x·coef + intercept)."""
+
+    feature_names: list[str]
+    coef: np.ndarray  # (d,)
+    intercept: float
+    feature_mean: np.ndarray  # (d,) E[x] en el dataset de referencia
+    link: Link = "identity"
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        X = np.where(np.isnan(X), self.feature_mean, X)
+        return X @ self.coef + self.intercept
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return _apply_link(self.decision_function(X), self.link)
+
+
+@dataclass
+class TreeEnsemble:
+    """Árboles empaquetados en arrays planos (índices absolutos; -1 = hoja).
+
+    Todos los árboles comparten los mismos arrays y `roots` marca dónde empieza
+    cada uno, así el artefacto se puede mapear en memoria tal cual.
+    """
+
+    feature_names: list[str]
+    children_left: np.ndarray  # int32
+    children_right: np.ndarray  # int32
+    feature: np.ndarray  # int32 (ignorado en hojas)
+    threshold: np.ndarray  # float64; x <= threshold va a la izquierda
+    value: np.ndarray  # float64, valor de hoja (margen)
+    cover: np.ndarray  # float64, peso de entrenamiento que pasa por el nodo
+    default_left: np.ndarray  # bool; dirección para NaN
+    roots: np.ndarray  # int32
+    base_score: float = 0.0
+    link: Link = "identity"
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        n = X.shape[0]
+        rows = np.arange(n)
+        out = np.full(n, self.base_score, dtype=np.float64)
+        for root in self.roots:
+            idx = np.full(n, root, dtype=np.int64)
+            while True:
+                internal = self.children_left[idx] >= 0
+                if not internal.any():
+                    break
+                x = X[rows, self.feature[idx]]
+                go_left = np.where(np.isnan(x), self.default_left[idx], x <= self.threshold[idx])
+                nxt = np.where(go_left, self.children_left[idx], self.children_right[idx])
+                idx = np.where(internal, nxt, idx)
+            out += self.value[idx]
+        return out
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return _apply_link(self.decision_function(X), self.link)
+
+    def expected_value(self) -> float:
+        total = self.base_score
+        leaves = self.children_left < 0
+        bounds = list(self.roots) + [len(self.value)]
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            leaf = leaves[start:end]
+            total += float(self.value[start:end][leaf] @ self.cover[start:end][leaf]) / float(self.cover[start])
+        return total
+
+
+def linear_shap(model: LinearModel, X: np.ndarray) -> tuple[np.ndarray, float]:
+    """SHAP exacto (interventional, features independientes) en el espacio del margen."""
+    Xf = np.where(np.isnan(X), model.feature_mean, X)
+    phi = (Xf - model.feature_mean) * model.coef
+    base = float(model.feature_mean @ model.coef + model.intercept)
+    return phi, base
+
+
+# --- TreeSHAP (path-dependent, Lundberg et al. 2018, alg. 2) ------------------------------
+# La estructura de la recursión no depende de x: sólo las "one fractions" (qué rama es
+# la caliente) cambian por fila. Por eso cada elemento del camino guarda `o` y `w` como
+# vectores de n filas y el árbol se recorre una sola vez para todo el lote.
+# Las one fractions siempre valen 0 o 1, lo que permite quitar las divisiones por `o`.
+
+
+def _extend(feat, z, o, w, depth, pz, po, pi) -> None:
+    feat[depth] = pi
+    z[depth] = pz
+    o[depth] = po
+    w[depth] = np.full(po.shape, 1.0 if depth == 0 else 0.0)
+    for i in range(depth - 1, -1, -1):
+        # sin += : los arrays se comparten con el camino del nodo padre
+        w[i + 1] = w[i + 1] + po * w[i] * (i + 1) / (depth + 1)
+        w[i] = pz * w[i] * (depth - i) / (depth + 1)
+
+
+def _unwind(feat, z, o, w, depth, path_index) -> None:
+    hot = o[path_index] != 0
+    zero = z[path_index]
+    next_one = w[depth]
+    for i in range(depth - 1, -1, -1):
+        w_hot = next_one * ((depth + 1) / (i + 1))
+        next_one = w[i] - w_hot * (zero * (depth - i) / (depth + 1))
+        w_cold = w[i] * ((depth + 1) / (zero * (depth - i))) if zero else 0.0
+        w[i] = np.where(hot, w_hot, w_cold)
+    for i in range(path_index, depth):
+        feat[i] = feat[i + 1]
+        z[i] = z[i + 1]
+        o[i] = o[i + 1]
+
+
+def _unwound_sums(z, o, w, depth) -> np.ndarray:
+    """Suma de pesos "desenrollando" cada elemento 1..depth del camino, todos a la vez.
+
+    Devuelve (depth, n). Equivale a llamar a unwound_path_sum para cada índice.
+    """
+    one = np.stack(o[1 : depth + 1])  # (k, n), 0/1
+    zero = np.array(z[1 : depth + 1])[:, None]  # (k, 1)
+    inv_zero = np.divide(1.0, zero, out=np.zeros_like(zero), where=zero != 0)
+
+    # Rama fría: no depende del índice desenrollado salvo por 1/zero
+    cold = sum(w[i] / (depth - i) for i in range(depth))
+
+    next_one = one * w[depth]
+    total_hot = np.zeros_like(one)
+    for i in range(depth - 1, -1, -1):
+        tmp = next_one / (i + 1)
+        total_hot += tmp
+        next_one = one * w[i] - tmp * (zero * (depth - i))
+    return np.where(one != 0, total_hot, inv_zero * cold) * (depth + 1)
+
+
+def _tree_shap_recurse(t: TreeEnsemble, X, phi, node, depth, feat, z, o, w, pz, po, pi) -> None:
+    feat, z, o, w = list(feat), list(z), list(o), list(w)
+    _extend(feat, z, o, w, depth, pz, po, pi)
+
+    left = t.children_left[node]
+    if left < 0:
+        if depth:
+            contrib = _unwound_sums(z, o, w, depth) * (np.stack(o[1 : depth + 1]) - np.array(z[1 : depth + 1])[:, None])
+            # Dentro de un camino cada feature aparece una sola vez: no hay índices repetidos
+            phi[:, feat[1 : depth + 1]] += (contrib * t.value[node]).T
+        return
+
+    right = t.children_right[node]
+    split = int(t.feature[node])
+    x = X[:, split]
+    goes_left = np.where(np.isnan(x), bool(t.default_left[node]), x <= t.threshold[node])
+
+    iz, io = 1.0, np.ones(X.shape[0])
+    for k in range(1, depth + 1):
+        if feat[k] == split:
+            iz, io = z[k], o[k]
+            _unwind(feat, z, o, w, depth, k)
+            depth -= 1
+            break
+
+    c = t.cover[node]
+    _tree_shap_recurse(t, X, phi, left, depth + 1, feat, z, o, w, t.cover[left] / c * iz, io * goes_left, split)
+    _tree_shap_recurse(t, X, phi, right, depth + 1, feat, z, o, w, t.cover[right] / c * iz, io * ~goes_left, split)
+
+
+def tree_shap(model: TreeEnsemble, X: np.ndarray) -> tuple[np.ndarray, float]:
+    """SHAP exacto para ensembles de árboles, en el espacio del margen (suma de hojas)."""
+    n = X.shape[0]
+    phi = np.zeros((n, len(model.feature_names)))
+    max_depth = _max_depth(model)
+    empty = [None] * (max_depth + 2)
+    for root in model.roots:
+        _tree_shap_recurse(model, X, phi, int(root), 0, empty, empty, empty, empty, 1.0, np.ones(n), -1)
+    return phi, model.expected_value()
+
+
+def _max_depth(model: TreeEnsemble) -> int:
+    best = 0
+    for root in model.roots:
+        stack = [(int(root), 0)]
+        while stack:
+            node, d = stack.pop()
+            best = max(best, d)
+            if model.children_left[node] >= 0:
+                stack.append((int(model.children_left[node]), d + 1))
+                stack.append((int(model.children_right[node]), d + 1))
+    return best
+
+
+def exact_attributions(model: LinearModel | TreeEnsemble, X: np.ndarray) -> Attributions:
+    if isinstance(model, LinearModel):
+        phi, base = linear_shap(model, X)
+        kind = "linear_exact"
+    elif isinstance(model, TreeEnsemble):
+        phi, base = tree_shap(model, X)
+        kind = "tree_shap"
+    else:
+        raise TypeError(f"No exact attribution for {type(model).__name__}")
+
+    output_space = "log_odds" if model.link == "logit" else "raw"
+    extra = [{"type": kind, "base_value": base, "output_space": output_space}] * X.shape[0]
+    return Attributions(list(model.feature_names), phi, extra)
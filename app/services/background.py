@@ -0,0 +1,181 @@
+"""Resumen del dataset de referencia (background) de cada versión de modelo.
+
+    python -m app.services.background [--method kmeans|stratified] [--size 100]
+
+Las versiones que ya tienen resumen no se recalculan.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Arrays que se guardan junto al artefacto del modelo (ver ModelRegistry.add_arrays)
+SUMMARY_POINTS = "background_summary"
+SUMMARY_WEIGHTS = "background_summary_weights"
+
+
+@dataclass
+class BackgroundSummary:
+    points: np.ndarray  # (k, d)
+    weights: np.ndarray  # (k,), suman 1
+    method: str
+
+
+def _standardized(X: np.ndarray) -> np.ndarray:
+    # Distancias comparables entre features de distinta escala; NaN => media de la columna
+    mean = np.nanmean(X, axis=0)
+    std = np.nanstd(X, axis=0)
+    Z = (np.where(np.isnan(X), mean, X) - mean) / np.where(std > 0, std, 1.0)
+    return np.nan_to_num(Z)
+
+
+def _nearest(Z: np.ndarray, centers: np.ndarray, chunk: int = 16_384) -> tuple[np.ndarray, np.ndarray]:
+    labels = np.empty(Z.shape[0], dtype=np.int64)
+    dist = np.empty(Z.shape[0])
+    c2 = (centers**2).sum(axis=1)
+    for start in range(0, Z.shape[0], chunk):
+        z = Z[start : start + chunk]
+        d2 = (z**2).sum(axis=1)[:, None] - 2 * z @ centers.T + c2[None, :]
+        labels[start : start + chunk] = d2.argmin(axis=1)
+        dist[start : start + chunk] = np.maximum(d2.min(axis=1), 0.0)
+    return labels, dist
+
+
+def kmeans_summary(
+    X: np.ndarray, size: int, *, rng: np.random.Generator, max_iter: int = 50, tol: float = 1e-6
+) -> BackgroundSummary:
+    """Centroides de k-means (k-means++ + Lloyd) pesados por el tamaño de su cluster."""
+    Z = _standardized(X)
+    n = Z.shape[0]
+
+    centers = np.empty((size, Z.shape[1]))
+    centers[0] = Z[rng.integers(n)]
+    _, dist = _nearest(Z, centers[:1])
+    for i in range(1, size):
+        total = dist.sum()
+        pick = rng.choice(n, p=dist / total) if total > 0 else rng.integers(n)
+        centers[i] = Z[pick]
+        dist = np.minimum(dist, ((Z - centers[i]) ** 2).sum(axis=1))
+
+    labels = np.zeros(n, dtype=np.int64)
+    for _ in range(max_iter):
+        labels, _ = _nearest(Z, centers)
+        counts = np.bincount(labels, minlength=size)
+        sums = np.column_stack([np.bincount(labels, weights=Z[:, j], minlength=size) for j in range(Z.shape[1])])
+        moved = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        shift = float(np.abs(moved - centers).max())
+        centers = moved
+        if shift <= tol:
+            break
+
+    counts = np.bincount(labels, minlength=size)
+    keep = counts > 0
+    # Centroides en el espacio original (media de los puntos del cluster, ignorando NaN)
+    points = np.vstack([np.nanmean(X[labels == c], axis=0) for c in np.flatnonzero(keep)])
+    points = np.where(np.isnan(points), np.nanmean(X, axis=0), points)
+    return BackgroundSummary(points, counts[keep] / n, "kmeans")
+
+
+def stratified_summary(
+    X: np.ndarray, size: int, *, rng: np.random.Generator, strata: np.ndarray
+) -> BackgroundSummary:
+    """Muestra sin reemplazo con reparto proporcional por estrato (p.ej. cuantiles del score)."""
+    keys, inverse, counts = np.unique(strata, return_inverse=True, return_counts=True)
+    quota = counts / counts.sum() * size
+    alloc = np.floor(quota).astype(np.int64)
+    alloc[np.argsort(alloc - quota)[: size - alloc.sum()]] += 1  # mayores restos
+    alloc = np.clip(alloc, 1 if size >= len(keys) else 0, counts)
+
+    picked, weights = [], []
+    for s, k in enumerate(alloc):
+        if k == 0:
+            continue
+        members = np.flatnonzero(inverse == s)
+        picked.append(rng.choice(members, size=k, replace=False))
+        weights.append(np.full(k, counts[s] / counts.sum() / k))
+    idx = np.concatenate(picked)
+    return BackgroundSummary(np.asarray(X[idx]), np.concatenate(weights), "stratified")
+
+
+def summarize_background(
+    X: np.ndarray,
+    *,
+    method: str,
+    size: int,
+    rng: np.random.Generator,
+    predict: Callable[[np.ndarray], np.ndarray] | None = None,
+    n_strata: int = 10,
+) -> BackgroundSummary:
+    X = np.asarray(X, dtype=np.float64)
+    if X.shape[0] <= size:
+        return BackgroundSummary(X, np.full(X.shape[0], 1.0 / X.shape[0]), "full")
+    if method == "kmeans":
+        return kmeans_summary(X, size, rng=rng)
+    if method == "stratified":
+        if predict is None:
+            strata = np.zeros(X.shape[0], dtype=np.int64)
+        else:
+            # Estratos por cuantiles de la predicción: conserva la distribución del score
+            score = predict(X)
+            edges = np.quantile(score, np.linspace(0, 1, n_strata + 1)[1:-1])
+            strata = np.searchsorted(edges, score, side="right")
+        return stratified_summary(X, size, rng=rng, strata=strata)
+    raise ValueError(f"Unknown background summary method: {method}")
+
+
+def background_for(
+    registry, model_id: str, model_version: str, *, method: str | None = None, size: int | None = None
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """(puntos, pesos) para los explainers de perturbación; calcula y guarda el resumen la primera vez."""
+    loaded = registry.get(model_id, model_version)
+    if SUMMARY_POINTS not in loaded.arrays:
+        # Puede haberlo escrito otro proceso desde que esta versión se cargó aquí
+        loaded = registry.refresh(model_id, model_version)
+    if SUMMARY_POINTS in loaded.arrays:
+        return np.asarray(loaded.arrays[SUMMARY_POINTS]), np.asarray(loaded.arrays[SUMMARY_WEIGHTS])
+
+    full = loaded.arrays.get("background")
+    if full is None:
+        return None
+    summary = summarize_background(
+        full,
+        method=method or settings.BACKGROUND_SUMMARY_METHOD,
+        size=size or settings.BACKGROUND_SUMMARY_SIZE,
+        rng=np.random.default_rng(0),
+        predict=loaded.model.predict,
+    )
+    registry.add_arrays(model_id, model_version, {SUMMARY_POINTS: summary.points, SUMMARY_WEIGHTS: summary.weights})
+    logger.info(
+        "Summarized background of %s@%s: %d -> %d rows (%s)",
+        model_id,
+        model_version,
+        full.shape[0],
+        summary.points.shape[0],
+        summary.method,
+    )
+    return summary.points, summary.weights
+
+
+def main() -> None:
+    from app.services.model_registry import model_registry
+
+    parser = argparse.ArgumentParser(description="Precalcula el resumen del background de cada versión registrada")
+    parser.add_argument("--method", default=settings.BACKGROUND_SUMMARY_METHOD, choices=["kmeans", "stratified"])
+    parser.add_argument("--size", type=int, default=settings.BACKGROUND_SUMMARY_SIZE)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    for model_id, model_version in model_registry.list_versions():
+        background_for(model_registry, model_id, model_version, method=args.method, size=args.size)
+
+
+if __name__ == "__main__":
+    main()
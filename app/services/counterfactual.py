@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+# Búsqueda de contrafactuales por muestreo en subespacios dispersos (estilo "growing spheres"):
+# cada ronda genera miles de candidatos que cambian pocas features, los evalúa con una sola
+# llamada al modelo y descarta antes de evaluar los que ya cuestan más que los encontrados.
+# Los válidos se acercan al caso original con una bisección vectorizada.
+
+PredictFn = Callable[[np.ndarray], np.ndarray]
+
+
+@dataclass
+class FeatureSpace:
+    """Escala y límites por feature, normalmente sacados del background del modelo."""
+
+    scale: np.ndarray  # (d,) unidad de coste de cada feature (desviación típica)
+    lower: np.ndarray  # (d,)
+    upper: np.ndarray  # (d,)
+    integral: np.ndarray  # (d,) bool: sólo admite valores enteros
+    mutable: np.ndarray  # (d,) bool
+
+    @classmethod
+    def from_background(cls, background: np.ndarray, *, mutable: np.ndarray | None = None) -> FeatureSpace:
+        bg = np.asarray(background, dtype=np.float64)
+        std = np.nanstd(bg, axis=0)
+        finite = np.where(np.isnan(bg), 0.0, bg)
+        return cls(
+            scale=np.where(std > 0, std, 1.0),
+            lower=np.nanmin(bg, axis=0),
+            upper=np.nanmax(bg, axis=0),
+            integral=np.all(finite == np.round(finite), axis=0),
+            mutable=np.ones(bg.shape[1], dtype=bool) if mutable is None else mutable,
+        )
+
+
+@dataclass
+class Counterfactual:
+    changes: list[tuple[int, float, float]]  # (feature, valor actual, valor propuesto)
+    cost: float  # suma de |cambio| / scale
+    prediction: float
+
+
+@dataclass
+class CounterfactualSearch:
+    counterfactuals: list[Counterfactual]
+    prediction: float
+    evaluations: int
+    seconds: float
+    timed_out: bool
+
+
+def _project(space: FeatureSpace, x: np.ndarray, cand: np.ndarray) -> np.ndarray:
+    cand = np.clip(cand, space.lower, space.upper)
+    return np.where(space.integral, np.round(cand), cand)
+
+
+def _bisect(predict: PredictFn, valid, space: FeatureSpace, x: np.ndarray, cand: np.ndarray, steps: int):
+    """Acerca cada candidato válido a x manteniendo la validez. Una llamada al modelo por paso."""
+    lo = np.zeros(cand.shape[0])
+    hi = np.ones(cand.shape[0])
+    delta = cand - x
+    for _ in range(steps):
+        mid = (lo + hi) / 2
+        ok = valid(predict(_project(space, x, x + delta * mid[:, None])))
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, mid)
+    out = _project(space, x, x + delta * hi[:, None])
+    return out, predict(out)
+
+
+def search_counterfactuals(
+    predict: PredictFn,
+    x: np.ndarray,
+    space: FeatureSpace,
+    *,
+    threshold: float,
+    max_features: int,
+    max_results: int,
+    batch_size: int,
+    time_limit: float,
+    rng: np.random.Generator,
+    max_radius: float = 8.0,
+    patience: int = 3,
+    bisect_steps: int = 8,
+) -> CounterfactualSearch:
+    """Cambios mínimos (en unidades de `space.scale`) que llevan predict(x) al otro lado de threshold."""
+    t0 = time.monotonic()
+    p0 = float(predict(x[None, :])[0])
+    want_above = p0 < threshold
+
+    def valid(p: np.ndarray) -> np.ndarray:
+        return p >= threshold if want_above else p < threshold
+
+    # Sin valor actual no hay nada que proponer cambiar
+    idx = np.flatnonzero(space.mutable & ~np.isnan(x))
+    found: dict[frozenset, Counterfactual] = {}
+    evaluations, stale, radius = 1, 0, 0.25
+    timed_out = False
+
+    while idx.size and radius <= max_radius:
+        if time.monotonic() - t0 > time_limit:
+            timed_out = True
+            break
+        # Poda: sólo interesa lo que mejore el peor de los max_results mejores
+        costs = sorted(cf.cost for cf in found.values())
+        bound = costs[max_results - 1] if len(costs) >= max_results else np.inf
+
+        k = rng.integers(1, min(max_features, idx.size) + 1, size=batch_size)
+        keys = rng.random((batch_size, idx.size))
+        chosen = keys <= np.sort(keys, axis=1)[np.arange(batch_size), k - 1][:, None]
+        cand = np.repeat(x[None, :], batch_size, axis=0)
+        steps = rng.uniform(-radius, radius, size=(batch_size, idx.size)) * chosen
+        cand[:, idx] = x[idx] + steps * space.scale[idx]
+        cand = _project(space, x, cand)
+        cost = np.nansum(np.abs(cand - x) / space.scale, axis=1)
+        cand = cand[(cost > 0) & (cost < bound)]
+
+        n_before = len(found)
+        if cand.shape[0]:
+            ok = valid(predict(cand))
+            evaluations += cand.shape[0]
+            if ok.any():
+                refined, preds = _bisect(predict, valid, space, x, cand[ok], bisect_steps)
+                evaluations += refined.shape[0] * (bisect_steps + 1)
+                for c, p in zip(refined, preds):
+                    changed = np.flatnonzero(~np.isnan(x) & (c != x))
+                    key = frozenset(changed.tolist())
+                    c_cost = float(np.sum(np.abs(c[changed] - x[changed]) / space.scale[changed]))
+                    if key and (key not in found or c_cost < found[key].cost):
+                        found[key] = Counterfactual(
+                            changes=[(int(j), float(x[j]), float(c[j])) for j in changed],
+                            cost=c_cost,
+                            prediction=float(p),
+                        )
+
+        costs = sorted(cf.cost for cf in found.values())
+        new_bound = costs[max_results - 1] if len(costs) >= max_results else np.inf
+        improved = new_bound < bound or (new_bound == np.inf and len(found) > n_before)
+        if improved:
+            stale = 0
+            continue
+        stale += 1
+        if not found or stale >= patience:
+            # Un contrafactual más barato que el peor guardado no puede estar más lejos que su coste
+            if radius >= new_bound:
+                break
+            radius *= 2
+            stale = 0
+
+    # Fuera los dominados: mismos cambios que otro más algo extra, sin ser más baratos
+    best = [
+        cf
+        for key, cf in found.items()
+        if not any(other < key and found[other].cost <= cf.cost for other in found)
+    ]
+    best = sorted(best, key=lambda cf: cf.cost)[:max_results]
+    return CounterfactualSearch(best, p0, evaluations, time.monotonic() - t0, timed_out)
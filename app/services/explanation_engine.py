@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.decision_event import DecisionEvent
+
+
+@dataclass
+class FeatureMatrix:
+    feature_names: list[str]
+    X: np.ndarray  # (n_rows, n_features) float64; NaN = ausente o no numérico
+
+    def align(self, feature_names: list[str]) -> np.ndarray:
+        """Columnas en el orden que espera un modelo (NaN si la feature no viene)."""
+        pos = {name: j for j, name in enumerate(self.feature_names)}
+        out = np.full((self.X.shape[0], len(feature_names)), np.nan)
+        for j, name in enumerate(feature_names):
+            if name in pos:
+                out[:, j] = self.X[:, pos[name]]
+        return out
+
+
+@dataclass
+class ExplainContext:
+    model_id: str
+    model_version: str
+    method: str
+
+
+@dataclass
+class Attributions:
+    feature_names: list[str]
+    values: np.ndarray  # (n_rows, n_features_out), con signo
+    extra: list[dict] | None = None  # campos adicionales de evidencia por fila
+
+
+# Un explainer recibe la matriz de todo el grupo (mismo modelo y versión) y la
+# resuelve en una sola pasada vectorizada.
+BatchExplainer = Callable[[FeatureMatrix, ExplainContext], Attributions]
+
+EXPLAINERS: dict[str, BatchExplainer] = {}
+
+
+def register_explainer(method: str):
+    def deco(fn: BatchExplainer) -> BatchExplainer:
+        EXPLAINERS[method] = fn
+        return fn
+
+    return deco
+
+
+def _to_float(v) -> float:
+    if isinstance(v, bool):
+        return float(v)
+    if isinstance(v, (int, float)):
+        return float(v)
+    return np.nan
+
+
+def build_feature_matrix(rows: list[dict], feature_names: list[str] | None = None) -> FeatureMatrix:
+    if feature_names is None:
+        feature_names = sorted({k for r in rows for k in (r or {})})
+    X = np.full((len(rows), len(feature_names)), np.nan, dtype=np.float64)
+    for j, name in enumerate(feature_names):
+        X[:, j] = [_to_float((r or {}).get(name)) for r in rows]
+    return FeatureMatrix(feature_names=feature_names, X=X)
+
+
+def main_factors_from_attributions(
+    attributions: np.ndarray, feature_names: list[str], *, top_k: int | None = None
+) -> list[list[dict]]:
+    """Top-k factores por fila (|atribución| descendente) en formato MainFactor."""
+    attributions = np.nan_to_num(np.atleast_2d(attributions))
+    k = attributions.shape[1] if top_k is None else min(top_k, attributions.shape[1])
+    order = np.argsort(-np.abs(attributions), axis=1, kind="stable")[:, :k]
+    picked = np.take_along_axis(attributions, order, axis=1)
+
+    out = []
+    for idx_row, val_row in zip(order.tolist(), picked.tolist()):
+        out.append(
+            [
+                {
+                    "feature": feature_names[j],
+                    "direction": "positive" if v > 0 else "negative" if v < 0 else "unknown",
+                    "importance": abs(v),
+                }
+                for j, v in zip(idx_row, val_row)
+            ]
+        )
+    return out
+
+
+def explain_batch(events: list, *, method: str) -> list[dict]:
+    """Evidencia para eventos del mismo (model_id, model_version) en una sola pasada."""
+    explainer = EXPLAINERS.get(method)
+    if explainer is None:
+        raise ValueError(f"Unknown explanation method: {method}")
+
+    fm = build_feature_matrix([e.input_features for e in events])
+    ctx = ExplainContext(model_id=events[0].model_id, model_version=events[0].model_version, method=method)
+    result = explainer(fm, ctx)
+
+    factors = main_factors_from_attributions(
+        result.values, result.feature_names, top_k=settings.EXPLANATION_TOP_FACTORS
+    )
+    extra = result.extra or [{}] * len(factors)
+    return [{"type": method, "main_factors": f, **x} for f, x in zip(factors, extra)]
+
+
+def run_jobs(db: Session, jobs, *, worker_id: str) -> None:
+    """Calcula y guarda la evidencia de jobs ya reclamados (RUNNING) por `worker_id`."""
+    from app.crud import explanation_cache
+    from app.crud.explanations import heartbeat, set_done_many, set_failed
+
+    event_ids = {j.decision_event_id for j in jobs}
+    events = {
+        e.id: e
+        for e in db.execute(select(DecisionEvent).where(DecisionEvent.id.in_(event_ids))).scalars()
+    }
+
+    groups: dict[tuple, list] = defaultdict(list)
+    for job in jobs:
+        de = events.get(job.decision_event_id)
+        if de is None or de.tenant_id != job.tenant_id:
+            set_failed(
+                db, tenant_id=job.tenant_id, explanation_id=job.id, error="DecisionEvent not found", worker_id=worker_id
+            )
+            continue
+        groups[(de.model_id, de.model_version, job.method)].append((job, de))
+
+    remaining = [job.id for members in groups.values() for job, _ in members]
+    for (_, _, method), members in groups.items():
+        # locked_at por grupo, no sólo al reclamar: el stale cuenta desde el último avance
+        heartbeat(db, worker_id=worker_id, explanation_ids=remaining)
+        remaining = remaining[len(members):]
+        try:
+            evidences = explain_batch([de for _, de in members], method=method)
+        except Exception as e:
+            db.rollback()
+            for job, _ in members:
+                set_failed(db, tenant_id=job.tenant_id, explanation_id=job.id, error=str(e), worker_id=worker_id)
+            continue
+        set_done_many(
+            db, worker_id=worker_id, results=[(job.tenant_id, job.id, ev) for (job, _), ev in zip(members, evidences)]
+        )
+
+        if settings.EXPLANATION_CACHE_ENABLED:
+            explanation_cache.put_many(
+                db,
+                entries=[
+                    {
+                        "key": explanation_cache.cache_key(
+                            tenant_id=de.tenant_id,
+                            model_id=de.model_id,
+                            model_version=de.model_version,
+                            method=method,
+                            input_features=de.input_features,
+                        ),
+                        "tenant_id": de.tenant_id,
+                        "model_id": de.model_id,
+                        "model_version": de.model_version,
+                        "method": method,
+                        "evidence": ev,
+                    }
+                    for (_, de), ev in zip(members, evidences)
+                ],
+            )
+
+
+@register_explainer("exact")
+def _exact_explainer(fm: FeatureMatrix, ctx: ExplainContext) -> Attributions:
+    from app.services.attribution import exact_attributions
+    from app.services.model_registry import model_registry
+
+    model = model_registry.get(ctx.model_id, ctx.model_version).model
+    return exact_attributions(model, fm.align(list(model.feature_names)))
+
+
+@register_explainer("kernel_shap")
+def _kernel_shap_explainer(fm: FeatureMatrix, ctx: ExplainContext) -> Attributions:
+    from app.services.background import background_for
+    from app.services.kernel_shap import kernel_shap
+    from app.services.model_registry import model_registry
+
+    background = background_for(model_registry, ctx.model_id, ctx.model_version)
+    if background is None:
+        raise ValueError(f"Model {ctx.model_id}@{ctx.model_version} has no background dataset")
+
+    model = model_registry.get(ctx.model_id, ctx.model_version).model
+    points, weights = background
+    result = kernel_shap(
+        model.predict,
+        fm.align(list(model.feature_names)),
+        points,
+        background_weights=weights,
+        tolerance=settings.KERNEL_SHAP_TOLERANCE,
+        max_samples=settings.KERNEL_SHAP_MAX_SAMPLES,
+        batch_size=settings.KERNEL_SHAP_BATCH_SIZE,
+        rng=np.random.default_rng(settings.KERNEL_SHAP_SEED),
+        max_predict_rows=settings.KERNEL_SHAP_PREDICT_ROWS,
+    )
+    output_space = "probability" if getattr(model, "link", "identity") == "logit" else "raw"
+    extra = [
+        {
+            "base_value": result.base_value,
+            "output_space": output_space,
+            "error_bound": float(err),
+            "samples_used": int(used),
+            "converged": bool(ok),
+        }
+        for err, used, ok in zip(result.error_bound, result.samples_used, result.converged)
+    ]
+    return Attributions(list(model.feature_names), result.values, extra)
+
+
+@register_explainer("counterfactual")
+def _counterfactual_explainer(fm: FeatureMatrix, ctx: ExplainContext) -> Attributions:
+    from app.services.background import SUMMARY_POINTS
+    from app.services.counterfactual import FeatureSpace, search_counterfactuals
+    from app.services.model_registry import model_registry
+
+    loaded = model_registry.get(ctx.model_id, ctx.model_version)
+    background = loaded.arrays.get("background", loaded.arrays.get(SUMMARY_POINTS))
+    if background is None:
+        raise ValueError(f"Model {ctx.model_id}@{ctx.model_version} has no background dataset")
+
+    model = loaded.model
+    names = list(model.feature_names)
+    immutable = set(loaded.metadata.get("immutable_features", []))
+    space = FeatureSpace.from_background(background, mutable=np.array([n not in immutable for n in names]))
+    threshold = float(loaded.metadata.get("decision_threshold", 0.5))
+
+    X = fm.align(names)
+    # Como atribución, el cambio propuesto por el mejor contrafactual en unidades de escala
+    values = np.zeros_like(X)
+    extra = []
+    for i, x in enumerate(X):
+        found = search_counterfactuals(
+            model.predict,
+            x,
+            space,
+            threshold=threshold,
+            max_features=settings.COUNTERFACTUAL_MAX_FEATURES,
+            max_results=settings.COUNTERFACTUAL_MAX_RESULTS,
+            batch_size=settings.COUNTERFACTUAL_BATCH_SIZE,
+            time_limit=settings.COUNTERFACTUAL_TIME_LIMIT_SECONDS,
+            rng=np.random.default_rng(0),  # determinista: misma entrada => misma evidencia
+        )
+        if found.counterfactuals:
+            for j, current, suggested in found.counterfactuals[0].changes:
+                values[i, j] = (suggested - current) / space.scale[j]
+        extra.append(
+            {
+                "prediction": found.prediction,
+                "decision_threshold": threshold,
+                "counterfactuals": [
+                    {
+                        "changes": [
+                            {"feature": names[j], "current": current, "suggested": suggested}
+                            for j, current, suggested in cf.changes
+                        ],
+                        "cost": cf.cost,
+                        "prediction": cf.prediction,
+                    }
+                    for cf in found.counterfactuals
+                ],
+                "search_seconds": round(found.seconds, 4),
+                "timed_out": found.timed_out,
+            }
+        )
+    return Attributions(names, values, extra)
+
+
+@register_explainer("stub")
+def _stub_explainer(fm: FeatureMatrix, ctx: ExplainContext) -> Attributions:
+    # Sin modelo: mismos factores deterministas que devolvía el stub original
+    names = ["income", "late_payments_12m"]
+    return Attributions(names, np.broadcast_to(np.array([0.3, -0.6]), (fm.X.shape[0], len(names))))
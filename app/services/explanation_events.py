@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+
+from app.crud.explanations import STATUS_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {"DONE", "FAILED"}
+
+
+class ExplanationStatusHub:
+    """Un único LISTEN por proceso que reparte los cambios de estado a las colas de los streams SSE."""
+
+    def __init__(self, channel: str = STATUS_CHANNEL):
+        self.channel = channel
+        self._subs: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, ids: list[str]) -> asyncio.Queue:
+        self._ensure_listener()
+        sub = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            for i in ids:
+                self._subs[i].add(sub)
+        return sub[1]
+
+    def unsubscribe(self, ids: list[str], queue: asyncio.Queue) -> None:
+        with self._lock:
+            for i in ids:
+                subs = self._subs.get(i)
+                if not subs:
+                    continue
+                subs.difference_update({s for s in subs if s[1] is queue})
+                if not subs:
+                    del self._subs[i]
+
+    def dispatch(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        with self._lock:
+            targets = list(self._subs.get(event.get("id"), ()))
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    def resync(self) -> None:
+        """Reenvía el estado actual de todo lo suscrito.
+
+        Los NOTIFY emitidos mientras el LISTEN estaba caído se pierden: tras reconectar, los
+        streams reciben el estado leído de la BD (los repetidos ya los descarta cada stream).
+        """
+        from sqlalchemy import select as sa_select
+
+        from app.db.session import SessionLocal
+        from app.models.explanation import Explanation
+
+        with self._lock:
+            ids = list(self._subs)
+        if not ids:
+            return
+        with SessionLocal() as db:
+            rows = db.execute(
+                sa_select(Explanation.id, Explanation.tenant_id, Explanation.status).where(Explanation.id.in_(ids))
+            ).all()
+        for row in rows:
+            self.dispatch(json.dumps({"id": row.id, "tenant_id": row.tenant_id, "status": row.status}))
+
+    def _ensure_listener(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._listen_forever, name="explanation-status-listener", daemon=True)
+                self._thread.start()
+
+    def _listen_forever(self) -> None:
+        from app.db.session import engine
+
+        reconnecting = False
+        while True:
+            conn = None
+            try:
+                # Conexión fuera del pool: queda ocupada por el LISTEN mientras viva el proceso
+                raw = engine.raw_connection()
+                conn = raw.driver_connection
+                raw.detach()
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel}")
+                if reconnecting:
+                    self.resync()  # ya escuchando: lo que cambie a partir de aquí llega por NOTIFY
+                while True:
+                    if select.select([conn], [], [], 30.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self.dispatch(conn.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Explanation status listener failed; reconnecting")
+                if conn is not None:
+                    # Desacoplada del pool: si no se cierra aquí, cada reintento deja una conexión abierta
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                reconnecting = True
+                time.sleep(1.0)
+
+
+status_hub = ExplanationStatusHub()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import logging
+import time
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _grid(values: np.ndarray, grid_size: int) -> np.ndarray:
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return values  # feature sin valores: sin curva (un NaN no se puede guardar como JSON)
+    unique = np.unique(values)
+    if unique.size <= grid_size:
+        return unique  # categóricas/enteras con pocos valores: todos
+    return np.unique(np.quantile(values, np.linspace(0, 1, grid_size)))
+
+
+def partial_dependence(
+    predict, background: np.ndarray, feature_names: list[str], *, grid_size: int, ice_curves: int
+) -> dict:
+    """PDP e ICE de cada feature sobre `background`. Una llamada al modelo por feature (grid x filas)."""
+    X = np.asarray(background, dtype=np.float64)
+    m, d = X.shape
+    features = {}
+    for j, name in enumerate(feature_names):
+        grid = _grid(X[:, j], grid_size)
+        if grid.size == 0:
+            features[name] = {"grid": [], "pdp": [], "ice": []}
+            continue
+        Z = np.repeat(X[None, :, :], grid.size, axis=0)
+        Z[:, :, j] = grid[:, None]
+        preds = predict(Z.reshape(-1, d)).reshape(grid.size, m)
+        features[name] = {
+            "grid": grid.tolist(),
+            "pdp": preds.mean(axis=1).tolist(),
+            "ice": preds[:, :ice_curves].T.tolist(),
+        }
+    return {"feature_names": list(feature_names), "n_rows": m, "features": features}
+
+
+def compute_global_explanation(loaded) -> dict:
+    background = loaded.arrays.get("background")
+    if background is None:
+        raise ValueError("Model has no background dataset")
+    background = np.asarray(background)
+    if background.shape[0] > settings.GLOBAL_EXPLANATION_MAX_ROWS:
+        rows = np.random.default_rng(0).choice(background.shape[0], settings.GLOBAL_EXPLANATION_MAX_ROWS, replace=False)
+        background = background[np.sort(rows)]
+
+    model = loaded.model
+    curves = partial_dependence(
+        model.predict,
+        background,
+        list(model.feature_names),
+        grid_size=settings.GLOBAL_EXPLANATION_GRID_SIZE,
+        ice_curves=settings.GLOBAL_EXPLANATION_ICE_CURVES,
+    )
+    curves["output_space"] = "probability" if getattr(model, "link", "identity") == "logit" else "raw"
+    return curves
+
+
+def compute_missing(db: Session, registry) -> int:
+    """Calcula las curvas de las versiones registradas que aún no las tienen. Devuelve cuántas."""
+    from app.crud import global_explanations as crud
+
+    stale = settings.EXPLANATION_JOB_STALE_SECONDS
+    done = 0
+    for model_id, model_version in crud.missing_versions(
+        db, versions=registry.list_versions(), stale_after_seconds=stale
+    ):
+        gid = crud.claim(db, model_id=model_id, model_version=model_version, stale_after_seconds=stale)
+        if gid is None:
+            continue  # la tiene otro worker
+        t0 = time.perf_counter()
+        try:
+            curves = compute_global_explanation(registry.get(model_id, model_version))
+            # Dentro del try: si no se puede guardar, FAILED en vez de quedar RUNNING hasta el stale
+            crud.set_done(db, global_explanation_id=gid, curves=curves, compute_seconds=time.perf_counter() - t0)
+        except Exception as e:
+            logger.exception("Global explanation failed for %s@%s", model_id, model_version)
+            db.rollback()
+            crud.set_failed(db, global_explanation_id=gid, error=str(e))
+            continue
+        done += 1
+    return done
@@ -0,0 +1,65 @@
+import copy
+
+# Diferencias estructurales entre documentos JSON para guardar revisiones como deltas:
+#   {"set": [[ruta, valor], ...], "unset": [ruta, ...]}
+# Una ruta es la lista de claves (str) e índices (int) desde la raíz. Las listas de igual
+# longitud se comparan elemento a elemento; si cambia la longitud se reemplazan enteras.
+# Es un formato persistido: cambiarlo obliga a migrar report_revisions.
+
+
+def diff(old, new, *, path: tuple = ()) -> dict:
+    """Delta de old a new; `path` antepone una ruta (diff de un subárbol del documento)."""
+    sets: list = []
+    unsets: list = []
+
+    def walk(a, b, path: list) -> None:
+        if a is b:
+            return  # mismo objeto (p.ej. secciones no tocadas de una copia superficial)
+        if type(a) is type(b) and isinstance(a, dict):
+            for k in a:
+                if k not in b:
+                    unsets.append(path + [k])
+            for k, v in b.items():
+                if k not in a:
+                    sets.append([path + [k], v])
+                else:
+                    walk(a[k], v, path + [k])
+        elif type(a) is type(b) and isinstance(a, list) and len(a) == len(b):
+            for i, (x, y) in enumerate(zip(a, b)):
+                walk(x, y, path + [i])
+        elif type(a) is not type(b) or a != b:
+            # type(): 1 y 1.0 o True y 1 no son el mismo JSON
+            sets.append([path, b])
+
+    walk(old, new, list(path))
+    out = {}
+    if sets:
+        out["set"] = sets
+    if unsets:
+        out["unset"] = unsets
+    return out
+
+
+def apply(doc, *deltas: dict):
+    """Documento resultante de aplicar los deltas en orden a `doc` (no modifica `doc`)."""
+    doc = copy.deepcopy(doc)
+    for delta in deltas:
+        doc = _apply_in_place(doc, delta)
+    return doc
+
+
+def _apply_in_place(doc, delta: dict):
+    for path, value in delta.get("set", []):
+        if not path:
+            doc = copy.deepcopy(value)
+            continue
+        parent = doc
+        for key in path[:-1]:
+            parent = parent[key]
+        parent[path[-1]] = copy.deepcopy(value)
+    for path in delta.get("unset", []):
+        parent = doc
+        for key in path[:-1]:
+            parent = parent[key]
+        del parent[path[-1]]
+    return doc
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+# KernelSHAP con muestreo pareado (Covert & Lee 2021) para modelos de caja negra. En vez de
+# un presupuesto fijo de coaliciones se muestrea por rondas y cada fila deja de muestrear
+# cuando el error estándar estimado de sus atribuciones baja de la tolerancia.
+
+PredictFn = Callable[[np.ndarray], np.ndarray]
+
+
+@dataclass
+class KernelShapResult:
+    values: np.ndarray  # (n, d)
+    base_value: float  # E[f(background)]
+    error_bound: np.ndarray  # (n,) máximo error estándar estimado de las atribuciones
+    samples_used: np.ndarray  # (n,) coaliciones evaluadas
+    converged: np.ndarray  # (n,) bool
+
+
+def _kernel_sizes(d: int) -> tuple[np.ndarray, np.ndarray]:
+    """Tamaños de coalición 1..d-1 y su probabilidad bajo el kernel de Shapley."""
+    sizes = np.arange(1, d)
+    p = (d - 1) / (sizes * (d - sizes))
+    return sizes, p / p.sum()
+
+
+def _constrained_solution(A: np.ndarray, b: np.ndarray, total: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """phi = argmin con restricción de eficiencia sum(phi) = total, y el proyector L (L·1 = 0).
+
+    A: (d, d); b: (n, d); total: (n,) = v(1) - v(0).
+    """
+    A_inv = np.linalg.pinv(A)
+    a_inv_1 = A_inv.sum(axis=1)
+    denom = a_inv_1.sum()
+    L = A_inv - np.outer(a_inv_1, a_inv_1) / denom
+    return b @ L.T + total[:, None] * (a_inv_1 / denom)[None, :], L
+
+
+def _sample_masks(rng: np.random.Generator, n_pairs: int, d: int, sizes: np.ndarray, p: np.ndarray) -> np.ndarray:
+    size = rng.choice(sizes, size=n_pairs, p=p)
+    keys = rng.random((n_pairs, d))
+    cut = np.sort(keys, axis=1)[np.arange(n_pairs), size - 1]
+    return keys <= cut[:, None]
+
+
+def _coalition_values(
+    predict: PredictFn,
+    X: np.ndarray,
+    masks: np.ndarray,
+    background: np.ndarray,
+    weights: np.ndarray,
+    *,
+    max_predict_rows: int,
+) -> np.ndarray:
+    """v(S) = E_bg[f(x_S, bg_~S)] para cada fila y máscara. (n, k)
+
+    Los pares (fila, máscara) se evalúan por bloques: cada llamada al modelo recibe como mucho
+    max(max_predict_rows, m) filas, así que la memoria no crece con n·k.
+    """
+    n, d = X.shape
+    k, m = masks.shape[0], background.shape[0]
+    rows, cols = np.divmod(np.arange(n * k), k)
+    step = max(1, max_predict_rows // m)
+    out = np.empty(n * k)
+    for start in range(0, n * k, step):
+        i, j = rows[start : start + step], cols[start : start + step]
+        Z = np.where(masks[j, None, :], X[i, None, :], background[None, :, :])  # (c, m, d)
+        out[start : start + step] = predict(Z.reshape(-1, d)).reshape(-1, m) @ weights
+    return out.reshape(n, k)
+
+
+def kernel_shap(
+    predict: PredictFn,
+    X: np.ndarray,
+    background: np.ndarray,
+    *,
+    background_weights: np.ndarray | None = None,
+    tolerance: float,
+    max_samples: int,
+    batch_size: int,
+    rng: np.random.Generator | None = None,
+    max_predict_rows: int = 65_536,
+) -> KernelShapResult:
+    """Atribuciones interventional de `predict` para cada fila de X frente a `background`.
+
+    tolerance es relativa: una fila converge cuando max(error estándar) <= tolerance * rango(phi).
+    batch_size son pares de coaliciones (z y su complemento) evaluados por ronda.
+    background_weights (p.ej. tamaños de cluster de un resumen) se normalizan a suma 1.
+    max_predict_rows acota las filas de cada llamada a `predict` al evaluar coaliciones.
+    """
+    rng = rng or np.random.default_rng()
+    n, d = X.shape
+    m = background.shape[0]
+    weights = np.full(m, 1.0 / m) if background_weights is None else np.asarray(background_weights, dtype=np.float64)
+    weights = weights / weights.sum()
+    v0 = float(predict(background) @ weights)
+    v1 = predict(X).astype(np.float64)
+
+    if d <= 1:
+        values = (v1 - v0)[:, None] if d else np.zeros((n, 0))
+        zeros = np.zeros(n)
+        return KernelShapResult(values, v0, zeros, zeros.astype(np.int64), np.ones(n, dtype=bool))
+
+    sizes, p = _kernel_sizes(d)
+    total = v1 - v0
+    max_pairs = max(1, max_samples // 2)
+    masks = np.zeros((max_pairs, d), dtype=bool)
+    b_pairs = np.zeros((n, max_pairs, d))  # z·(v(z)-v0) promediado con su complemento
+
+    # Las filas que siguen activas han visto todas las rondas: comparten las mismas coaliciones
+    count = np.zeros(n, dtype=np.int64)  # pares evaluados
+    values = np.zeros((n, d))
+    error = np.full(n, np.inf)
+    converged = np.zeros(n, dtype=bool)
+    used = 0
+
+    while used < max_pairs:
+        active = np.flatnonzero(~converged)
+        if active.size == 0:
+            break
+        k = min(batch_size, max_pairs - used)
+        new = _sample_masks(rng, k, d, sizes, p)
+        v = _coalition_values(
+            predict, X[active], np.concatenate([new, ~new]), background, weights, max_predict_rows=max_predict_rows
+        )
+        v -= v0  # (a, 2k)
+        z = new.astype(np.float64)
+        b_pairs[active, used : used + k] = 0.5 * (v[:, :k, None] * z + v[:, k:, None] * (1.0 - z))
+        masks[used : used + k] = new
+        used += k
+        count[active] = used
+
+        Z = masks[:used].astype(np.float64)
+        A = 0.5 * (Z.T @ Z + (1.0 - Z).T @ (1.0 - Z)) / used
+        b = b_pairs[active, :used]
+        phi, L = _constrained_solution(A, b.mean(axis=1), total[active])
+
+        # Error estándar por linealización: el residuo de cada par b_k - A_k·phi proyectado con L.
+        # En juegos aditivos el residuo es 0 y la fila converge en la primera ronda.
+        Zphi = Z @ phi.T  # (used, a)
+        resid = b - 0.5 * (Z[None] * Zphi.T[:, :, None] + (1.0 - Z)[None] * (total[active, None] - Zphi.T)[:, :, None])
+        psi = resid @ L.T
+        se = np.sqrt(psi.var(axis=1, ddof=1) / used).max(axis=1) if used > 1 else np.full(active.size, np.inf)
+
+        values[active] = phi
+        error[active] = se
+        converged[active] = se <= tolerance * (phi.max(axis=1) - phi.min(axis=1))
+
+    return KernelShapResult(values, v0, error, 2 * count, converged)
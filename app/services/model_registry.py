@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+import numpy as np
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services.attribution import LinearModel, TreeEnsemble
+
+logger = logging.getLogger(__name__)
+
+# Layout: <root>/<model_id>/<model_version>/{manifest.json, <array>.npy}
+# Los .npy se abren con mmap en sólo lectura: los workers de la misma máquina comparten
+# las páginas vía page cache en vez de tener cada uno su copia.
+
+_SAFE_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,127}$")
+
+_KINDS: dict[str, type] = {"linear": LinearModel, "tree_ensemble": TreeEnsemble}
+_SCALARS = {"intercept", "base_score", "link"}
+
+
+def _check_id(value: str) -> str:
+    # model_id/model_version vienen de los DecisionEvents: nada de rutas
+    if not _SAFE_ID.match(value or ""):
+        raise ValueError(f"Invalid model identifier: {value!r}")
+    return value
+
+
+@dataclass
+class LoadedModel:
+    model: LinearModel | TreeEnsemble
+    arrays: dict[str, np.ndarray]  # arrays extra del artefacto (p.ej. background)
+    metadata: dict
+    load_seconds: float
+    mapped_bytes: int
+
+
+def _rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ModelRegistry:
+    def __init__(self, root: str | Path | None = None, *, max_loaded: int | None = None):
+        self.root = Path(root or settings.MODEL_REGISTRY_DIR)
+        self._loaded: TTLCache[tuple[str, str], LoadedModel] = TTLCache(
+            max_size=max_loaded or settings.MODEL_REGISTRY_MAX_LOADED, ttl_seconds=None
+        )
+
+    def _dir(self, model_id: str, model_version: str) -> Path:
+        return self.root / _check_id(model_id) / _check_id(model_version)
+
+    def register(
+        self,
+        model_id: str,
+        model_version: str,
+        model: LinearModel | TreeEnsemble,
+        *,
+        arrays: dict[str, np.ndarray] | None = None,
+        metadata: dict | None = None,
+    ) -> Path:
+        """Guarda una versión nueva. Las versiones son inmutables."""
+        target = self._dir(model_id, model_version)
+        if target.exists():
+            raise FileExistsError(f"Model {model_id}@{model_version} is already registered")
+
+        kind = next((k for k, cls in _KINDS.items() if isinstance(model, cls)), None)
+        if kind is None:
+            raise TypeError(f"Unsupported model type: {type(model).__name__}")
+
+        manifest = {"kind": kind, "metadata": metadata or {}, "params": {}, "model_arrays": [], "arrays": []}
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=target.parent, prefix=f".{model_version}."))
+        try:
+            for f in fields(model):
+                value = getattr(model, f.name)
+                if isinstance(value, np.ndarray):
+                    np.save(tmp / f"{f.name}.npy", np.ascontiguousarray(value))
+                    manifest["model_arrays"].append(f.name)
+                elif f.name in _SCALARS:
+                    manifest["params"][f.name] = value.item() if isinstance(value, np.generic) else value
+                else:
+                    manifest["params"][f.name] = list(value)
+            for name, value in (arrays or {}).items():
+                np.save(tmp / f"extra.{_check_id(name)}.npy", np.ascontiguousarray(value))
+                manifest["arrays"].append(name)
+            (tmp / "manifest.json").write_text(json.dumps(manifest, indent=2))
+            tmp.rename(target)  # atómico: un lector nunca ve una versión a medias
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        return target
+
+    def add_arrays(self, model_id: str, model_version: str, arrays: dict[str, np.ndarray]) -> None:
+        """Añade arrays derivados (p.ej. el resumen del background) a una versión ya registrada.
+
+        El modelo en sí no cambia; un array con el mismo nombre se reemplaza.
+        """
+        target = self._dir(model_id, model_version)
+        manifest_path = target / "manifest.json"
+        if not manifest_path.exists():
+            raise LookupError(f"Model {model_id}@{model_version} is not registered")
+
+        manifest = json.loads(manifest_path.read_text())
+        suffix = f"{os.getpid()}.tmp"
+        for name, value in arrays.items():
+            tmp = target / f".extra.{_check_id(name)}.{suffix}"
+            with open(tmp, "wb") as f:
+                np.save(f, np.ascontiguousarray(value))
+            # Inodo nuevo: quien ya tenga mapeado el anterior lo sigue leyendo entero
+            os.replace(tmp, target / f"extra.{name}.npy")
+        manifest["arrays"] = sorted(set(manifest["arrays"]) | set(arrays))
+        tmp = target / f".manifest.{suffix}"
+        tmp.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp, manifest_path)
+        self._loaded.invalidate((model_id, model_version))
+
+    def list_versions(self) -> list[tuple[str, str]]:
+        if not self.root.exists():
+            return []
+        return sorted(
+            (m.name, v.name)
+            for m in self.root.iterdir()
+            if m.is_dir() and _SAFE_ID.match(m.name)
+            for v in m.iterdir()
+            # Sin los ".<version>.XXXX" de register(): a medio escribir o restos de un fallo
+            if _SAFE_ID.match(v.name) and (v / "manifest.json").exists()
+        )
+
+    def _load(self, model_id: str, model_version: str) -> LoadedModel:
+        target = self._dir(model_id, model_version)
+        manifest_path = target / "manifest.json"
+        if not manifest_path.exists():
+            raise LookupError(f"Model {model_id}@{model_version} is not registered")
+
+        t0 = time.perf_counter()
+        manifest = json.loads(manifest_path.read_text())
+        kwargs = dict(manifest["params"])
+        for name in manifest["model_arrays"]:
+            kwargs[name] = np.load(target / f"{name}.npy", mmap_mode="r")
+        arrays = {name: np.load(target / f"extra.{name}.npy", mmap_mode="r") for name in manifest["arrays"]}
+        model = _KINDS[manifest["kind"]](**kwargs)
+
+        mapped = sum(a.nbytes for a in kwargs.values() if isinstance(a, np.ndarray))
+        mapped += sum(a.nbytes for a in arrays.values())
+        loaded = LoadedModel(
+            model=model,
+            arrays=arrays,
+            metadata=manifest.get("metadata", {}),
+            load_seconds=time.perf_counter() - t0,
+            mapped_bytes=mapped,
+        )
+        logger.info(
+            "Loaded model %s@%s in %.1f ms (%d bytes mapped, rss=%s)",
+            model_id,
+            model_version,
+            loaded.load_seconds * 1000,
+            mapped,
+            _rss_bytes(),
+        )
+        return loaded
+
+    def get(self, model_id: str, model_version: str) -> LoadedModel:
+        key = (model_id, model_version)
+        loaded = self._loaded.get(key)
+        if loaded is None:
+            loaded = self._load(model_id, model_version)
+            self._loaded.set(key, loaded)
+        return loaded
+
+    def refresh(self, model_id: str, model_version: str) -> LoadedModel:
+        self._loaded.invalidate((model_id, model_version))
+        return self.get(model_id, model_version)
+
+    def stats(self) -> dict:
+        loaded = []
+        for (model_id, model_version), lm in self._loaded.items():
+            loaded.append(
+                {
+                    "model_id": model_id,
+                    "model_version": model_version,
+                    "load_ms": round(lm.load_seconds * 1000, 3),
+                    "mapped_bytes": lm.mapped_bytes,
+                }
+            )
+        return {**self._loaded.stats.as_dict(), "loaded": loaded, "rss_bytes": _rss_bytes()}
+
+
+model_registry = ModelRegistry()
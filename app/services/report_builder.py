@@ -3,13 +3,22 @@ from __future__ import annotations
 from app.schemas.report_schema_v1 import ReportSchemaV1
 
 
-def build_report_raw_v1(*, template_id: str, de, ex) -> dict:
+def _fmt(v) -> str:
+    return f"{v:g}" if isinstance(v, float) else str(v)
+
+
+def build_report_raw_v1(*, template_id: str, de, ex, global_explanation_id: str | None = None) -> dict:
     main_factors = (ex.evidence or {}).get("main_factors", [])
+    counterfactuals = (ex.evidence or {}).get("counterfactuals", [])
 
     evidence_items = [
         {"id": f"mf_{i}", "kind": "main_factor", "payload": f}
         for i, f in enumerate(main_factors)
     ]
+    evidence_items += [
+        {"id": f"cf_{i}", "kind": "counterfactual", "payload": cf}
+        for i, cf in enumerate(counterfactuals)
+    ]
 
     # Fallback para que el resumen no salga vacío si no hay label
     label = (de.final_decision or {}).get("label")
@@ -42,7 +51,30 @@ def build_report_raw_v1(*, template_id: str, de, ex) -> dict:
         },
     ]
 
-    return {
+    if counterfactuals:
+        sections.append(
+            {
+                "id": "recourse",
+                "title": "Cambios que alterarían la decisión",
+                "blocks": [
+                    {
+                        "type": "list",
+                        "items": [
+                            {
+                                "text": "; ".join(
+                                    f"{c.get('feature')}: {_fmt(c.get('current'))} → {_fmt(c.get('suggested'))}"
+                                    for c in cf.get("changes", [])
+                                ),
+                                "evidence_ids": [f"cf_{i}"],
+                            }
+                            for i, cf in enumerate(counterfactuals)
+                        ],
+                    }
+                ],
+            }
+        )
+
+    raw = {
         "schema_version": "1.0",
         "template_id": template_id,
         "decision_event_id": de.id,
@@ -57,8 +89,14 @@ def build_report_raw_v1(*, template_id: str, de, ex) -> dict:
         "sections": sections,
         "evidence_items": evidence_items,
     }
+    if global_explanation_id:
+        raw["global_explanation_ref"] = {
+            "global_explanation_id": global_explanation_id,
+            "href": f"/v1/global-explanations/{de.model_id}/{de.model_version}",
+        }
+    return raw
 
 
-def build_report_schema_v1(*, template_id: str, de, ex) -> ReportSchemaV1:
-    raw = build_report_raw_v1(template_id=template_id, de=de, ex=ex)
+def build_report_schema_v1(*, template_id: str, de, ex, global_explanation_id: str | None = None) -> ReportSchemaV1:
+    raw = build_report_raw_v1(template_id=template_id, de=de, ex=ex, global_explanation_id=global_explanation_id)
     return ReportSchemaV1.model_validate(raw)
@@ -0,0 +1,22 @@
+from app.schemas.report_schema_v1 import ReportSchemaV1
+
+# Huella de validación: versión del esquema con la que se validó el report_json guardado. Se
+# sella al escribir un documento ya validado (los anteriores, en el backfill de 5f8b2d6e0c13).
+# Sólo detecta cambios de esquema, no de contenido: no lleva hash (comprobarlo en cada lectura
+# cuesta casi lo mismo que validar), así que un report_json cambiado por fuera de la API que
+# conserve el sello se sirve sin validar y sólo se detecta con validate=true.
+
+SCHEMA_VERSION = ReportSchemaV1.model_fields["schema_version"].default
+REPORT_FINGERPRINT = SCHEMA_VERSION
+
+
+def stored_report_json(rpt, *, validate: bool = False) -> dict:
+    """report_json de `rpt` listo para devolver, sin escribir nada.
+
+    Sin validar si está sellado con el esquema actual; si no (o con validate=True) se devuelve
+    validado. Lanza ValidationError si no es un ReportSchemaV1 válido.
+    """
+    doc = rpt.report_json or {}
+    if not validate and rpt.report_fingerprint == REPORT_FINGERPRINT:
+        return doc
+    return ReportSchemaV1.model_validate(doc).model_dump(mode="json")
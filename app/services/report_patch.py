@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from app.schemas.report import SectionOperation
+
+
+def apply_section_operations(sections: list[dict], operations: list[SectionOperation]) -> list[dict]:
+    """Secciones (JSON) tras aplicar las operaciones en orden.
+
+    No modifica `sections`: copia la lista y sólo las secciones tocadas, el resto son los
+    mismos objetos (json_delta.diff los salta). Lanza ValueError si una operación no aplica.
+    """
+    out = list(sections)
+    for op in operations:
+        idx = next((i for i, s in enumerate(out) if s.get("id") == op.section_id), None)
+
+        if not op.on_block:
+            if op.op == "add":
+                if idx is not None:
+                    raise ValueError(f"Section {op.section_id} already exists")
+                out.append(op.section.model_dump(mode="json"))
+            elif idx is None:
+                raise ValueError(f"Section {op.section_id} not found")
+            elif op.op == "replace":
+                out[idx] = op.section.model_dump(mode="json")
+            else:
+                del out[idx]
+            continue
+
+        if idx is None:
+            raise ValueError(f"Section {op.section_id} not found")
+        section = dict(out[idx])
+        blocks = list(section.get("blocks", []))
+        j = len(blocks) if op.block_index is None else op.block_index
+        if j > len(blocks) or (op.op != "add" and j == len(blocks)):
+            raise ValueError(f"Block {j} out of range in section {op.section_id}")
+        if op.op == "add":
+            blocks.insert(j, op.block.model_dump(mode="json"))
+        elif op.op == "replace":
+            blocks[j] = op.block.model_dump(mode="json")
+        else:
+            del blocks[j]
+        section["blocks"] = blocks
+        out[idx] = section
+    return out
@@ -0,0 +1,107 @@
+"""Worker de explicaciones: consume la cola persistente de la tabla `explanations`.
+
+    python -m app.workers.explanations --processes 4
+
+Cada proceso tiene su propio engine/pool de conexiones y reclama lotes con
+SKIP LOCKED, así que se puede escalar con más procesos o más máquinas.
+"""
+import argparse
+import logging
+import multiprocessing as mp
+import os
+import signal
+import socket
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def run_worker(worker_id: str, stop, *, batch_size: int, poll_seconds: float) -> None:
+    # Import dentro: con "spawn" cada proceso crea su propio engine
+    from app.crud import explanation_cache
+    from app.crud.explanations import claim_pending, reclaim_stale
+    from app.db.session import SessionLocal
+    from app.services.explanation_engine import run_jobs
+    from app.services.global_explanations import compute_missing
+    from app.services.model_registry import model_registry
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # el padre coordina la parada vía `stop`
+    last_reclaim = 0.0
+    last_global_scan = 0.0
+
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            now = time.monotonic()
+            if now - last_reclaim >= settings.EXPLANATION_JOB_STALE_SECONDS / 4:
+                n = reclaim_stale(
+                    db,
+                    stale_after_seconds=settings.EXPLANATION_JOB_STALE_SECONDS,
+                    max_attempts=settings.EXPLANATION_JOB_MAX_ATTEMPTS,
+                )
+                if n:
+                    logger.warning("%s reclaimed %d stale explanation jobs", worker_id, n)
+                if settings.EXPLANATION_CACHE_ENABLED:
+                    explanation_cache.prune(db, max_entries=settings.EXPLANATION_CACHE_MAX_ENTRIES)
+                last_reclaim = now
+            if now - last_global_scan >= settings.GLOBAL_EXPLANATION_SCAN_SECONDS:
+                last_global_scan = now
+                n = compute_missing(db, model_registry)
+                if n:
+                    logger.info("%s computed global explanations for %d model versions", worker_id, n)
+
+            jobs = claim_pending(db, worker_id=worker_id, limit=batch_size)
+            if jobs:
+                run_jobs(db, jobs, worker_id=worker_id)
+        except Exception:
+            logger.exception("%s: error in worker loop", worker_id)
+            db.rollback()
+            jobs = []
+        finally:
+            db.close()
+
+        if not jobs:
+            stop.wait(poll_seconds)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Explanation job workers")
+    parser.add_argument("--processes", type=int, default=settings.EXPLANATION_WORKER_PROCESSES)
+    parser.add_argument("--batch-size", type=int, default=settings.EXPLANATION_WORKER_BATCH_SIZE)
+    parser.add_argument("--poll-seconds", type=float, default=settings.EXPLANATION_WORKER_POLL_SECONDS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+
+    ctx = mp.get_context("spawn")
+    stop = ctx.Event()
+    # locked_by es String(64): se recorta sólo el hostname para no perder el pid ni el índice
+    # (hostname 40 + pid de 7 dígitos como mucho + índice)
+    host = f"{socket.gethostname()[:40]}:{os.getpid()}"
+    procs = [
+        ctx.Process(
+            target=run_worker,
+            args=(f"{host}/{i}", stop),
+            kwargs={"batch_size": args.batch_size, "poll_seconds": args.poll_seconds},
+            name=f"expl-worker-{i}",
+        )
+        for i in range(args.processes)
+    ]
+    for p in procs:
+        p.start()
+
+    def _shutdown(signum, frame):
+        logger.info("Stopping %d explanation workers", len(procs))
+        stop.set()
+
+    signal.signal(signal.SIGINT, _shutdown)
+    signal.signal(signal.SIGTERM, _shutdown)
+
+    for p in procs:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Coste por fila de las atribuciones exactas (lineal y TreeSHAP).
+
+    python -m benchmarks.bench_attribution
+"""
+import time
+
+import numpy as np
+
+from app.services.attribution import LinearModel, TreeEnsemble, linear_shap, tree_shap
+
+
+def random_ensemble(rng, n_features: int, n_trees: int, depth: int) -> TreeEnsemble:
+    left, right, feature, threshold, value, cover, roots = [], [], [], [], [], [], []
+
+    def grow(d: int, weight: float) -> int:
+        idx = len(left)
+        left.append(-1)
+        right.append(-1)
+        feature.append(0)
+        threshold.append(0.0)
+        value.append(0.0)
+        cover.append(weight)
+        if d == depth:
+            value[idx] = rng.normal()
+            return idx
+        feature[idx] = int(rng.integers(n_features))
+        threshold[idx] = rng.normal()
+        share = rng.uniform(0.2, 0.8)
+        left[idx] = grow(d + 1, weight * share)
+        right[idx] = grow(d + 1, weight * (1 - share))
+        return idx
+
+    for _ in range(n_trees):
+        roots.append(grow(0, 1000.0))
+
+    return TreeEnsemble(
+        feature_names=[f"f{i}" for i in range(n_features)],
+        children_left=np.array(left, dtype=np.int32),
+        children_right=np.array(right, dtype=np.int32),
+        feature=np.array(feature, dtype=np.int32),
+        threshold=np.array(threshold),
+        value=np.array(value),
+        cover=np.array(cover),
+        default_left=np.ones(len(left), dtype=bool),
+        roots=np.array(roots, dtype=np.int32),
+        link="logit",
+    )
+
+
+def per_row_us(fn, X, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(X)
+        best = min(best, time.perf_counter() - t0)
+    return best / X.shape[0] * 1e6
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'features':>8} {'linear us/row':>14} {'tree_shap us/row':>17}   (100 trees, depth 6)")
+    for d in (10, 100, 1000):
+        linear = LinearModel(
+            feature_names=[f"f{i}" for i in range(d)],
+            coef=rng.normal(size=d),
+            intercept=0.0,
+            feature_mean=np.zeros(d),
+            link="logit",
+        )
+        trees = random_ensemble(rng, d, n_trees=100, depth=6)
+
+        X_lin = rng.normal(size=(10_000, d))
+        X_tree = rng.normal(size=(1_000, d))
+        lin = per_row_us(lambda X: linear_shap(linear, X), X_lin)
+        tree = per_row_us(lambda X: tree_shap(trees, X), X_tree, repeat=1)
+        print(f"{d:>8} {lin:>14.2f} {tree:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Velocidad/precisión de KernelSHAP con el background completo frente a resúmenes.
+
+    python -m benchmarks.bench_background
+
+Errores de |phi_resumen - phi_completo| relativos al rango de phi_completo de cada fila.
+"""
+import time
+
+import numpy as np
+
+from app.services.background import summarize_background
+from app.services.kernel_shap import kernel_shap
+from benchmarks.bench_attribution import random_ensemble
+
+
+def explain(model, X, points, weights=None):
+    t0 = time.perf_counter()
+    res = kernel_shap(
+        model.predict,
+        X,
+        points,
+        background_weights=weights,
+        tolerance=0.0,
+        max_samples=512,
+        batch_size=32,
+        rng=np.random.default_rng(0),
+    )
+    return res.values, (time.perf_counter() - t0) / X.shape[0] * 1000
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    d = 12
+    model = random_ensemble(rng, d, n_trees=50, depth=4)
+    background = rng.normal(size=(2_000, d)) * rng.uniform(0.5, 2.0, size=d)
+    X = rng.normal(size=(5, d))
+
+    # Mismas coaliciones en todas las ejecuciones: la diferencia es sólo el background
+    reference, full_ms = explain(model, X, background)
+    spread = (reference.max(axis=1) - reference.min(axis=1))[:, None]
+    print(f"{'method':>10} {'size':>6} {'summarize ms':>13} {'ms/row':>8} {'mean err':>9} {'max err':>8}")
+    print(f"{'full':>10} {background.shape[0]:>6} {'-':>13} {full_ms:>8.1f} {0.0:>9.4f} {0.0:>8.4f}")
+
+    for method in ("kmeans", "stratified"):
+        for size in (10, 25, 50, 100, 200):
+            t0 = time.perf_counter()
+            s = summarize_background(background, method=method, size=size, rng=rng, predict=model.predict)
+            summarize_ms = (time.perf_counter() - t0) * 1000
+            values, ms = explain(model, X, s.points, s.weights)
+            err = np.abs(values - reference) / spread
+            print(f"{method:>10} {size:>6} {summarize_ms:>13.1f} {ms:>8.1f} {err.mean():>9.4f} {err.max():>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Latencia y planes del listado de reports según crece un tenant.
+
+    python -m benchmarks.bench_report_listing [--stages 20000,100000,400000] [--keep]
+
+Siembra un tenant sintético por etapas contra DATABASE_URL y en cada etapa mide la
+primera página y una página profunda (cursor al ~90%) de cada filtro. Falla si algún
+plan recorre reports con Seq Scan, toca decision_events (el listado no hace join) o,
+en los listados ordenados, necesita ordenar en vez de leer el índice en orden.
+"""
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.crud.reports import count_reports, list_reports, list_reports_stmt
+from app.db.session import SessionLocal, engine
+
+LIMIT = 20
+
+SEED_SQL = """
+INSERT INTO decision_events
+    (id, tenant_id, decision_id, occurred_at, model_id, model_version,
+     input_features, model_output, final_decision, idempotency_key, created_at)
+SELECT md5(:tenant || '-de-' || i)::uuid::text, :tenant, 'dec_' || i,
+       :t0 + i * interval '1 second', 'm1', '1.0.0',
+       '{}', '{}', json_build_object('label', CASE WHEN i % 3 = 0 THEN 'approved' ELSE 'denied' END),
+       'k' || i, :t0 + i * interval '1 second'
+FROM generate_series(:lo, :hi) AS i;
+
+INSERT INTO explanations (id, tenant_id, decision_event_id, status, method, evidence, attempts, created_at, updated_at)
+SELECT md5(:tenant || '-ex-' || i)::uuid::text, :tenant, md5(:tenant || '-de-' || i)::uuid::text,
+       'DONE', 'stub', '{}', 0, now(), now()
+FROM generate_series(:lo, :hi) AS i;
+
+INSERT INTO reports
+    (id, tenant_id, decision_event_id, explanation_id, decision_id, occurred_at, decision_label,
+     template_id, status, report_json, schema_version, template_version, version, created_at, updated_at)
+SELECT md5(:tenant || '-rp-' || i)::uuid::text, :tenant, md5(:tenant || '-de-' || i)::uuid::text,
+       md5(:tenant || '-ex-' || i)::uuid::text, 'dec_' || i, :t0 + i * interval '1 second',
+       CASE WHEN i % 3 = 0 THEN 'approved' ELSE 'denied' END, 'generic_v1',
+       CASE WHEN i % 10 = 0 THEN 'FINAL' ELSE 'DRAFT' END, '{}', '1.0', '1', 1,
+       :t0 + i * interval '1 second', now()
+FROM generate_series(:lo, :hi) AS i;
+"""
+
+
+def seed(tenant: str, t0: datetime, lo: int, hi: int) -> None:
+    with engine.begin() as conn:
+        for stmt in SEED_SQL.split(";"):
+            if stmt.strip():
+                conn.execute(text(stmt), {"tenant": tenant, "t0": t0, "lo": lo, "hi": hi})
+        for table in ("decision_events", "explanations", "reports"):
+            conn.execute(text(f"ANALYZE {table}"))
+
+
+def cleanup(tenant: str) -> None:
+    with engine.begin() as conn:
+        for table in ("reports", "explanations", "decision_events"):
+            conn.execute(text(f"DELETE FROM {table} WHERE tenant_id = :tenant"), {"tenant": tenant})
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(filters: dict) -> list[dict]:
+    compiled = list_reports_stmt(**filters).compile(bind=engine)
+    with engine.connect() as conn:
+        raw = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params).scalar_one()
+    raw = json.loads(raw) if isinstance(raw, str) else raw
+    return list(plan_nodes(raw[0]["Plan"]))
+
+
+def check_plan(name: str, nodes: list[dict], *, ordered: bool) -> list[str]:
+    problems = []
+    for node in nodes:
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "reports":
+            problems.append(f"{name}: Seq Scan on reports")
+        if node.get("Relation Name") == "decision_events":
+            problems.append(f"{name}: reads decision_events")
+    if ordered and any(node["Node Type"] in ("Sort", "Incremental Sort") for node in nodes):
+        problems.append(f"{name}: Sort instead of index order")
+    return problems
+
+
+def deep_key(filters: dict) -> tuple:
+    """(created_at, id) al ~90% del listado filtrado. Con OFFSET una sola vez: no entra en la medida."""
+    with SessionLocal() as db:
+        n = count_reports(db, **{k: v for k, v in filters.items() if k != "limit"})
+        row = db.execute(list_reports_stmt(**{**filters, "limit": 1}).offset(int(n * 0.9))).one()
+        return row.created_at, row.id
+
+
+def timed(filters: dict, repeat: int) -> float:
+    samples = []
+    with SessionLocal() as db:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            list_reports(db, **filters)
+            samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stages", default="20000,100000,400000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="no borra el tenant sintético al terminar")
+    args = parser.parse_args()
+
+    tenant = f"bench_{uuid.uuid4().hex[:8]}"
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    problems: list[str] = []
+    seeded = 0
+    print(f"{'rows':>8} {'case':>10} {'page1 ms':>9} {'deep ms':>8}")
+    try:
+        for size in (int(s) for s in args.stages.split(",")):
+            seed(tenant, t0, seeded + 1, size)
+            seeded = size
+            newest = t0 + timedelta(seconds=size)
+
+            cases = {
+                "all": ({}, True),
+                "status": ({"status": "FINAL"}, True),
+                "decision": ({"decision_id": f"dec_{size // 2}"}, False),
+                "last_hour": ({"occurred_after": newest - timedelta(hours=1)}, False),
+            }
+            for name, (filters, ordered) in cases.items():
+                base = {"tenant_id": tenant, "limit": LIMIT + 1, **filters}
+                deep = deep_key(base)
+                problems += check_plan(f"{size}/{name}", explain(base), ordered=ordered)
+                problems += check_plan(f"{size}/{name}/deep", explain({**base, "after": deep}), ordered=ordered)
+                page1 = timed(base, args.repeat)
+                deep_ms = timed({**base, "after": deep}, args.repeat)
+                print(f"{size:>8} {name:>10} {page1:>9.2f} {deep_ms:>8.2f}")
+    finally:
+        if not args.keep:
+            cleanup(tenant)
+
+    if problems:
+        raise SystemExit("Plan check failed:\n  " + "\n  ".join(problems))
+    print("plans OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Almacenamiento y reconstrucción del historial de reports con deltas y snapshots cada N.
+
+    python -m benchmarks.bench_report_revisions [--versions 200]
+
+Simula un report realista editado muchas veces (una sección por edición, como PATCH) y
+compara lo que ocupa guardar cada versión completa frente a snapshot cada N + deltas, y
+cuánto cuesta reconstruir una versión cualquiera.
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.services import json_delta
+from app.services.report_builder import build_report_schema_v1
+
+
+def base_report(rng: random.Random) -> dict:
+    factors = [
+        {"feature": f"feature_{j}", "direction": rng.choice(["positive", "negative"]), "importance": rng.random()}
+        for j in range(10)
+    ]
+    counterfactuals = [
+        {
+            "changes": [{"feature": f"feature_{j}", "current": rng.random(), "suggested": rng.random()} for j in range(2)],
+            "cost": rng.random(),
+            "prediction": rng.random(),
+        }
+        for _ in range(3)
+    ]
+    de = SimpleNamespace(
+        id="de_1",
+        decision_id="dec_1",
+        occurred_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        model_id="m1",
+        model_version="1.0.0",
+        final_decision={"label": "denied"},
+    )
+    ex = SimpleNamespace(id="ex_1", evidence={"type": "kernel_shap", "main_factors": factors, "counterfactuals": counterfactuals})
+    return build_report_schema_v1(template_id="generic_v1", de=de, ex=ex).model_dump(mode="json")
+
+
+def history(n_versions: int, rng: random.Random) -> list[dict]:
+    docs = [base_report(rng)]
+    for v in range(1, n_versions):
+        doc = json.loads(json.dumps(docs[-1]))
+        section = rng.choice(doc["sections"])
+        block = section["blocks"][0]
+        if block["type"] == "text" or rng.random() < 0.5:
+            section["blocks"][0] = {"type": "text", "text": f"Revisión {v}: " + "texto " * rng.randint(5, 40), "evidence_ids": []}
+        else:
+            block["items"].append({"text": f"Nota del revisor {v}", "evidence_ids": []})
+        docs.append(doc)
+    return docs
+
+
+def stored_rows(docs: list[dict], every: int) -> list[tuple[dict | None, dict | None]]:
+    # Mismo criterio que crud.report_revisions.is_snapshot_version
+    return [
+        (doc, None) if (v - 1) % every == 0 else (None, json_delta.diff(docs[v - 2], doc))
+        for v, doc in enumerate(docs, start=1)
+    ]
+
+
+def reconstruct(rows, version: int) -> tuple[dict, int]:
+    base = max(v for v in range(1, version + 1) if rows[v - 1][0] is not None)
+    chain = rows[base - 1 : version]
+    return json_delta.apply(chain[0][0], *(delta for _, delta in chain[1:])), len(chain)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--versions", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    docs = history(args.versions, rng)
+    full_bytes = sum(len(json.dumps(d)) for d in docs)
+    print(f"{args.versions} versiones, documento medio {full_bytes / len(docs) / 1024:.1f} KiB")
+    print(f"{'every':>6} {'stored KiB':>11} {'ratio':>6} {'max rows':>9} {'avg ms':>7} {'max ms':>7}")
+    print(f"{'full':>6} {full_bytes / 1024:>11.1f} {1.0:>6.2f} {1:>9} {'-':>7} {'-':>7}")
+
+    for every in (5, 10, 20, 50):
+        rows = stored_rows(docs, every)
+        stored = sum(len(json.dumps(snap if snap is not None else delta)) for snap, delta in rows)
+        times, touched = [], []
+        for version in range(1, len(docs) + 1):
+            t0 = time.perf_counter()
+            doc, n = reconstruct(rows, version)
+            times.append((time.perf_counter() - t0) * 1000)
+            touched.append(n)
+            assert doc == docs[version - 1]
+        print(
+            f"{every:>6} {stored / 1024:>11.1f} {stored / full_bytes:>6.2f} {max(touched):>9} "
+            f"{sum(times) / len(times):>7.3f} {max(times):>7.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
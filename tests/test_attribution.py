@@ -0,0 +1,83 @@
+from itertools import combinations
+from math import factorial
+
+import numpy as np
+
+from app.services.attribution import LinearModel, TreeEnsemble, linear_shap, tree_shap
+
+
+def _tree() -> TreeEnsemble:
+    # Árbol de profundidad 3 que usa la feature 0 dos veces en el mismo camino
+    #            0: x0<=0.5
+    #      1: x1<=0.3        2: x0<=0.8
+    #   3: x2<=0.1  4      5      6: x3<=0.6
+    #   7     8            9      10
+    left = np.array([1, 3, 5, 7, -1, -1, 9, -1, -1, -1, -1], dtype=np.int32)
+    right = np.array([2, 4, 6, 8, -1, -1, 10, -1, -1, -1, -1], dtype=np.int32)
+    feature = np.array([0, 1, 0, 2, 0, 0, 3, 0, 0, 0, 0], dtype=np.int32)
+    threshold = np.array([0.5, 0.3, 0.8, 0.1, 0, 0, 0.6, 0, 0, 0, 0], dtype=np.float64)
+    value = np.array([0, 0, 0, 0, 2.0, -1.0, 0, 0.5, 3.0, 1.5, -2.0])
+    cover = np.array([100, 60, 40, 35, 25, 10, 30, 20, 15, 18, 12], dtype=np.float64)
+    return TreeEnsemble(
+        feature_names=["x0", "x1", "x2", "x3"],
+        children_left=left,
+        children_right=right,
+        feature=feature,
+        threshold=threshold,
+        value=value,
+        cover=cover,
+        default_left=np.ones(len(left), dtype=bool),
+        roots=np.array([0], dtype=np.int32),
+        base_score=0.25,
+    )
+
+
+def _cond_expectation(t: TreeEnsemble, x: np.ndarray, S: set, node: int = 0) -> float:
+    if t.children_left[node] < 0:
+        return t.value[node]
+    left, right = t.children_left[node], t.children_right[node]
+    if t.feature[node] in S:
+        return _cond_expectation(t, x, S, left if x[t.feature[node]] <= t.threshold[node] else right)
+    return (
+        t.cover[left] * _cond_expectation(t, x, S, left) + t.cover[right] * _cond_expectation(t, x, S, right)
+    ) / t.cover[node]
+
+
+def _brute_force_shap(t: TreeEnsemble, x: np.ndarray) -> np.ndarray:
+    m = len(t.feature_names)
+    phi = np.zeros(m)
+    for i in range(m):
+        others = [j for j in range(m) if j != i]
+        for size in range(m):
+            weight = factorial(size) * factorial(m - size - 1) / factorial(m)
+            for S in combinations(others, size):
+                S = set(S)
+                phi[i] += weight * (_cond_expectation(t, x, S | {i}) - _cond_expectation(t, x, S))
+    return phi
+
+
+def test_tree_shap_matches_brute_force_shapley():
+    t = _tree()
+    X = np.random.default_rng(0).uniform(0, 1, size=(25, 4))
+
+    phi, base = tree_shap(t, X)
+
+    expected = np.array([_brute_force_shap(t, x) for x in X])
+    np.testing.assert_allclose(phi, expected, atol=1e-10)
+    np.testing.assert_allclose(phi.sum(axis=1) + base, t.decision_function(X), atol=1e-10)
+
+
+def test_linear_shap_is_additive_in_margin():
+    model = LinearModel(
+        feature_names=["a", "b", "c"],
+        coef=np.array([0.5, -2.0, 1.0]),
+        intercept=0.1,
+        feature_mean=np.array([1.0, 0.2, 3.0]),
+        link="logit",
+    )
+    X = np.array([[2.0, 0.0, 3.0], [np.nan, 1.0, 0.0]])
+
+    phi, base = linear_shap(model, X)
+
+    np.testing.assert_allclose(phi.sum(axis=1) + base, model.decision_function(X))
+    assert phi[1, 0] == 0.0  # ausente => se imputa la media => sin contribución
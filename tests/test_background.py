@@ -0,0 +1,43 @@
+import numpy as np
+
+from app.services.attribution import LinearModel
+from app.services.background import SUMMARY_POINTS, background_for, summarize_background
+from app.services.model_registry import ModelRegistry
+
+
+def _data(n: int = 5000) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return np.column_stack([rng.normal(1500, 400, n), rng.poisson(1.5, n), rng.uniform(0, 1, n)])
+
+
+def test_kmeans_summary_keeps_weighted_mean():
+    X = _data()
+    summary = summarize_background(X, method="kmeans", size=50, rng=np.random.default_rng(1))
+
+    assert summary.points.shape[0] <= 50
+    np.testing.assert_allclose(summary.weights.sum(), 1.0)
+    np.testing.assert_allclose(summary.weights @ summary.points, X.mean(axis=0), rtol=1e-9)
+
+
+def test_stratified_summary_covers_every_score_stratum():
+    X = _data()
+    score = X[:, 1]
+    summary = summarize_background(
+        X, method="stratified", size=40, rng=np.random.default_rng(1), predict=lambda X: X[:, 1]
+    )
+
+    np.testing.assert_allclose(summary.weights.sum(), 1.0)
+    assert abs(summary.weights @ summary.points[:, 1] - score.mean()) < 0.1
+
+
+def test_summary_is_computed_once_and_stored_with_the_model(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    model = LinearModel(["a", "b", "c"], np.array([0.001, -0.5, 1.0]), 0.0, np.zeros(3), "logit")
+    registry.register("credit", "1", model, arrays={"background": _data(2000)})
+
+    points, weights = background_for(registry, "credit", "1", size=20)
+
+    other = ModelRegistry(tmp_path)  # otro proceso: lo lee del disco
+    loaded = other.get("credit", "1")
+    np.testing.assert_array_equal(loaded.arrays[SUMMARY_POINTS], points)
+    assert background_for(other, "credit", "1")[0].shape == points.shape
@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+
+from app.core.cache import TTLCache
+from app.main import app
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_and_counts():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=30, clock=clock)
+
+    assert cache.get("k") is None
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+
+    clock.now = 31
+    assert cache.get("k") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+
+
+def test_ttl_cache_evicts_lru_and_invalidates():
+    cache = TTLCache(max_size=2, ttl_seconds=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats.evictions == 1
+
+    assert cache.invalidate_where(lambda k, v: v == 1) == 1
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_zero_ttl_disables_caching():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=0, clock=clock)
+    cache.set("k", "v")
+    assert cache.get("k") is None and len(cache) == 0
+
+    forever = TTLCache(max_size=10, ttl_seconds=None, clock=clock)
+    forever.set("k", "v")
+    clock.now = 10**9
+    assert forever.get("k") == "v"
+
+
+def test_cache_stats_endpoint_reports_api_key_hits():
+    client = TestClient(app)
+    headers = {"X-API-Key": "dev-secret"}
+    client.get("/v1/me", headers=headers)
+    before = client.get("/v1/stats/caches", headers=headers).json()["api_keys"]
+    client.get("/v1/me", headers=headers)
+    after = client.get("/v1/stats/caches", headers=headers).json()["api_keys"]
+
+    # /v1/me y el propio /v1/stats/caches: dos aciertos más
+    assert after["hits"] == before["hits"] + 2 and after["misses"] == before["misses"]
+    assert {"hit_rate", "evictions", "size", "max_size"} <= set(after)
@@ -0,0 +1,69 @@
+import numpy as np
+
+from app.services.attribution import LinearModel
+from app.services.counterfactual import FeatureSpace, search_counterfactuals
+
+
+def _setup():
+    rng = np.random.default_rng(0)
+    n = 2000
+    background = np.column_stack(
+        [rng.normal(1500, 400, n), rng.poisson(1.5, n), rng.uniform(0, 1, n), rng.normal(40, 10, n)]
+    )
+    model = LinearModel(
+        feature_names=["income", "late_payments_12m", "utilization", "age"],
+        coef=np.array([0.002, -0.8, -1.0, 0.05]),
+        intercept=-4.0,
+        feature_mean=background.mean(axis=0),
+        link="logit",
+    )
+    return model, background
+
+
+def test_finds_minimal_changes_that_flip_the_decision():
+    model, background = _setup()
+    space = FeatureSpace.from_background(background, mutable=np.array([True, True, True, False]))
+    x = np.array([1200.0, 3.0, 0.7, 35.0])
+
+    res = search_counterfactuals(
+        model.predict,
+        x,
+        space,
+        threshold=0.5,
+        max_features=2,
+        max_results=3,
+        batch_size=1024,
+        time_limit=5.0,
+        rng=np.random.default_rng(0),
+    )
+
+    assert res.prediction < 0.5 and res.counterfactuals
+    costs = [cf.cost for cf in res.counterfactuals]
+    assert costs == sorted(costs)
+    for cf in res.counterfactuals:
+        assert cf.prediction >= 0.5
+        changed = {j for j, _, _ in cf.changes}
+        assert 3 not in changed and len(changed) <= 2
+        # Las features enteras (impagos) se proponen enteras
+        assert all(float(v).is_integer() for j, _, v in cf.changes if j == 1)
+        cand = x.copy()
+        for j, _, v in cf.changes:
+            cand[j] = v
+        assert model.predict(cand[None, :])[0] >= 0.5
+
+
+def test_respects_time_limit():
+    model, background = _setup()
+    space = FeatureSpace.from_background(background)
+    res = search_counterfactuals(
+        model.predict,
+        np.array([1200.0, 3.0, 0.7, 35.0]),
+        space,
+        threshold=0.999999,
+        max_features=4,
+        max_results=3,
+        batch_size=256,
+        time_limit=0.0,
+        rng=np.random.default_rng(0),
+    )
+    assert res.timed_out and res.counterfactuals == []
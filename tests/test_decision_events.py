@@ -0,0 +1,86 @@
+import json
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.crud.decision_events import create_events_bulk
+from app.db.session import SessionLocal
+
+client = TestClient(app)
+HEADERS = {"X-API-Key": "dev-secret"}
+
+
+def _event(idempotency_key: str) -> dict:
+    return {
+        "decision_id": f"dec_{idempotency_key}",
+        "occurred_at": "2026-02-12T20:00:00Z",
+        "model": {"model_id": "m1", "model_version": "1.0.0"},
+        "input_features": {"income": 1200, "late_payments_12m": 2},
+        "model_output": {"score": 0.31},
+        "final_decision": {"label": "denied"},
+        "idempotency_key": idempotency_key,
+    }
+
+
+def test_batch_returns_results_in_input_order():
+    a, b = str(uuid.uuid4()), str(uuid.uuid4())
+    first = client.post("/v1/decision-events", headers=HEADERS, json=_event(a))
+    assert first.status_code == 200
+
+    r = client.post("/v1/decision-events:batch", headers=HEADERS, json={"items": [_event(b), _event(a), _event(b)]})
+    assert r.status_code == 200
+    items = r.json()["items"]
+
+    assert [i["created"] for i in items] == [True, False, False]
+    assert items[1]["event_id"] == first.json()["event_id"]
+    assert items[0]["event_id"] == items[2]["event_id"]
+
+
+def test_stream_reports_progress_and_line_errors():
+    key = str(uuid.uuid4())
+    body = "\n".join([json.dumps(_event(key)), "{not json", json.dumps(_event(key))]) + "\n"
+
+    r = client.post("/v1/decision-events:stream", headers=HEADERS, content=body.encode())
+    assert r.status_code == 200
+    lines = [json.loads(line) for line in r.text.splitlines()]
+
+    assert [e["line"] for e in lines if e["type"] == "error"] == [2]
+    assert lines[-1] == {"type": "done", "lines": 3, "created": 1, "existing": 1, "errors": 1}
+
+
+def test_retried_post_returns_existing_event():
+    key = str(uuid.uuid4())
+    first = client.post("/v1/decision-events", headers=HEADERS, json=_event(key)).json()
+    retry = client.post("/v1/decision-events", headers=HEADERS, json=_event(key)).json()
+
+    assert first["created"] is True
+    assert retry == {"event_id": first["event_id"], "created": False}
+
+
+def test_concurrent_posts_with_same_key_create_one_event():
+    key = str(uuid.uuid4())
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(lambda _: client.post("/v1/decision-events", headers=HEADERS, json=_event(key)), range(16)))
+
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.json()["event_id"] for r in responses}) == 1
+    assert sum(r.json()["created"] for r in responses) == 1
+
+
+def test_concurrent_overlapping_bulk_inserts_do_not_deadlock():
+    keys = [str(uuid.uuid4()) for _ in range(200)]
+
+    def insert(seed: int) -> list[tuple[str, bool]]:
+        shuffled = random.Random(seed).sample(keys, len(keys))
+        with SessionLocal() as db:
+            results = create_events_bulk(db, tenant_id="t1", payloads=[_event(k) for k in shuffled])
+        return sorted(zip(shuffled, results))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        runs = list(pool.map(insert, range(8)))
+
+    # Todas las llamadas ven el mismo id por clave y cada evento se crea una sola vez
+    assert all([event_id for _, (event_id, _) in run] == [event_id for _, (event_id, _) in runs[0]] for run in runs)
+    assert sum(created for run in runs for _, (_, created) in run) == len(keys)
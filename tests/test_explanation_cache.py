@@ -0,0 +1,94 @@
+import uuid
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, update
+
+from app.main import app
+from app.crud.explanation_cache import cache_key, get_cached_evidence, input_fingerprint, prune, put_many
+from app.db.session import SessionLocal
+from app.models.explanation_cache import ExplanationCacheEntry
+
+client = TestClient(app)
+HEADERS = {"X-API-Key": "dev-secret"}
+
+
+def test_fingerprint_ignores_key_order_and_integral_floats():
+    assert input_fingerprint({"income": 1200, "age": 40.0}) == input_fingerprint({"age": 40, "income": 1200.0})
+    assert input_fingerprint({"income": 1200}) != input_fingerprint({"income": 1200.5})
+
+
+def test_cache_key_is_scoped_by_tenant_and_model_version():
+    base = dict(model_id="m1", model_version="1.0.0", method="stub", input_features={"income": 1200})
+    assert cache_key(tenant_id="t1", **base) != cache_key(tenant_id="t2", **base)
+    assert cache_key(tenant_id="t1", **base) != cache_key(tenant_id="t1", **{**base, "model_version": "1.0.1"})
+
+
+def _entry(key: str, **extra) -> dict:
+    return {"key": key, "tenant_id": "t1", "model_id": "m1", "model_version": "1.0.0", "method": "stub", **extra}
+
+
+def _decision_event(features: dict) -> str:
+    key = str(uuid.uuid4())
+    payload = {
+        "decision_id": f"dec_{key}",
+        "occurred_at": "2026-02-12T20:00:00Z",
+        "model": {"model_id": "m1", "model_version": "1.0.0"},
+        "input_features": features,
+        "model_output": {"score": 0.31},
+        "final_decision": {"label": "denied"},
+        "idempotency_key": key,
+    }
+    return client.post("/v1/decision-events", headers=HEADERS, json=payload).json()["event_id"]
+
+
+def test_put_many_keeps_first_evidence_and_lookup_does_not_count():
+    key = uuid.uuid4().hex
+    with SessionLocal() as db:
+        assert get_cached_evidence(db, key=key) is None
+        put_many(db, entries=[_entry(key, evidence={"v": 1}), _entry(uuid.uuid4().hex, evidence={})])
+        put_many(db, entries=[_entry(key, evidence={"v": 2})])  # conflicto: se queda la primera
+        assert get_cached_evidence(db, key=key) == {"v": 1}
+        assert db.get(ExplanationCacheEntry, key).hit_count == 0
+
+
+def test_hit_is_counted_only_when_cached_evidence_is_used():
+    features = {"income": 1200, "nonce": uuid.uuid4().hex}
+    first, second = _decision_event(features), _decision_event(features)
+    key = cache_key(tenant_id="t1", model_id="m1", model_version="1.0.0", method="stub", input_features=features)
+
+    stats = client.get("/v1/stats/caches", headers=HEADERS).json()["explanation_cache"]
+    r = client.post("/v1/explanations", headers=HEADERS, params={"decision_event_id": first})
+    assert r.json()["status"] == "PENDING"
+    with SessionLocal() as db:
+        put_many(db, entries=[_entry(key, evidence={"type": "stub", "main_factors": []})])
+
+    # Misma decisión: se devuelve la explicación existente y la evidencia cacheada se descarta
+    again = client.post("/v1/explanations", headers=HEADERS, params={"decision_event_id": first}).json()
+    assert again["explanation_id"] == r.json()["explanation_id"] and not again["created"]
+    hit = client.post("/v1/explanations", headers=HEADERS, params={"decision_event_id": second}).json()
+    assert hit["created"] and hit["status"] == "DONE"
+    with SessionLocal() as db:
+        assert db.get(ExplanationCacheEntry, key).hit_count == 1
+    # El contador del proceso cuenta lo mismo que hit_count: la búsqueda descartada no es acierto
+    after = client.get("/v1/stats/caches", headers=HEADERS).json()["explanation_cache"]
+    assert (after["hits"], after["misses"]) == (stats["hits"] + 1, stats["misses"] + 1)
+
+
+def test_prune_keeps_most_recently_hit_entries():
+    keys = [uuid.uuid4().hex for _ in range(3)]
+    with SessionLocal() as db:
+        put_many(db, entries=[_entry(k, evidence={}) for k in keys])
+        future = db.execute(select(func.max(ExplanationCacheEntry.last_hit_at))).scalar() + timedelta(days=1)
+        for i, k in enumerate(keys):
+            # Por delante de cualquier otra entrada de la tabla: las nuestras son las más recientes
+            db.execute(
+                update(ExplanationCacheEntry)
+                .where(ExplanationCacheEntry.key == k)
+                .values(last_hit_at=future + timedelta(minutes=i))
+            )
+        db.commit()
+
+        assert prune(db, max_entries=2) >= 1
+        assert [k for k in keys if db.get(ExplanationCacheEntry, k)] == keys[1:]
+        assert prune(db, max_entries=2) == 0
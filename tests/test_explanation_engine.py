@@ -0,0 +1,20 @@
+import numpy as np
+
+from app.services.explanation_engine import build_feature_matrix, main_factors_from_attributions
+
+
+def test_feature_matrix_aligns_columns_and_marks_missing():
+    fm = build_feature_matrix([{"income": 1000, "late": True}, {"income": "n/a", "age": 40}])
+
+    assert fm.feature_names == ["age", "income", "late"]
+    assert np.isnan(fm.X[0, 0]) and fm.X[0, 2] == 1.0
+    assert np.isnan(fm.X[1, 1]) and fm.X[1, 0] == 40.0
+
+
+def test_main_factors_sorted_by_absolute_attribution():
+    attributions = np.array([[0.3, -0.6, 0.0], [0.1, 0.05, -0.2]])
+    factors = main_factors_from_attributions(attributions, ["income", "late", "age"], top_k=2)
+
+    assert [f["feature"] for f in factors[0]] == ["late", "income"]
+    assert factors[0][0] == {"feature": "late", "direction": "negative", "importance": 0.6}
+    assert [f["feature"] for f in factors[1]] == ["age", "income"]
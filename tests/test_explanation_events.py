@@ -0,0 +1,88 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.main import app
+from app.crud.explanations import create_or_get_explanation, set_done, set_running
+from app.db.session import SessionLocal, engine
+from app.services.explanation_events import status_hub
+
+client = TestClient(app)
+HEADERS = {"X-API-Key": "dev-secret"}
+
+
+def _decision_event() -> str:
+    key = str(uuid.uuid4())
+    payload = {
+        "decision_id": f"dec_{key}",
+        "occurred_at": "2026-02-12T20:00:00Z",
+        "model": {"model_id": "m1", "model_version": "1.0.0"},
+        "input_features": {"income": 1200},
+        "model_output": {"score": 0.31},
+        "final_decision": {"label": "denied"},
+        "idempotency_key": key,
+    }
+    return client.post("/v1/decision-events", headers=HEADERS, json=payload).json()["event_id"]
+
+
+def test_status_stream_pushes_transitions_until_terminal():
+    with SessionLocal() as db:
+        expl_id, _, _ = create_or_get_explanation(db, tenant_id="t1", decision_event_id=_decision_event())
+
+    def worker():
+        time.sleep(0.5)
+        with SessionLocal() as db:
+            set_running(db, tenant_id="t1", explanation_id=expl_id)
+            set_done(db, tenant_id="t1", explanation_id=expl_id, evidence={"type": "stub"})
+
+    threading.Thread(target=worker).start()
+    with client.stream("GET", "/v1/explanations/events", headers=HEADERS, params={"ids": expl_id}) as r:
+        assert r.status_code == 200
+        data = [json.loads(line[5:]) for line in r.iter_lines() if line.startswith("data:")]
+
+    assert [d["status"] for d in data[:-1]] == ["PENDING", "RUNNING", "DONE"]
+    assert data[-1] == {"explanation_ids": [expl_id]}
+
+
+def test_status_stream_rejects_unknown_ids():
+    r = client.get("/v1/explanations/events", headers=HEADERS, params={"ids": str(uuid.uuid4())})
+    assert r.status_code == 404
+
+
+def _listener_pid() -> int | None:
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT pid FROM pg_stat_activity WHERE query = :q AND datname = current_database()"),
+            {"q": f"LISTEN {status_hub.channel}"},
+        ).scalar()
+
+
+def test_status_hub_resyncs_subscribers_after_reconnect():
+    with SessionLocal() as db:
+        expl_id, _, _ = create_or_get_explanation(db, tenant_id="t1", decision_event_id=_decision_event())
+
+    async def scenario() -> list[str]:
+        queue = status_hub.subscribe([expl_id])
+        try:
+            deadline = time.monotonic() + 5
+            while (pid := _listener_pid()) is None:
+                assert time.monotonic() < deadline, "listener never connected"
+                await asyncio.sleep(0.05)
+            with engine.connect() as conn:
+                # Con timeout: vuelve cuando el backend ya ha salido, así el NOTIFY no le llega
+                assert conn.execute(text("SELECT pg_terminate_backend(:pid, 5000)"), {"pid": pid}).scalar()
+            with SessionLocal() as db:
+                set_done(db, tenant_id="t1", explanation_id=expl_id, evidence={"type": "stub"})
+
+            seen = []
+            while "DONE" not in seen:
+                seen.append((await asyncio.wait_for(queue.get(), timeout=10))["status"])
+            return seen
+        finally:
+            status_hub.unsubscribe([expl_id], queue)
+
+    assert asyncio.run(scenario())[-1] == "DONE"
@@ -0,0 +1,123 @@
+import uuid
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from app.main import app
+from sqlalchemy import update
+
+from app.crud.explanations import claim_pending, heartbeat, reclaim_stale, set_done_many, set_failed
+from app.db.session import SessionLocal
+from app.models.explanation import Explanation
+
+client = TestClient(app)
+HEADERS = {"X-API-Key": "dev-secret"}
+
+
+def _decision_event() -> str:
+    key = str(uuid.uuid4())
+    payload = {
+        "decision_id": f"dec_{key}",
+        "occurred_at": "2026-02-12T20:00:00Z",
+        "model": {"model_id": "m_single_flight", "model_version": "1.0.0"},
+        "input_features": {"income": 1200, "nonce": key},
+        "model_output": {"score": 0.31},
+        "final_decision": {"label": "denied"},
+        "idempotency_key": key,
+    }
+    return client.post("/v1/decision-events", headers=HEADERS, json=payload).json()["event_id"]
+
+
+def _request(event_id: str, method: str = "stub") -> dict:
+    r = client.post("/v1/explanations", headers=HEADERS, params={"decision_event_id": event_id, "method": method})
+    assert r.status_code == 202
+    return r.json()
+
+
+def test_concurrent_requests_share_one_explanation():
+    event_id = _decision_event()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: _request(event_id), range(16)))
+
+    assert len({r["explanation_id"] for r in results}) == 1
+    assert sum(r["created"] for r in results) == 1
+    # Otro método es otra explicación
+    assert _request(event_id, method="exact")["explanation_id"] != results[0]["explanation_id"]
+
+
+def test_failed_explanation_can_be_requested_again():
+    event_id = _decision_event()
+    first = _request(event_id)
+    with SessionLocal() as db:
+        set_failed(db, tenant_id="t1", explanation_id=first["explanation_id"], error="boom")
+
+    retry = _request(event_id)
+    assert retry["created"] and retry["explanation_id"] != first["explanation_id"]
+
+
+def _claim(db, worker_id: str, explanation_id: str):
+    # La cola es compartida con el resto de tests: se reclama todo lo pendiente y se busca el nuestro
+    rows = claim_pending(db, worker_id=worker_id, limit=10_000)
+    return next((r for r in rows if r.id == explanation_id), None)
+
+
+def _age_lock(db, explanation_id: str, **values) -> None:
+    db.execute(
+        update(Explanation)
+        .where(Explanation.id == explanation_id)
+        .values(locked_at=Explanation.locked_at - timedelta(hours=1), **values)
+    )
+    db.commit()
+
+
+def _job(db, explanation_id: str) -> Explanation:
+    db.expire_all()
+    return db.get(Explanation, explanation_id)
+
+
+def test_reclaimed_job_is_only_completed_by_its_new_owner():
+    eid = _request(_decision_event())["explanation_id"]
+    w1, w2 = f"w1-{uuid.uuid4().hex[:8]}", f"w2-{uuid.uuid4().hex[:8]}"
+    with SessionLocal() as db:
+        assert _claim(db, w1, eid) is not None
+        assert _claim(db, w2, eid) is None  # ya es de w1
+        job = _job(db, eid)
+        assert (job.status, job.locked_by, job.attempts) == ("RUNNING", w1, 1)
+
+        _age_lock(db, eid)
+        assert reclaim_stale(db, stale_after_seconds=60, max_attempts=3) >= 1
+        assert _job(db, eid).status == "PENDING"
+        assert _claim(db, w2, eid) is not None
+        assert (_job(db, eid).locked_by, _job(db, eid).attempts) == (w2, 2)
+
+        # w1 termina tarde: no pisa el job que ahora es de w2
+        assert set_done_many(db, worker_id=w1, results=[("t1", eid, {"type": "stub", "by": w1})]) == set()
+        set_failed(db, tenant_id="t1", explanation_id=eid, error="late", worker_id=w1)
+        assert _job(db, eid).status == "RUNNING"
+
+        assert set_done_many(db, worker_id=w2, results=[("t1", eid, {"type": "stub", "by": w2})]) == {eid}
+        job = _job(db, eid)
+        assert job.status == "DONE" and job.evidence["by"] == w2
+
+
+def test_heartbeat_keeps_long_batches_from_being_reclaimed():
+    eid = _request(_decision_event())["explanation_id"]
+    worker = f"w-{uuid.uuid4().hex[:8]}"
+    with SessionLocal() as db:
+        assert _claim(db, worker, eid) is not None
+        _age_lock(db, eid)
+        heartbeat(db, worker_id="someone-else", explanation_ids=[eid])
+        heartbeat(db, worker_id=worker, explanation_ids=[eid])
+        reclaim_stale(db, stale_after_seconds=60, max_attempts=3)
+        assert _job(db, eid).status == "RUNNING"
+
+
+def test_reclaim_fails_jobs_that_exhausted_their_attempts():
+    eid = _request(_decision_event())["explanation_id"]
+    with SessionLocal() as db:
+        assert _claim(db, f"w-{uuid.uuid4().hex[:8]}", eid) is not None
+        _age_lock(db, eid, attempts=3)
+        reclaim_stale(db, stale_after_seconds=60, max_attempts=3)
+        job = _job(db, eid)
+        assert job.status == "FAILED" and job.error == "Worker lost the job too many times"
+        assert job.locked_by is None
@@ -0,0 +1,92 @@
+import uuid
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.security import hash_api_key
+from app.crud import global_explanations as crud
+from app.db.session import SessionLocal
+from app.models.api_client import ApiClient
+from app.services.attribution import LinearModel
+from app.services.global_explanations import compute_missing, partial_dependence
+from app.services.model_registry import ModelRegistry
+
+client = TestClient(app)
+HEADERS = {"X-API-Key": "dev-secret"}
+
+
+def _linear() -> LinearModel:
+    return LinearModel(["a", "b"], np.array([2.0, -1.0]), 0.5, np.zeros(2))
+
+
+def test_partial_dependence_of_linear_model_is_its_slope():
+    rng = np.random.default_rng(0)
+    background = np.column_stack([rng.normal(size=200), rng.integers(0, 3, 200)])
+
+    curves = partial_dependence(_linear().predict, background, ["a", "b"], grid_size=10, ice_curves=5)
+
+    a, b = curves["features"]["a"], curves["features"]["b"]
+    assert len(a["grid"]) == 10 and b["grid"] == [0.0, 1.0, 2.0]
+    np.testing.assert_allclose(np.diff(a["pdp"]) / np.diff(a["grid"]), 2.0)
+    assert len(a["ice"]) == 5 and len(a["ice"][0]) == 10
+
+    background[:, 1] = np.nan
+    empty = partial_dependence(_linear().predict, background, ["a", "b"], grid_size=10, ice_curves=5)
+    assert empty["features"]["b"] == {"grid": [], "pdp": [], "ice": []}
+
+
+def _use_model(model_id: str, model_version: str) -> None:
+    payload = {
+        "decision_id": f"dec_{uuid.uuid4().hex}",
+        "occurred_at": "2026-02-12T20:00:00Z",
+        "model": {"model_id": model_id, "model_version": model_version},
+        "input_features": {"a": 1.0, "b": 2.0},
+        "model_output": {"score": 0.31},
+        "final_decision": {"label": "denied"},
+        "idempotency_key": str(uuid.uuid4()),
+    }
+    assert client.post("/v1/decision-events", headers=HEADERS, json=payload).status_code == 200
+
+
+def test_compute_missing_only_processes_new_versions(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    background = {"background": np.random.default_rng(0).normal(size=(50, 2))}
+    model_id = f"m_{uuid.uuid4().hex}"
+    registry.register(model_id, "1", _linear(), arrays=background)
+
+    with SessionLocal() as db:
+        assert compute_missing(db, registry) == 1
+        registry.register(model_id, "2", _linear(), arrays=background)
+        assert compute_missing(db, registry) == 1
+        assert compute_missing(db, registry) == 0
+
+    # Sólo la ve un tenant con decisiones de ese modelo
+    assert client.get(f"/v1/global-explanations/{model_id}/2", headers=HEADERS).status_code == 404
+    _use_model(model_id, "2")
+    r = client.get(f"/v1/global-explanations/{model_id}/2", headers=HEADERS)
+    assert r.status_code == 200
+    assert r.json()["status"] == "DONE"
+    assert set(r.json()["curves"]["features"]) == {"a", "b"}
+
+    other_key = f"other-{uuid.uuid4().hex}"
+    with SessionLocal() as db:
+        db.add(ApiClient(id=str(uuid.uuid4()), tenant_id=f"t_{uuid.uuid4().hex[:8]}", api_key_hash=hash_api_key(other_key)))
+        db.commit()
+    other = client.get(f"/v1/global-explanations/{model_id}/2", headers={"X-API-Key": other_key})
+    assert other.status_code == 404
+
+
+def test_compute_missing_marks_failed_when_set_done_raises(tmp_path, monkeypatch):
+    registry = ModelRegistry(tmp_path)
+    model_id = f"m_{uuid.uuid4().hex}"
+    registry.register(model_id, "1", _linear(), arrays={"background": np.zeros((5, 2))})
+
+    def broken(db, **kwargs):
+        raise RuntimeError("cannot store curves")
+
+    monkeypatch.setattr(crud, "set_done", broken)
+    with SessionLocal() as db:
+        assert compute_missing(db, registry) == 0
+        gex = crud.get_global_explanation(db, model_id=model_id, model_version="1")
+        assert gex.status == "FAILED" and gex.error == "cannot store curves"
@@ -0,0 +1,20 @@
+from app.services.json_delta import apply, diff
+
+
+def test_diff_roundtrip_and_does_not_mutate():
+    old = {"a": 1, "keep": {"x": [1, 2]}, "l": [{"t": "a"}, {"t": "b"}], "gone": True, "f": 1.0}
+    new = {"a": 2, "keep": {"x": [1, 2]}, "l": [{"t": "a"}, {"t": "c", "n": 1}], "added": None, "f": 1}
+    delta = diff(old, new)
+
+    assert apply(old, delta) == new
+    assert type(apply(old, delta)["f"]) is int  # 1.0 -> 1 es un cambio
+    assert ["keep"] not in [path for path, _ in delta["set"]]
+    assert delta["unset"] == [["gone"]]
+    assert old["l"][1] == {"t": "b"}
+
+
+def test_list_length_change_replaces_whole_list():
+    delta = diff({"l": [1, 2]}, {"l": [1, 2, 3]})
+    assert delta == {"set": [[["l"], [1, 2, 3]]]}
+    assert diff({"a": 1}, {"a": 1}) == {}
+    assert apply({"a": 1}, diff({"a": 1}, [1]), diff([1], "x")) == "x"
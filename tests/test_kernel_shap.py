@@ -0,0 +1,67 @@
+import numpy as np
+
+from app.services.attribution import LinearModel
+from app.services.kernel_shap import kernel_shap
+
+
+def _linear(d: int, rng, link: str = "logit") -> LinearModel:
+    return LinearModel(
+        feature_names=[f"x{j}" for j in range(d)],
+        coef=rng.normal(size=d),
+        intercept=0.2,
+        feature_mean=np.zeros(d),
+        link=link,
+    )
+
+
+def test_matches_exact_linear_shap_within_error_bound():
+    rng = np.random.default_rng(0)
+    model = _linear(6, rng, link="identity")
+    background = rng.normal(size=(40, 6))
+    X = rng.normal(size=(5, 6))
+
+    res = kernel_shap(
+        model.predict, X, background, tolerance=0.01, max_samples=4096, batch_size=64, rng=np.random.default_rng(1)
+    )
+    exact = (X - background.mean(axis=0)) * model.coef
+
+    assert res.converged.all()
+    assert np.abs(res.values - exact).max() <= 5 * res.error_bound.max() + 1e-9
+    # Juego aditivo: converge en la primera ronda
+    assert (res.samples_used == 128).all()
+    # Eficiencia: las atribuciones suman f(x) - E[f(background)] exactamente
+    np.testing.assert_allclose(res.values.sum(axis=1) + res.base_value, model.predict(X))
+
+
+def test_stops_early_when_estimates_converge():
+    rng = np.random.default_rng(2)
+    model = _linear(8, rng)
+    background = rng.normal(size=(30, 8))
+    X = rng.normal(size=(4, 8))
+
+    loose = kernel_shap(model.predict, X, background, tolerance=0.05, max_samples=8192, batch_size=32)
+    tight = kernel_shap(model.predict, X, background, tolerance=1e-6, max_samples=1024, batch_size=32)
+
+    assert loose.converged.all() and (loose.samples_used < 8192).all()
+    assert not tight.converged.any() and (tight.samples_used >= 1024).all()
+    assert (tight.error_bound < np.inf).all()
+
+
+def test_coalition_values_are_evaluated_in_bounded_chunks():
+    rng = np.random.default_rng(3)
+    model = _linear(5, rng)
+    background = rng.normal(size=(20, 5))
+    X = rng.normal(size=(6, 5))
+    calls = []
+
+    def predict(Z):
+        calls.append(len(Z))
+        return model.predict(Z)
+
+    args = dict(tolerance=1e-6, max_samples=256, batch_size=16)
+    whole = kernel_shap(model.predict, X, background, rng=np.random.default_rng(4), **args)
+    chunked = kernel_shap(predict, X, background, rng=np.random.default_rng(4), max_predict_rows=100, **args)
+
+    assert max(calls) <= 100
+    np.testing.assert_allclose(chunked.values, whole.values)
+    np.testing.assert_array_equal(chunked.samples_used, whole.samples_used)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from app.services.attribution import LinearModel
+from app.services.model_registry import ModelRegistry
+
+
+def _linear(d: int = 3) -> LinearModel:
+    return LinearModel(
+        feature_names=[f"f{i}" for i in range(d)],
+        coef=np.arange(d, dtype=np.float64),
+        intercept=0.5,
+        feature_mean=np.zeros(d),
+        link="logit",
+    )
+
+
+def test_registered_model_loads_memory_mapped(tmp_path):
+    registry = ModelRegistry(tmp_path, max_loaded=2)
+    model = _linear()
+    registry.register("credit", "1.0.0", model, arrays={"background": np.ones((4, 3))})
+
+    loaded = registry.get("credit", "1.0.0")
+
+    assert isinstance(loaded.model.coef, np.memmap)
+    assert loaded.arrays["background"].shape == (4, 3)
+    X = np.array([[1.0, 2.0, 3.0]])
+    np.testing.assert_allclose(loaded.model.predict(X), model.predict(X))
+    assert registry.get("credit", "1.0.0") is loaded
+    assert registry.list_versions() == [("credit", "1.0.0")]
+
+    # Un register a medio escribir (o interrumpido) deja ".<version>.XXXX" con su manifest
+    leftover = tmp_path / "credit" / ".2.0.0.abc123"
+    leftover.mkdir()
+    (leftover / "manifest.json").write_text("{}")
+    assert registry.list_versions() == [("credit", "1.0.0")]
+
+
+def test_registry_evicts_lru_and_rejects_bad_ids(tmp_path):
+    registry = ModelRegistry(tmp_path, max_loaded=1)
+    registry.register("credit", "1", _linear())
+    registry.register("credit", "2", _linear())
+
+    registry.get("credit", "1")
+    registry.get("credit", "2")
+    assert registry.stats()["evictions"] == 1
+
+    with pytest.raises(FileExistsError):
+        registry.register("credit", "1", _linear())
+    with pytest.raises(ValueError):
+        registry.get("../etc", "1")
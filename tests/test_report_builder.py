@@ -21,3 +21,50 @@ def test_report_builder_fills_sections_and_evidence():
     rpt = build_report_schema_v1(template_id="generic_v1", de=de, ex=ex)
     assert len(rpt.sections) > 0
     assert len(rpt.evidence_items) > 0
+
+
+def test_report_builder_renders_recourse_section_for_counterfactuals():
+    de = SimpleNamespace(
+        id="de_1",
+        decision_id="dec_1",
+        occurred_at="2026-02-12T20:00:00Z",
+        model_id="m1",
+        model_version="1.0.0",
+        final_decision={"label": "denied"},
+    )
+    ex = SimpleNamespace(
+        id="ex_1",
+        evidence={
+            "type": "counterfactual",
+            "main_factors": [],
+            "counterfactuals": [
+                {
+                    "changes": [{"feature": "late_payments_12m", "current": 3.0, "suggested": 0.0}],
+                    "cost": 2.1,
+                    "prediction": 0.52,
+                }
+            ],
+        },
+    )
+
+    rpt = build_report_schema_v1(template_id="generic_v1", de=de, ex=ex)
+    recourse = next(s for s in rpt.sections if s.id == "recourse")
+    assert recourse.blocks[0].items[0].text == "late_payments_12m: 3 → 0"
+    assert [e.kind for e in rpt.evidence_items] == ["counterfactual"]
+    assert rpt.explanation.counterfactuals[0].changes[0].suggested == 0.0
+
+
+def test_report_builder_references_global_explanation_without_copying_curves():
+    de = SimpleNamespace(
+        id="de_1",
+        decision_id="dec_1",
+        occurred_at="2026-02-12T20:00:00Z",
+        model_id="m1",
+        model_version="1.0.0",
+        final_decision={"label": "denied"},
+    )
+    ex = SimpleNamespace(id="ex_1", evidence={"type": "stub", "main_factors": []})
+
+    rpt = build_report_schema_v1(template_id="generic_v1", de=de, ex=ex, global_explanation_id="gex_1")
+    assert rpt.global_explanation_ref.href == "/v1/global-explanations/m1/1.0.0"
+    assert build_report_schema_v1(template_id="generic_v1", de=de, ex=ex).global_explanation_ref is None
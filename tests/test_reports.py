@@ -0,0 +1,362 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from app.main import app
+from app.crud.explanations import create_or_get_explanation, set_done, set_running
+from app.db.session import SessionLocal
+from app.crud.report_revisions import get_revision_json, revision_bytes_cache
+from app.crud.reports import report_bytes_cache
+from app.models.report import Report
+from app.models.report_revision import ReportRevision
+from app.core.config import settings
+
+client = TestClient(app)
+HEADERS = {"X-API-Key": "dev-secret"}
+EVIDENCE = {
+    "type": "stub",
+    "main_factors": [{"feature": "late_payments_12m", "direction": "negative", "importance": 0.6}],
+}
+
+
+def _decision_event() -> str:
+    key = str(uuid.uuid4())
+    payload = {
+        "decision_id": f"dec_{key}",
+        "occurred_at": "2026-02-12T20:00:00Z",
+        "model": {"model_id": "m1", "model_version": "1.0.0"},
+        "input_features": {"income": 1200},
+        "model_output": {"score": 0.31},
+        "final_decision": {"label": "denied"},
+        "idempotency_key": key,
+    }
+    return client.post("/v1/decision-events", headers=HEADERS, json=payload).json()["event_id"]
+
+
+def _explanation(event_id: str, *, done: bool = True, method: str = "stub") -> str:
+    with SessionLocal() as db:
+        expl_id, _, _ = create_or_get_explanation(db, tenant_id="t1", decision_event_id=event_id, method=method)
+        if done:
+            set_running(db, tenant_id="t1", explanation_id=expl_id)
+            set_done(db, tenant_id="t1", explanation_id=expl_id, evidence=EVIDENCE)
+    return expl_id
+
+
+def test_bulk_create_reports_per_item_results():
+    ev1, ev2, ev3 = _decision_event(), _decision_event(), _decision_event()
+    ex1, ex2, ex3 = _explanation(ev1), _explanation(ev2), _explanation(ev3, done=False)
+
+    existing = client.post(
+        "/v1/reports", headers=HEADERS, json={"decision_event_id": ev2, "explanation_id": ex2}
+    ).json()["report_id"]
+
+    items = [
+        {"decision_event_id": ev1, "explanation_id": ex1},
+        {"decision_event_id": ev2, "explanation_id": ex2},
+        {"decision_event_id": str(uuid.uuid4()), "explanation_id": ex1},
+        {"decision_event_id": ev3, "explanation_id": ex3},
+        {"decision_event_id": ev1, "explanation_id": ex1},
+    ]
+    r = client.post("/v1/reports:bulk", headers=HEADERS, json={"items": items})
+    assert r.status_code == 200
+    body = r.json()
+
+    assert [i["status_code"] for i in body["items"]] == [201, 200, 404, 409, 200]
+    assert body["items"][1]["report_id"] == existing
+    assert body["items"][4]["report_id"] == body["items"][0]["report_id"]
+    assert (body["created"], body["existing"], body["failed"]) == (1, 2, 2)
+
+    created = client.get(f"/v1/reports/{body['items'][0]['report_id']}", headers=HEADERS).json()
+    assert created["version"] == 1 and created["status"] == "DRAFT"
+
+    # Repetir el lote no crea nada nuevo
+    again = client.post("/v1/reports:bulk", headers=HEADERS, json={"items": items[:2]}).json()
+    assert [i["status_code"] for i in again["items"]] == [200, 200]
+    assert again["items"][0]["report_id"] == body["items"][0]["report_id"]
+
+
+def _pages(url: str, params: dict) -> list[dict]:
+    pages, cursor = [], None
+    while True:
+        r = client.get(url, headers=HEADERS, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert r.status_code == 200
+        pages.append(r.json())
+        cursor = pages[-1]["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_report_list_cursor_walks_every_row_once():
+    event_id = _decision_event()
+    # Creados en el mismo lote: mismo created_at, el id desempata
+    items = [
+        {"decision_event_id": event_id, "explanation_id": _explanation(event_id, method=m)}
+        for m in ("stub", "exact", "kernel_shap")
+    ]
+    created = client.post("/v1/reports:bulk", headers=HEADERS, json={"items": items}).json()
+
+    pages = _pages("/v1/reports", {"decision_event_id": event_id, "limit": 2})
+    assert [len(p["items"]) for p in pages] == [2, 1]
+    assert pages[0]["total"] is None
+    seen = [i["report_id"] for p in pages for i in p["items"]]
+    assert sorted(seen) == sorted(i["report_id"] for i in created["items"])
+    # Campos del evento copiados al report al crearlo
+    first = pages[0]["items"][0]
+    assert first["decision_id"].startswith("dec_") and first["decision_label"] == "denied"
+    assert first["occurred_at"].startswith("2026-02-12T20:00:00")
+
+    with_total = client.get(
+        "/v1/reports", headers=HEADERS, params={"decision_event_id": event_id, "include_total": True}
+    ).json()
+    assert with_total["total"] == 3
+
+
+def test_revision_list_cursor():
+    event_id = _decision_event()
+    report_id = client.post(
+        "/v1/reports", headers=HEADERS, json={"decision_event_id": event_id, "explanation_id": _explanation(event_id)}
+    ).json()["report_id"]
+    for version in (1, 2, 3):
+        r = client.patch(f"/v1/reports/{report_id}", headers=HEADERS, json={"expected_version": version})
+        assert r.status_code == 200
+
+    pages = _pages(f"/v1/reports/{report_id}/revisions", {"limit": 3})
+    assert [i["version"] for p in pages for i in p["items"]] == [4, 3, 2, 1]
+
+    bad = client.get(f"/v1/reports/{report_id}/revisions", headers=HEADERS, params={"cursor": "nope"})
+    assert bad.status_code == 400
+
+    # Clientes que aún paginan con offset: error explícito en vez de la primera página en bucle
+    for url in (f"/v1/reports/{report_id}/revisions", "/v1/reports"):
+        r = client.get(url, headers=HEADERS, params={"offset": 20})
+        assert r.status_code == 400 and "cursor" in r.json()["detail"]
+
+
+def test_report_read_trusts_fingerprint_of_current_schema():
+    event_id = _decision_event()
+    report_id = client.post(
+        "/v1/reports", headers=HEADERS, json={"decision_event_id": event_id, "explanation_id": _explanation(event_id)}
+    ).json()["report_id"]
+    with SessionLocal() as db:
+        rpt = db.get(Report, report_id)
+        assert rpt.report_fingerprint == "1.0"
+        stored = dict(rpt.report_json)
+
+        # Report sin sellar: se valida al leer, pero la lectura no escribe nada
+        rpt.report_fingerprint = None
+        db.commit()
+    r = client.get(f"/v1/reports/{report_id}", headers=HEADERS)
+    assert r.status_code == 200 and r.json()["report_json"] == stored
+    with SessionLocal() as db:
+        assert db.get(Report, report_id).report_fingerprint is None
+
+        # Contenido cambiado por fuera con el sello del esquema actual: sólo lo detecta validate=true
+        rpt = db.get(Report, report_id)
+        rpt.report_json = {**stored, "unexpected": True}
+        rpt.report_fingerprint = "1.0"
+        db.commit()
+    report_bytes_cache.clear()
+    assert client.get(f"/v1/reports/{report_id}", headers=HEADERS).status_code == 200
+    assert client.get(f"/v1/reports/{report_id}", headers=HEADERS, params={"validate": True}).status_code == 500
+
+    # Sello de otra versión del esquema: se revalida (en un proceso sin la respuesta cacheada)
+    with SessionLocal() as db:
+        db.get(Report, report_id).report_fingerprint = "0.9"
+        db.commit()
+    report_bytes_cache.clear()
+    assert client.get(f"/v1/reports/{report_id}", headers=HEADERS).status_code == 500
+
+
+def test_report_get_etag_and_conditional_requests():
+    event_id = _decision_event()
+    report_id = client.post(
+        "/v1/reports", headers=HEADERS, json={"decision_event_id": event_id, "explanation_id": _explanation(event_id)}
+    ).json()["report_id"]
+    url = f"/v1/reports/{report_id}"
+
+    first = client.get(url, headers=HEADERS)
+    assert first.headers["etag"] == '"1"' and first.headers["cache-control"] == "private, no-cache"
+    assert client.get(url, headers=HEADERS).content == first.content  # bytes cacheados
+    not_modified = client.get(url, headers={**HEADERS, "If-None-Match": '"1"'})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+
+    client.patch(url, headers=HEADERS, json={"expected_version": 1})
+    changed = client.get(url, headers={**HEADERS, "If-None-Match": '"1"'})
+    assert changed.status_code == 200 and changed.json()["version"] == 2 and changed.headers["etag"] == '"2"'
+
+    client.post(f"{url}/finalize", headers=HEADERS, json={"expected_version": 2})
+    final = client.get(url, headers=HEADERS)
+    assert final.json()["status"] == "FINAL" and "immutable" in final.headers["cache-control"]
+    assert client.get(url, headers={**HEADERS, "If-None-Match": 'W/"0", "3"'}).status_code == 304
+
+    assert client.get("/v1/reports/nope", headers={**HEADERS, "If-None-Match": "*"}).status_code == 404
+
+
+def test_revisions_store_deltas_between_snapshots():
+    event_id = _decision_event()
+    report_id = client.post(
+        "/v1/reports", headers=HEADERS, json={"decision_event_id": event_id, "explanation_id": _explanation(event_id)}
+    ).json()["report_id"]
+    every = settings.REPORT_REVISION_SNAPSHOT_EVERY
+    docs = {1: client.get(f"/v1/reports/{report_id}", headers=HEADERS).json()["report_json"]}
+    for version in range(1, every + 2):
+        sections = [{"id": "notes", "title": "Notas", "blocks": [{"type": "text", "text": f"v{version + 1}"}]}]
+        r = client.patch(
+            f"/v1/reports/{report_id}", headers=HEADERS, json={"expected_version": version, "sections": sections}
+        )
+        docs[version + 1] = r.json()["report_json"]
+
+    with SessionLocal() as db:
+        rows = db.query(ReportRevision).filter_by(report_id=report_id).order_by(ReportRevision.version).all()
+        assert [r.report_json is not None for r in rows] == [v in (1, every + 1) for v in range(1, every + 3)]
+        assert all((r.report_json is None) == (r.delta is not None) for r in rows)
+        for version, doc in docs.items():
+            assert get_revision_json(db, tenant_id="t1", report_id=report_id, version=version) == doc
+        assert get_revision_json(db, tenant_id="t1", report_id=report_id, version=every + 3) is None
+
+
+def test_report_as_of_version_and_timestamp():
+    event_id = _decision_event()
+    url = "/v1/reports/" + client.post(
+        "/v1/reports", headers=HEADERS, json={"decision_event_id": event_id, "explanation_id": _explanation(event_id)}
+    ).json()["report_id"]
+    original = client.get(url, headers=HEADERS).json()["report_json"]
+    sections = [{"id": "notes", "title": "Notas", "blocks": [{"type": "text", "text": "editado"}]}]
+    edited = client.patch(url, headers=HEADERS, json={"expected_version": 1, "sections": sections}).json()
+
+    v1 = client.get(f"{url}/revisions/1", headers=HEADERS)
+    assert v1.status_code == 200 and "immutable" in v1.headers["cache-control"]
+    assert v1.json()["report_json"] == original and v1.json()["action"] == "CREATE"
+    assert client.get(f"{url}/revisions/2", headers=HEADERS).json()["report_json"] == edited["report_json"]
+    assert client.get(f"{url}/revisions/3", headers=HEADERS).status_code == 404
+
+    # Segunda lectura desde la cache: no vuelve a reconstruir ni a validar
+    hits = revision_bytes_cache.stats.hits
+    assert client.get(f"{url}/revisions/1", headers=HEADERS).content == v1.content
+    assert revision_bytes_cache.stats.hits == hits + 1
+
+    created_at = v1.json()["created_at"]
+    as_of = client.get(f"{url}/as-of", headers=HEADERS, params={"at": created_at})
+    assert as_of.json()["version"] == 1 and as_of.headers["cache-control"] == "private, no-cache"
+    assert client.get(f"{url}/as-of", headers=HEADERS, params={"at": "2100-01-01T00:00:00Z"}).json()["version"] == 2
+    assert client.get(f"{url}/as-of", headers=HEADERS, params={"at": "2000-01-01T00:00:00Z"}).status_code == 404
+
+
+def test_patch_by_section_operations():
+    event_id = _decision_event()
+    url = "/v1/reports/" + client.post(
+        "/v1/reports", headers=HEADERS, json={"decision_event_id": event_id, "explanation_id": _explanation(event_id)}
+    ).json()["report_id"]
+    operations = [
+        {"op": "replace", "section_id": "summary", "block_index": 0, "block": {"type": "text", "text": "Denegada."}},
+        {"op": "add", "section_id": "main_factors", "block": {"type": "text", "text": "Nota"}},
+        {"op": "add", "section_id": "notes", "section": {"id": "notes", "title": "Notas", "blocks": []}},
+        {"op": "remove", "section_id": "notes"},
+    ]
+    r = client.patch(url, headers=HEADERS, json={"expected_version": 1, "operations": operations})
+    assert r.status_code == 200 and r.json()["version"] == 2
+    sections = {s["id"]: s for s in r.json()["report_json"]["sections"]}
+    assert sections["summary"]["blocks"][0]["text"] == "Denegada."
+    assert sections["main_factors"]["blocks"][-1]["text"] == "Nota" and "notes" not in sections
+
+    # Lo escrito con jsonb_set es exactamente lo devuelto, con huella válida e historial coherente
+    stored = client.get(url, headers=HEADERS, params={"validate": True})
+    assert stored.status_code == 200 and stored.json()["report_json"] == r.json()["report_json"]
+    assert client.get(f"{url}/revisions/2", headers=HEADERS).json()["report_json"] == r.json()["report_json"]
+
+    bad = [
+        [{"op": "remove", "section_id": "missing"}],
+        [{"op": "remove", "section_id": "summary", "block_index": 5}],
+        [{"op": "add", "section_id": "summary", "section": {"id": "summary", "title": "x"}}],
+        [{"op": "replace", "section_id": "summary", "block": {"type": "text", "text": "sin índice"}}],
+    ]
+    for ops in bad:
+        assert client.patch(url, headers=HEADERS, json={"expected_version": 2, "operations": ops}).status_code == 422
+    stale = client.patch(url, headers=HEADERS, json={"expected_version": 1, "operations": operations[:1]})
+    assert stale.status_code == 409
+
+
+def test_patch_operations_on_unstamped_report_writes_validated_document():
+    event_id = _decision_event()
+    report_id = client.post(
+        "/v1/reports", headers=HEADERS, json={"decision_event_id": event_id, "explanation_id": _explanation(event_id)}
+    ).json()["report_id"]
+    # Sin sello y sin un campo con default: lo guardado no coincide con su versión validada
+    with SessionLocal() as db:
+        rpt = db.get(Report, report_id)
+        rpt.report_json = {k: v for k, v in rpt.report_json.items() if k != "schema_version"}
+        rpt.report_fingerprint = None
+        db.commit()
+
+    operations = [{"op": "add", "section_id": "summary", "block": {"type": "text", "text": "Nota"}}]
+    r = client.patch(f"/v1/reports/{report_id}", headers=HEADERS, json={"expected_version": 1, "operations": operations})
+    assert r.status_code == 200 and r.json()["report_json"]["schema_version"] == "1.0"
+    with SessionLocal() as db:
+        rpt = db.get(Report, report_id)
+        assert rpt.report_fingerprint == "1.0" and rpt.report_json == r.json()["report_json"]
+
+
+def test_concurrent_edits_bump_version_atomically():
+    event_id = _decision_event()
+    url = "/v1/reports/" + client.post(
+        "/v1/reports", headers=HEADERS, json={"decision_event_id": event_id, "explanation_id": _explanation(event_id)}
+    ).json()["report_id"]
+    report_id = url.rsplit("/", 1)[1]
+    workers, rounds = 6, 5
+
+    # Muestrea pg_stat_activity mientras dura la carga: ninguna sesión debe quedar esperando un lock
+    stop, lock_waits = threading.Event(), []
+
+    def watch():
+        with SessionLocal() as db:
+            while not stop.is_set():
+                lock_waits.extend(db.execute(text(
+                    "SELECT query FROM pg_stat_activity WHERE datname = current_database()"
+                    " AND wait_event_type = 'Lock' AND query ILIKE '%reports%'"
+                )).scalars())
+                db.rollback()
+
+    def edit(version: int, barrier: threading.Barrier, i: int):
+        barrier.wait()
+        if i == workers and version == rounds + 1:
+            return client.post(f"{url}/finalize", headers=HEADERS, json={"expected_version": version}), None
+        op = {"op": "replace", "section_id": "summary", "block_index": 0, "block": {"type": "text", "text": f"v{version}-w{i}"}}
+        return client.patch(url, headers=HEADERS, json={"expected_version": version, "operations": [op]}), op["block"]["text"]
+
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+    winners = []  # texto escrito por la edición ganadora de cada ronda (None: finalize)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            version = 1
+            for _ in range(rounds + 1):  # la última ronda compite además con un finalize
+                barrier = threading.Barrier(workers)
+                results = list(pool.map(lambda i: edit(version, barrier, i), range(1, workers + 1)))
+                codes = sorted(r.status_code for r, _ in results)
+                assert codes == [200] + [409] * (workers - 1), codes
+                r, written = next((r, t) for r, t in results if r.status_code == 200)
+                winners.append(written)
+                version = r.json()["version"]
+                assert version == len(winners) + 1
+    finally:
+        stop.set()
+        watcher.join()
+
+    assert lock_waits == []
+    with SessionLocal() as db:
+        tenant_id = db.get(Report, report_id).tenant_id
+        versions = db.execute(
+            select(ReportRevision.version).where(ReportRevision.report_id == report_id).order_by(ReportRevision.version)
+        ).scalars().all()
+        assert versions == list(range(1, version + 1))  # sin huecos ni duplicados
+        # Cada edición aceptada está en el historial, encadenada sobre la anterior
+        docs = [get_revision_json(db, tenant_id=tenant_id, report_id=report_id, version=v) for v in versions]
+        for prev, doc, written in zip(docs, docs[1:], winners):
+            if written is None:
+                assert doc == prev
+            else:
+                assert next(s for s in doc["sections"] if s["id"] == "summary")["blocks"][0]["text"] == written
+    final = client.get(url, headers=HEADERS).json()
+    assert final["version"] == version and final["report_json"] == docs[-1]